@@ -0,0 +1,84 @@
+# benchmarks/bench_detection_pipeline.py
+"""Anomaly detection: fused DetectionPipeline vs the chained detect_* calls
+
+Reports the best time per run, peak traced memory (tracemalloc) and how many
+full DataFrame copies each path makes. Run from the repository root:
+    python benchmarks/bench_detection_pipeline.py
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from anomaly_detector import AnomalyDetector
+from detection_pipeline import DetectionPipeline
+
+SIZES = [200, 1000, 5000]
+STATISTICAL = ('volatility', 'spikes', 'pattern')
+ALL = ('volatility', 'volume', 'spikes', 'pattern', 'multi_feature')
+
+
+def make_candles(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.3, n))
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n, freq='min'),
+        'open': close, 'high': close + 0.2, 'low': close - 0.2, 'close': close,
+        'volume': rng.lognormal(3, 1, n),
+    })
+
+
+def chain(df, detectors):
+    """The per-detector chain the dashboard used to run"""
+    if 'volatility' in detectors:
+        df = AnomalyDetector.detect_volatility_anomalies(df, window=20)
+    if 'volume' in detectors:
+        df = AnomalyDetector.detect_volume_anomalies(df, contamination=0.1)
+    if 'spikes' in detectors:
+        df = AnomalyDetector.detect_price_spikes(df)
+    if 'pattern' in detectors:
+        df = AnomalyDetector.detect_pattern_anomalies(df, window=20)
+    if 'multi_feature' in detectors:
+        df = AnomalyDetector.detect_multi_feature_anomalies(df, contamination=0.15)
+    return AnomalyDetector.get_anomaly_severity(df)
+
+
+def measure(fn, df, repeat: int, number: int):
+    copies = [0]
+    original_copy = pd.DataFrame.copy
+
+    def counting_copy(self, *args, **kwargs):
+        copies[0] += 1
+        return original_copy(self, *args, **kwargs)
+
+    pd.DataFrame.copy = counting_copy
+    try:
+        tracemalloc.start()
+        fn(df)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        pd.DataFrame.copy = original_copy
+    seconds = min(timeit.repeat(lambda: fn(df), number=number, repeat=repeat)) / number
+    return seconds, peak, copies[0]
+
+
+def main():
+    for label, detectors, number in (('statistical detectors', STATISTICAL, 20), ('all detectors', ALL, 1)):
+        pipeline = DetectionPipeline(detectors=detectors)
+        print(f"\n{label}")
+        print(f"{'rows':>6} {'chain ms':>9} {'fused ms':>9} {'speedup':>8} "
+              f"{'chain peak KiB':>15} {'fused peak KiB':>15} {'copies':>8}")
+        for n in SIZES:
+            df = make_candles(n)
+            chained, chain_peak, chain_copies = measure(lambda d: chain(d, detectors), df, 3, number)
+            fused, fused_peak, fused_copies = measure(pipeline.run, df, 3, number)
+            print(f"{n:>6} {chained * 1e3:>9.2f} {fused * 1e3:>9.2f} {chained / fused:>7.1f}x "
+                  f"{chain_peak / 1024:>15.0f} {fused_peak / 1024:>15.0f} {f'{chain_copies}->{fused_copies}':>8}")
+
+
+if __name__ == '__main__':
+    main()
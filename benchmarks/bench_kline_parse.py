@@ -0,0 +1,59 @@
+# benchmarks/bench_kline_parse.py
+"""Kline parsing: typed-column fast path vs the original DataFrame path
+
+Run from the repository root:
+    python benchmarks/bench_kline_parse.py
+"""
+import os
+import sys
+import timeit
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from data_fetcher import BinanceDataFetcher
+
+SIZES = [100, 1000, 100_000]
+
+
+def legacy_parse_klines(klines):
+    """The pre-fast-path implementation, kept here as the baseline"""
+    df = pd.DataFrame(klines, columns=[
+        'timestamp', 'open', 'high', 'low', 'close', 'volume',
+        'close_time', 'quote_asset_volume', 'trades',
+        'taker_buy_base', 'taker_buy_quote', 'ignore'
+    ])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df[['open', 'high', 'low', 'close', 'volume']] = df[['open', 'high', 'low', 'close', 'volume']].astype(float)
+    return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+
+
+def make_klines(n: int):
+    """Synthetic klines shaped exactly like the Binance REST response"""
+    start = 1_700_000_000_000
+    return [
+        [
+            start + i * 60_000, f"{100 + i % 7:.2f}", f"{101 + i % 7:.2f}", f"{99 + i % 7:.2f}",
+            f"{100.5 + i % 7:.2f}", f"{10 + i % 13:.4f}", start + i * 60_000 + 59_999,
+            "1234.5", 42, "1.2", "3.4", "0"
+        ]
+        for i in range(n)
+    ]
+
+
+def best_of(fn, klines, repeat: int = 5):
+    number = max(1, 20_000 // len(klines))
+    return min(timeit.repeat(lambda: fn(klines), number=number, repeat=repeat)) / number
+
+
+def main():
+    print(f"{'rows':>8} {'legacy (ms)':>12} {'fast (ms)':>10} {'speedup':>8}")
+    for n in SIZES:
+        klines = make_klines(n)
+        assert legacy_parse_klines(klines).equals(BinanceDataFetcher._parse_klines(klines))
+        legacy = best_of(legacy_parse_klines, klines)
+        fast = best_of(BinanceDataFetcher._parse_klines, klines)
+        print(f"{n:>8} {legacy * 1e3:>12.3f} {fast * 1e3:>10.3f} {legacy / fast:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
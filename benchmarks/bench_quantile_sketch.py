@@ -0,0 +1,84 @@
+# benchmarks/bench_quantile_sketch.py
+"""Quantile-sketch volume detector vs the IsolationForest volume detector, and KLL sketch accuracy
+
+Detector: a batch fit and score, and the cost of taking in one new candle. That
+is a full refit plus scoring for the forest, and score + partial_fit for the
+sketch. Also reports label agreement and the share of injected volume spikes
+each one flags. Sketch: items retained, worst rank error over the 1st-99th
+percentiles, and merge cost, for several ``k`` on a million values.
+Run from the repository root:
+    python benchmarks/bench_quantile_sketch.py
+"""
+import os
+import sys
+import timeit
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from quantile_sketch import KLLSketch, QuantileSketchDetector
+from sklearn.ensemble import IsolationForest
+
+SIZES = [200, 1000, 5000]
+SKETCH_SIZES = [50, 100, 200, 400]
+CONTAMINATION = 0.1
+
+
+def make_volume(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    volume = rng.lognormal(3, 0.5, n)
+    injected = rng.choice(n, size=max(1, n // 50), replace=False)
+    volume[injected] *= rng.uniform(8, 15, len(injected))
+    return volume.reshape(-1, 1), injected
+
+
+def best(fn, number: int, repeat: int = 3):
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def forest():
+    return IsolationForest(contamination=CONTAMINATION, random_state=42, n_estimators=100, max_samples='auto')
+
+
+def sketch():
+    return QuantileSketchDetector(contamination=CONTAMINATION, random_state=42)
+
+
+def rank_error(sketch: KLLSketch, ordered: np.ndarray):
+    q = np.linspace(0.01, 0.99, 99)
+    return float(np.max(np.abs(np.searchsorted(ordered, sketch.quantile(q)) / len(ordered) - q)))
+
+
+def main():
+    print(f"{'rows':>6} {'IF fit ms':>10} {'QS fit ms':>10} {'IF update ms':>13} {'QS update us':>13} "
+          f"{'label agree':>12} {'IF recall':>10} {'QS recall':>10}")
+    for n in SIZES:
+        X, injected = make_volume(n)
+        row = X[-1:]
+        if_fit = best(lambda: forest().fit(X).score_samples(X), 1)
+        qs_fit = best(lambda: sketch().fit(X).score_samples(X), 20)
+        if_update = best(lambda: forest().fit(X).score_samples(X), 1)
+        model = sketch().fit(X)
+        qs_update = best(lambda: (model.score_samples(row), model.partial_fit(row)), 200)
+        if_labels = forest().fit_predict(X)
+        qs_labels = sketch().fit_predict(X)
+        print(f"{n:>6} {if_fit * 1e3:>10.1f} {qs_fit * 1e3:>10.2f} {if_update * 1e3:>13.1f} {qs_update * 1e6:>13.0f} "
+              f"{np.mean(if_labels == qs_labels):>12.1%} {np.mean(if_labels[injected] == -1):>10.1%} "
+              f"{np.mean(qs_labels[injected] == -1):>10.1%}")
+
+    values = np.random.default_rng(1).lognormal(3, 1, 1_000_000)
+    ordered = np.sort(values)
+    halves = np.array_split(values, 2)
+    print(f"\nKLL sketch of {len(values):,} values")
+    print(f"{'k':>5} {'items':>6} {'rank error':>11} {'build ms':>9} {'merged error':>13} {'merge ms':>9}")
+    for k in SKETCH_SIZES:
+        build = best(lambda: KLLSketch(k, random_state=0).update(values), 1)
+        whole = KLLSketch(k, random_state=0).update(values)
+        parts = [KLLSketch(k, random_state=seed).update(half) for seed, half in enumerate(halves)]
+        merge = best(lambda: parts[0].copy().merge(parts[1]), 20)
+        merged = parts[0].copy().merge(parts[1])
+        print(f"{k:>5} {whole.size:>6} {rank_error(whole, ordered):>11.2%} {build * 1e3:>9.1f} "
+              f"{rank_error(merged, ordered):>13.2%} {merge * 1e3:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_rolling.py
+"""Rolling kernels (rolling.RollingWindows) vs pandas ``Series.rolling``
+
+For each size, computes mean, std, min and max over the dashboard's windows (14,
+20, 50, 200). pandas runs every statistic from scratch. The kernels share one set
+of prefix sums across all the windows. Also reports the worst relative error of
+the rolling std for both, against an exact two-pass computation on the first
+100k rows. Run from the repository root:
+    python benchmarks/bench_rolling.py
+"""
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from rolling import RollingWindows
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+WINDOWS = [14, 20, 50, 200]
+STATS = ('mean', 'std', 'min', 'max')
+
+
+def make_prices(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return 30_000 + np.cumsum(rng.normal(0, 5, n))
+
+
+def best(fn, repeat: int):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def with_pandas(values):
+    rolling = pd.Series(values)
+    return [getattr(rolling.rolling(window), stat)().values for window in WINDOWS for stat in STATS]
+
+
+def with_kernels(values):
+    windows = RollingWindows(values)
+    out = []
+    for window in WINDOWS:
+        out.extend(windows.mean_std(window))
+        out.append(windows.min(window))
+        out.append(windows.max(window))
+    return out
+
+
+def std_error(values, window: int):
+    """Worst relative std error of pandas and of the kernels against an exact two-pass std"""
+    exact = sliding_window_view(values, window).std(axis=-1, ddof=1)
+    errors = []
+    for result in (pd.Series(values).rolling(window).std().values, RollingWindows(values).std(window)):
+        errors.append(np.max(np.abs(result[window - 1:] - exact) / exact))
+    return errors
+
+
+def main():
+    print(f"{len(WINDOWS)} windows x {len(STATS)} statistics ({', '.join(STATS)}) per run")
+    print(f"{'rows':>11} {'pandas ms':>10} {'kernels ms':>11} {'speedup':>8}")
+    for n in SIZES:
+        values = make_prices(n)
+        repeat = 3 if n <= 1_000_000 else 1
+        pandas_time = best(lambda: with_pandas(values), repeat)
+        kernel_time = best(lambda: with_kernels(values), repeat)
+        print(f"{n:>11,} {pandas_time * 1e3:>10.1f} {kernel_time * 1e3:>11.1f} {pandas_time / kernel_time:>7.1f}x")
+
+    values = make_prices(100_000)
+    print("\nworst relative std error vs exact, 100k rows")
+    print(f"{'window':>7} {'pandas':>10} {'kernels':>10}")
+    for window in WINDOWS:
+        pandas_error, kernel_error = std_error(values, window)
+        print(f"{window:>7} {pandas_error:>10.1e} {kernel_error:>10.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_streaming_forest.py
+"""Half-space trees vs sklearn's IsolationForest on the volume and multi-feature detectors
+
+Latency: a batch fit, then the cost of taking in one new candle. That is a full
+refit plus scoring for the forest, and score_one + learn_one for the trees.
+Agreement: how often the two models give the same label, the rank correlation
+of their scores, and the share of injected anomalies each one flags.
+Run from the repository root:
+    python benchmarks/bench_streaming_forest.py
+"""
+import os
+import sys
+import timeit
+import numpy as np
+from scipy import stats
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from anomaly_detector import AnomalyDetector
+from streaming_forest import HalfSpaceTrees
+
+SIZES = [200, 1000, 5000]
+CONTAMINATION = {'volume': 0.1, 'multi_feature': 0.15}
+
+
+def make_features(n: int, seed: int = 0):
+    """Volume and multi-feature inputs as the detectors build them, with injected anomalies"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.3, n))
+    volume = rng.lognormal(3, 0.5, n)
+    injected = rng.choice(n, size=max(1, n // 50), replace=False)
+    volume[injected] *= rng.uniform(8, 15, len(injected))
+    close[injected] += rng.choice([-1, 1], len(injected)) * rng.uniform(3, 6, len(injected))
+    returns = np.zeros(n)
+    returns[1:] = close[1:] / close[:-1] - 1
+    price_momentum = np.zeros(n)
+    price_momentum[1:] = np.diff(close)
+    volume_momentum = np.zeros(n)
+    volume_momentum[1:] = np.diff(volume)
+    multi = np.column_stack([returns, np.log1p(volume), price_momentum, volume_momentum])
+    return {'volume': volume.reshape(-1, 1), 'multi_feature': multi}, injected
+
+
+def forest(detector: str):
+    if detector == 'volume':
+        return AnomalyDetector.volume_model(CONTAMINATION[detector])
+    return AnomalyDetector.multi_feature_model(CONTAMINATION[detector])
+
+
+def best(fn, number: int, repeat: int = 3):
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main():
+    for detector in ('volume', 'multi_feature'):
+        print(f"\n{detector}")
+        print(f"{'rows':>6} {'IF fit ms':>10} {'HST fit ms':>11} {'IF update ms':>13} {'HST update us':>14} "
+              f"{'label agree':>12} {'spearman':>9} {'IF recall':>10} {'HST recall':>11}")
+        for n in SIZES:
+            features, injected = make_features(n)
+            X = features[detector]
+            contamination = CONTAMINATION[detector]
+
+            iforest = forest(detector)
+            if_labels = iforest.fit_predict(X)
+            if_scores = iforest.score_samples(X)
+            hst = HalfSpaceTrees(contamination=contamination, random_state=42)
+            hst_labels = hst.fit_predict(X)
+            hst_scores = hst.score_samples(X)
+
+            if_fit = best(lambda: forest(detector).fit(X), number=1)
+            hst_fit = best(lambda: HalfSpaceTrees(contamination=contamination, random_state=42).fit(X), number=3)
+            # One new candle: the forest refits on the window, the trees score and learn the row
+            if_update = best(lambda: forest(detector).fit(X).score_samples(X[-1:]), number=1)
+            row = X[-1]
+            hst_update = best(lambda: (hst.score_one(row), hst.learn_one(row)), number=200)
+
+            agree = np.mean(if_labels == hst_labels)
+            rho = stats.spearmanr(if_scores, hst_scores)[0]
+            if_recall = np.mean(if_labels[injected] == -1)
+            hst_recall = np.mean(hst_labels[injected] == -1)
+            print(f"{n:>6} {if_fit * 1e3:>10.1f} {hst_fit * 1e3:>11.1f} {if_update * 1e3:>13.1f} "
+                  f"{hst_update * 1e6:>14.0f} {agree:>12.1%} {rho:>9.2f} {if_recall:>10.0%} {hst_recall:>11.0%}")
+
+
+if __name__ == '__main__':
+    main()
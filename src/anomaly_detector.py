@@ -1,9 +1,16 @@
+import itertools
+import threading
+from collections import deque
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import IsolationForest
+from sklearn.pipeline import make_pipeline
 from sklearn.preprocessing import StandardScaler
 from scipy import stats
-from config.settings import ANOMALY_THRESHOLD
+from config.settings import ANOMALY_THRESHOLD, ML_CONFIG
+from rolling import rolling_mean_std, rolling_std
+from quantile_sketch import QuantileSketchDetector
+from streaming_forest import HalfSpaceTrees
 
 class AnomalyDetector:
     """Advanced anomaly detection system with multiple algorithms"""
@@ -13,7 +20,7 @@ class AnomalyDetector:
         """Detect price volatility anomalies using rolling Z-score"""
         df = df.copy()
         df['returns'] = df['close'].pct_change()
-        df['volatility'] = df['returns'].rolling(window=window).std()
+        df['volatility'] = rolling_std(df['returns'].values, window)
         
         # Calculate Z-score
         mean_vol = df['volatility'].mean()
@@ -24,26 +31,76 @@ class AnomalyDetector:
         return df
     
     @staticmethod
-    def detect_volume_anomalies(df: pd.DataFrame, contamination: float = 0.1):
-        """Detect volume anomalies using Isolation Forest"""
+    def detect_volume_anomalies(df: pd.DataFrame, contamination: float = 0.1, model_cache=None, cache_key=None):
+        """Detect volume anomalies using Isolation Forest (or the model ML_CONFIG selects)
+
+        With a ``model_cache`` and ``cache_key`` (e.g. (symbol, interval)) the forest is
+        fit once and reused, scoring only rows it has not seen.
+        """
         df = df.copy()
         
         # Prepare volume data
         volume_data = df[['volume']].values.reshape(-1, 1)
         
         # Apply Isolation Forest
-        model = IsolationForest(
+        df['volume_anomaly'], df['volume_anomaly_score'] = AnomalyDetector.isolation_forest_scores(
+            volume_data, lambda: AnomalyDetector.volume_model(contamination),
+            model_cache, cache_key and (*cache_key, 'volume', contamination), df['timestamp'].values
+        )
+        df['is_volume_anomaly'] = df['volume_anomaly'] == -1
+        
+        return df
+    
+    @staticmethod
+    def volume_model(contamination: float):
+        """Unfitted model used on volume: Isolation Forest unless ML_CONFIG selects half-space trees or a quantile sketch"""
+        model = AnomalyDetector._selected_model('volume')
+        if model == 'half_space_trees':
+            return HalfSpaceTrees(contamination=contamination, **ML_CONFIG['models']['half_space_trees'])
+        if model == 'quantile_sketch':
+            return QuantileSketchDetector(contamination=contamination, **ML_CONFIG['models']['quantile_sketch'])
+        return IsolationForest(
             contamination=contamination,
             random_state=42,
             n_estimators=100,
             max_samples='auto'
         )
-        
-        df['volume_anomaly'] = model.fit_predict(volume_data)
-        df['is_volume_anomaly'] = df['volume_anomaly'] == -1
-        df['volume_anomaly_score'] = model.score_samples(volume_data)
-        
-        return df
+    
+    @staticmethod
+    def multi_feature_model(contamination: float):
+        """Unfitted scaler + Isolation Forest used on the multi-feature set, or half-space trees
+
+        Half-space trees split each feature's own range, so they need no scaler.
+        """
+        if AnomalyDetector._selected_model('multi_feature') == 'half_space_trees':
+            return HalfSpaceTrees(contamination=contamination, **ML_CONFIG['models']['half_space_trees'])
+        return make_pipeline(
+            StandardScaler(),
+            IsolationForest(
+                contamination=contamination,
+                random_state=42,
+                n_estimators=200,
+                max_samples='auto',
+                bootstrap=True
+            )
+        )
+    
+    @staticmethod
+    def _selected_model(detector: str):
+        name = ML_CONFIG['detector_models'].get(detector, 'isolation_forest')
+        allowed = ('isolation_forest', 'half_space_trees') + (('quantile_sketch',) if detector == 'volume' else ())
+        if name not in allowed:
+            raise ValueError(f"Unknown model for {detector} detector: {name}")
+        return name
+    
+    @staticmethod
+    def isolation_forest_scores(features: np.ndarray, build_model, model_cache=None, cache_key=None, timestamps=None):
+        """Labels (-1 anomaly, 1 normal) and ``score_samples`` scores, from the model cache when given one"""
+        if model_cache is not None and cache_key:
+            scores, is_anomaly = model_cache.score(cache_key, timestamps, features, build_model)
+            return np.where(is_anomaly, -1, 1), scores
+        model = build_model()
+        return model.fit_predict(features), model.score_samples(features)
     
     @staticmethod
     def detect_price_spikes(df: pd.DataFrame, threshold: float = 0.05):
@@ -59,8 +116,7 @@ class AnomalyDetector:
         df = df.copy()
         
         # Calculate moving statistics
-        df['rolling_mean'] = df['close'].rolling(window=window).mean()
-        df['rolling_std'] = df['close'].rolling(window=window).std()
+        df['rolling_mean'], df['rolling_std'] = rolling_mean_std(df['close'].values, window)
         
         # Upper and lower bounds (Bollinger Bands concept)
         df['upper_bound'] = df['rolling_mean'] + (2 * df['rolling_std'])
@@ -75,8 +131,13 @@ class AnomalyDetector:
         return df
     
     @staticmethod
-    def detect_multi_feature_anomalies(df: pd.DataFrame, contamination: float = 0.15):
-        """Advanced multi-feature anomaly detection"""
+    def detect_multi_feature_anomalies(df: pd.DataFrame, contamination: float = 0.15, model_cache=None,
+                                       cache_key=None):
+        """Advanced multi-feature anomaly detection
+
+        With a ``model_cache`` and ``cache_key`` the scaler and forest are fit once and
+        reused, scoring only rows they have not seen.
+        """
         df = df.copy()
         
         # Create features
@@ -89,22 +150,12 @@ class AnomalyDetector:
         features = ['returns', 'log_volume', 'price_momentum', 'volume_momentum']
         feature_data = df[features].fillna(0)
         
-        # Standardize features
-        scaler = StandardScaler()
-        feature_data_scaled = scaler.fit_transform(feature_data)
-        
-        # Apply Isolation Forest
-        model = IsolationForest(
-            contamination=contamination,
-            random_state=42,
-            n_estimators=200,
-            max_samples='auto',
-            bootstrap=True
+        # Standardize features, then apply Isolation Forest
+        df['multi_anomaly'], df['anomaly_score'] = AnomalyDetector.isolation_forest_scores(
+            feature_data.values, lambda: AnomalyDetector.multi_feature_model(contamination),
+            model_cache, cache_key and (*cache_key, 'multi_feature', contamination), df['timestamp'].values
         )
-        
-        df['multi_anomaly'] = model.fit_predict(feature_data_scaled)
         df['is_multi_anomaly'] = df['multi_anomaly'] == -1
-        df['anomaly_score'] = model.score_samples(feature_data_scaled)
         
         return df
     
@@ -155,4 +206,166 @@ class AnomalyDetector:
             severity_counts = df['severity'].value_counts().to_dict()
             report['severity_distribution'] = {str(k): int(v) for k, v in severity_counts.items()}
         
-        return report
\ No newline at end of file
+        return report
+
+def _welford_add(state, x):
+    n, mean, m2 = state
+    n += 1
+    delta = x - mean
+    mean += delta / n
+    return n, mean, m2 + delta * (x - mean)
+
+
+def _welford_remove(state, x):
+    n, mean, m2 = state
+    if n <= 1:
+        return 0, 0.0, 0.0
+    n -= 1
+    delta = x - mean
+    mean -= delta / n
+    return n, mean, m2 - delta * (x - mean)
+
+
+class RollingMoments:
+    """Mean and sample variance of the last ``size`` values (every value if None), O(1) per push"""
+
+    def __init__(self, size: int = None):
+        self.size = size
+        self.values = deque()
+        self.state = (0, 0.0, 0.0)
+        self._pushes = 0
+
+    def __len__(self):
+        return self.state[0]
+
+    def push(self, x: float):
+        self.state = self._pushed(x)
+        if self.size:
+            self.values.append(x)
+            if len(self.values) > self.size:
+                self.values.popleft()
+            self._pushes += 1
+            if self._pushes >= self.size:
+                # Add/remove rounding drifts slowly; re-derive from the held values once per window
+                self._pushes = 0
+                values = np.fromiter(self.values, dtype=np.float64)
+                self.state = (len(values), values.mean(), ((values - values.mean()) ** 2).sum())
+
+    def peek(self, x: float):
+        """(count, mean, std) as they would be after ``push(x)``, without changing anything"""
+        return self._moments(self._pushed(x))
+
+    def moments(self):
+        return self._moments(self.state)
+
+    def _pushed(self, x: float):
+        state = _welford_add(self.state, x)
+        if self.size and len(self.values) == self.size:
+            state = _welford_remove(state, self.values[0])
+        return state
+
+    @staticmethod
+    def _moments(state):
+        n, mean, m2 = state
+        std = np.sqrt(max(m2, 0.0) / (n - 1)) if n > 1 else np.nan
+        return n, mean, std
+
+
+class _VolatilityState:
+    def __init__(self, window: int, history: int, max_rows: int):
+        self.returns = RollingMoments(window)
+        self.volatility = RollingMoments(history)
+        self.last_close = None
+        self.last_timestamp = None
+        # (timestamp, returns, volatility, z_score) of every committed candle
+        self.rows = deque(maxlen=max_rows)
+
+
+class OnlineVolatilityDetector:
+    """Streaming counterpart of ``AnomalyDetector.detect_volatility_anomalies``
+
+    Keeps running moments per key, e.g. (symbol, interval): the rolling std of the
+    last ``window`` returns and the mean/std of the last ``history`` volatilities
+    (all of them if None). Each new closed candle updates both in O(1). The newest
+    candle may still be open, so it is scored against the committed state without
+    being added to it. Z-scores are causal: each candle is scored with the
+    volatilities seen up to and including it. For the newest candle that equals the
+    batch method run on the last ``history + window`` candles.
+    """
+
+    def __init__(self, window: int = 20, history: int = None, max_rows: int = 5000):
+        self.window = window
+        self.history = history
+        self.max_rows = max_rows
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def detect(self, df: pd.DataFrame, key, threshold: float = ANOMALY_THRESHOLD):
+        """Add returns, volatility, z_score and is_anomaly to ``df``, processing only candles not seen before"""
+        timestamps = df['timestamp'].values
+        closes = df['close'].values
+        with self._lock:
+            state = self._states.get(key)
+            start = 0
+            if state is not None and state.last_timestamp is not None:
+                start = int(np.searchsorted(timestamps, state.last_timestamp, side='right'))
+                if start == 0 or timestamps[start - 1] != state.last_timestamp:
+                    # The frame no longer overlaps what was committed - start over from it
+                    state = None
+            if state is None:
+                state = self._states[key] = _VolatilityState(self.window, self.history, self.max_rows)
+                start = 0
+            # Every candle but the last is closed
+            for i in range(start, len(df) - 1):
+                state.rows.append((timestamps[i], *self._score(state, closes[i], commit=True)))
+                state.last_timestamp = timestamps[i]
+            # Committed rows for this frame are the newest ones held (all but its last candle)
+            held = min(max(len(df) - 1, 0), len(state.rows))
+            rows = list(itertools.islice(state.rows, len(state.rows) - held, None))
+            last = self._score(state, closes[-1], commit=False) if len(df) else None
+
+        values = np.full((len(df), 3), np.nan)
+        if rows and rows[0][0] == timestamps[len(df) - 1 - held]:
+            values[len(df) - 1 - held:len(df) - 1] = [row[1:] for row in rows]
+        elif rows:
+            # The frame skips candles that were committed - align on timestamps instead
+            committed = pd.DataFrame(rows, columns=['timestamp', 'returns', 'volatility', 'z_score'])
+            values[:-1] = committed.set_index('timestamp').reindex(timestamps[:-1]).values
+        if last is not None:
+            values[-1] = last
+        # Shallow copy: the new columns don't touch the caller's frame and nothing is duplicated
+        df = df.copy(deep=False)
+        df['returns'] = values[:, 0]
+        df['volatility'] = values[:, 1]
+        df['z_score'] = values[:, 2]
+        df['is_anomaly'] = np.abs(values[:, 2]) > threshold
+        return df
+
+    def reset(self, key=None):
+        with self._lock:
+            if key is None:
+                self._states.clear()
+            else:
+                self._states.pop(key, None)
+
+    def _score(self, state: _VolatilityState, close: float, commit: bool):
+        """(returns, volatility, z_score) for one candle, committing it to ``state`` if asked"""
+        if state.last_close is None:
+            if commit:
+                state.last_close = close
+            return np.nan, np.nan, np.nan
+        ret = close / state.last_close - 1
+        count, _, volatility = state.returns.peek(ret)
+        if count < self.window:
+            volatility = np.nan
+        z_score = np.nan
+        if not np.isnan(volatility):
+            _, mean, std = state.volatility.peek(volatility)
+            if std > 0:
+                z_score = (volatility - mean) / std
+        if commit:
+            state.returns.push(ret)
+            if not np.isnan(volatility):
+                state.volatility.push(volatility)
+            state.last_close = close
+        return ret, volatility, z_score
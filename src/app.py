@@ -6,8 +6,16 @@ import numpy as np
 from datetime import datetime, timedelta
 import time
 from data_fetcher import BinanceDataFetcher
-from anomaly_detector import AnomalyDetector
-from config.settings import SYMBOLS, TIMEFRAME
+from anomaly_detector import OnlineVolatilityDetector
+from batch_detector import BatchAnomalyDetector
+from candle_store import SharedCandleStore
+from model_cache import ModelCache
+from parallel_detection import ParallelDetector
+from dashboard_features import ANOMALY_FLAGS, GRAPH
+from feature_graph import FeatureCache
+from event_store import DETECTOR_LABELS, SCORE_COLUMNS, AnomalyEventStore, detection_profile
+from quantile_sketch import VolumeSummaries
+from config.settings import SYMBOLS, TIMEFRAME, TIMEFRAME_OPTIONS, STREAMING, ML_CONFIG
 
 # Advanced Page Configuration
 st.set_page_config(
@@ -370,9 +378,17 @@ st.markdown("""
 # Initialize components
 @st.cache_resource
 def init_components():
-    return BinanceDataFetcher(), AnomalyDetector()
+    fetcher = BinanceDataFetcher(streaming=STREAMING["enabled"])
+    # One store and one model cache per process: every session reads the same candles and fitted models
+    return fetcher, SharedCandleStore(fetcher), ModelCache(), ParallelDetector(), AnomalyEventStore(), \
+        VolumeSummaries(**ML_CONFIG['volume_summaries'])
 
-fetcher, detector = init_components()
+fetcher, candle_store, model_cache, parallel_detector, event_store, volume_summaries = init_components()
+
+@st.cache_resource
+def online_volatility_detector(window: int, history: int):
+    # Running volatility moments per (symbol, timeframe), shared by sessions with the same window
+    return OnlineVolatilityDetector(window=window, history=history)
 
 # Elite Header
 st.markdown("""
@@ -419,10 +435,10 @@ if "Cryptocurrency" in market_type:
     data_points = st.sidebar.slider(
         "Historical Data Points",
         min_value=50,
-        max_value=1000,
+        max_value=5000,
         value=300,
         step=50,
-        help="Number of candlesticks to display"
+        help="Number of candlesticks to display (over 1000 is fetched in pages)"
     )
 
 # Advanced Analytics Settings
@@ -442,6 +458,7 @@ if auto_refresh:
 show_volume = st.sidebar.checkbox("🌟 Volume Analysis", value=True, help="Display volume charts")
 show_indicators = st.sidebar.checkbox("📈 Technical Indicators", value=True, help="Show moving averages, RSI, MACD")
 show_predictions = st.sidebar.checkbox("🔮 AI Predictions", value=True, help="Display ML-based forecasts")
+show_anomalies = st.sidebar.checkbox("🚨 Anomaly Detection", value=True, help="Run the anomaly detectors and show their report")
 
 anomaly_sensitivity = st.sidebar.slider(
     "🎯 Anomaly Detection Sensitivity",
@@ -486,108 +503,26 @@ take_profit = st.sidebar.number_input(
 # Status Dashboard
 st.markdown('<div class="section-header">System Status</div>', unsafe_allow_html=True)
 
-col_status1, col_status2, col_status3, col_status4, col_status5 = st.columns(5)
-
-with col_status1:
-    st.markdown("""
-    <div class="premium-metric">
-        <div class="metric-label">Connection</div>
-        <div class="status-badge status-live">● LIVE</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col_status2:
-    current_time = datetime.now().strftime("%H:%M:%S")
-    st.markdown(f"""
-    <div class="premium-metric">
-        <div class="metric-label">Last Update</div>
-        <div class="metric-value" style="font-size: 1.3rem;">{current_time}</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col_status3:
-    st.markdown("""
-    <div class="premium-metric">
-        <div class="metric-label">Data Quality</div>
-        <div class="metric-value" style="font-size: 1.3rem; color: #00ff88;">99.9%</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col_status4:
-    st.markdown("""
-    <div class="premium-metric">
-        <div class="metric-label">API Latency</div>
-        <div class="metric-value" style="font-size: 1.3rem; color: #667eea;">~45ms</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col_status5:
-    st.markdown("""
-    <div class="premium-metric">
-        <div class="metric-label">Active Alerts</div>
-        <div class="metric-value" style="font-size: 1.3rem; color: #ffa500;">0</div>
-    </div>
-    """, unsafe_allow_html=True)
+# Refreshed from live request telemetry on every loop iteration
+status_placeholder = st.empty()
 
 st.markdown("---")
 
 # Main content placeholder
 placeholder = st.empty()
 
-def calculate_advanced_indicators(df):
-    """Calculate comprehensive technical indicators"""
-    df = df.copy()
-    
-    # Moving Averages
-    df['SMA_20'] = df['close'].rolling(window=20).mean()
-    df['SMA_50'] = df['close'].rolling(window=50).mean()
-    df['SMA_200'] = df['close'].rolling(window=200).mean()
-    df['EMA_12'] = df['close'].ewm(span=12, adjust=False).mean()
-    df['EMA_26'] = df['close'].ewm(span=26, adjust=False).mean()
-    
-    # MACD
-    df['MACD'] = df['EMA_12'] - df['EMA_26']
-    df['Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-    df['MACD_Histogram'] = df['MACD'] - df['Signal']
-    
-    # RSI
-    delta = df['close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    df['RSI'] = 100 - (100 / (1 + rs))
-    
-    # Bollinger Bands
-    df['BB_middle'] = df['close'].rolling(window=20).mean()
-    bb_std = df['close'].rolling(window=20).std()
-    df['BB_upper'] = df['BB_middle'] + (2 * bb_std)
-    df['BB_lower'] = df['BB_middle'] - (2 * bb_std)
-    df['BB_width'] = ((df['BB_upper'] - df['BB_lower']) / df['BB_middle']) * 100
-    
-    # Stochastic Oscillator
-    low_14 = df['low'].rolling(window=14).min()
-    high_14 = df['high'].rolling(window=14).max()
-    df['Stochastic'] = ((df['close'] - low_14) / (high_14 - low_14)) * 100
-    
-    # ATR (Average True Range)
-    high_low = df['high'] - df['low']
-    high_close = np.abs(df['high'] - df['close'].shift())
-    low_close = np.abs(df['low'] - df['close'].shift())
-    ranges = pd.concat([high_low, high_close, low_close], axis=1)
-    true_range = np.max(ranges, axis=1)
-    df['ATR'] = true_range.rolling(14).mean()
-    
-    # On-Balance Volume
-    df['OBV'] = (np.sign(df['close'].diff()) * df['volume']).fillna(0).cumsum()
-    
-    # Money Flow Index
-    typical_price = (df['high'] + df['low'] + df['close']) / 3
-    money_flow = typical_price * df['volume']
-    positive_flow = money_flow.where(typical_price > typical_price.shift(1), 0).rolling(14).sum()
-    negative_flow = money_flow.where(typical_price < typical_price.shift(1), 0).rolling(14).sum()
-    df['MFI'] = 100 - (100 / (1 + positive_flow / negative_flow))
-    
-    return df
+# Columns each dashboard panel reads (see dashboard_features); hidden panels cost nothing
+PANEL_COLUMNS = {
+    'quick_stats': ('returns', 'SMA_20', 'SMA_50'),
+    'volume_chart': ('Volume_MA',),
+    'indicator_chart': ('SMA_20', 'SMA_50', 'BB_upper', 'BB_lower', 'RSI', 'MACD', 'Signal', 'MACD_Histogram'),
+    'trading_signal': ('RSI', 'MACD', 'Signal', 'SMA_20', 'SMA_50', 'BB_lower', 'BB_upper'),
+    'indicator_summary': ('RSI', 'MACD', 'Signal', 'BB_width', 'Stochastic', 'ATR', 'MFI'),
+    'anomalies': ANOMALY_FLAGS + ('anomaly_count', 'severity') + SCORE_COLUMNS,
+}
+
+# Lazily computed columns per (symbol, timeframe, settings), reused until the candles change
+feature_cache = FeatureCache(GRAPH)
 
 def generate_trading_signal(df):
     """Generate AI-powered trading signals"""
@@ -783,7 +718,6 @@ def create_professional_chart(df, symbol_name):
         )
         
         # Volume Moving Average
-        df['Volume_MA'] = df['volume'].rolling(window=20).mean()
         fig.add_trace(
             go.Scatter(
                 x=df['timestamp'],
@@ -903,19 +837,14 @@ def create_professional_chart(df, symbol_name):
     
     return fig
 
-def create_market_depth_chart(df):
+def create_market_depth_chart(depth):
     """Create order book / market depth visualization"""
     fig = go.Figure()
     
-    # Simulate order book data
-    latest_price = df['close'].iloc[-1]
-    price_range = latest_price * 0.02
-    
-    bid_prices = np.linspace(latest_price - price_range, latest_price, 20)
-    ask_prices = np.linspace(latest_price, latest_price + price_range, 20)
-    
-    bid_volumes = np.random.exponential(scale=1000, size=20).cumsum()
-    ask_volumes = np.random.exponential(scale=1000, size=20).cumsum()
+    bids = depth[depth['side'] == 'bid']
+    asks = depth[depth['side'] == 'ask']
+    bid_prices, bid_volumes = bids['price'], bids['quantity']
+    ask_prices, ask_volumes = asks['price'], asks['quantity']
     
     # Bids (buy orders)
     fig.add_trace(go.Scatter(
@@ -925,7 +854,7 @@ def create_market_depth_chart(df):
         fillcolor='rgba(0, 255, 136, 0.3)',
         line=dict(color='#00ff88', width=2),
         name='Bids',
-        hovertemplate='Price: $%{y:.2f}<br>Volume: %{x:,.0f}<extra></extra>'
+        hovertemplate='Price: $%{y:.2f}<br>Volume: %{x:,.4f}<extra></extra>'
     ))
     
     # Asks (sell orders)
@@ -936,7 +865,7 @@ def create_market_depth_chart(df):
         fillcolor='rgba(255, 68, 68, 0.3)',
         line=dict(color='#ff4444', width=2),
         name='Asks',
-        hovertemplate='Price: $%{y:.2f}<br>Volume: %{x:,.0f}<extra></extra>'
+        hovertemplate='Price: $%{y:.2f}<br>Volume: %{x:,.4f}<extra></extra>'
     ))
     
     fig.update_layout(
@@ -988,10 +917,13 @@ def simulate_indian_market():
         }
     }
 
-def create_heatmap(crypto_data):
+def create_heatmap(ticker):
     """Create performance heatmap"""
-    symbols_list = list(crypto_data.keys())
-    changes = [data['change'] for data in crypto_data.values()]
+    ticker = ticker.sort_values('change', ascending=False)
+    symbols_list = ticker['symbol']
+    changes = ticker['change']
+    # Labels only stay readable for a handful of bars
+    show_text = len(ticker) <= 20
     
     fig = go.Figure(data=go.Bar(
         x=symbols_list,
@@ -1002,15 +934,16 @@ def create_heatmap(crypto_data):
             showscale=False,
             line=dict(color='rgba(255, 255, 255, 0.2)', width=1)
         ),
-        text=[f"{c:+.2f}%" for c in changes],
+        text=[f"{c:+.2f}%" for c in changes] if show_text else None,
         textposition='outside',
         hovertemplate='<b>%{x}</b><br>Change: %{y:.2f}%<extra></extra>'
     ))
     
     fig.update_layout(
-        title='<b>Market Performance Overview</b>',
+        title=f'<b>Market Performance Overview</b> ({len(ticker)} pairs)',
         xaxis_title='Trading Pairs',
         yaxis_title='24h Change (%)',
+        xaxis=dict(showticklabels=show_text),
         height=350,
         template='plotly_dark',
         paper_bgcolor='rgba(0, 0, 0, 0)',
@@ -1020,29 +953,117 @@ def create_heatmap(crypto_data):
     
     return fig
 
+def render_system_status(stats, active_alerts):
+    """Render the status row from the fetcher's rolling request telemetry"""
+    overall = stats['all']
+    success_rate = overall['success_rate']
+    healthy = success_rate is None or success_rate >= 95
+    col_status1, col_status2, col_status3, col_status4, col_status5 = st.columns(5)
+    
+    with col_status1:
+        badge = '<div class="status-badge status-live">● LIVE</div>' if healthy else \
+            '<div class="status-badge" style="background: #ff4444; color: white;">● DEGRADED</div>'
+        st.markdown(f"""
+        <div class="premium-metric">
+            <div class="metric-label">Connection</div>
+            {badge}
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col_status2:
+        current_time = datetime.now().strftime("%H:%M:%S")
+        st.markdown(f"""
+        <div class="premium-metric">
+            <div class="metric-label">Last Update</div>
+            <div class="metric-value" style="font-size: 1.3rem;">{current_time}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col_status3:
+        rate_text = "—" if success_rate is None else f"{success_rate:.1f}%"
+        rate_color = "#00ff88" if healthy else "#ff4444"
+        st.markdown(f"""
+        <div class="premium-metric">
+            <div class="metric-label">Request Success</div>
+            <div class="metric-value" style="font-size: 1.3rem; color: {rate_color};">{rate_text}</div>
+            <div class="metric-change" style="color: rgba(255,255,255,0.6);">{overall['errors']} errors · {overall['retries']} retries</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col_status4:
+        if overall['p50_ms'] is None:
+            latency_text, tail_text = "—", "no requests yet"
+        else:
+            latency_text = f"{overall['p50_ms']:.0f}ms"
+            tail_text = f"p95 {overall['p95_ms']:.0f} · p99 {overall['p99_ms']:.0f}ms"
+        st.markdown(f"""
+        <div class="premium-metric">
+            <div class="metric-label">API Latency (p50)</div>
+            <div class="metric-value" style="font-size: 1.3rem; color: #667eea;">{latency_text}</div>
+            <div class="metric-change" style="color: rgba(255,255,255,0.6);">{tail_text}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col_status5:
+        alert_color = "#ff4444" if active_alerts else "#00ff88"
+        st.markdown(f"""
+        <div class="premium-metric">
+            <div class="metric-label">Active Alerts</div>
+            <div class="metric-value" style="font-size: 1.3rem; color: {alert_color};">{active_alerts}</div>
+        </div>
+        """, unsafe_allow_html=True)
+
 # Main Application Loop
 iteration = 0
 
 while True:
+    active_alerts = 0
     with placeholder.container():
         try:
             if "Cryptocurrency" in market_type:
                 # Fetch and process cryptocurrency data
-                df = fetcher.get_klines(symbol, timeframe, limit=data_points)
+                df = candle_store.get_klines(symbol, timeframe, limit=data_points)
                 
-                # Apply anomaly detection
-                df = detector.detect_volatility_anomalies(df, window=20, threshold=anomaly_sensitivity)
-                df = detector.detect_volume_anomalies(df, contamination=0.1)
-                df = detector.detect_price_spikes(df, threshold=alert_threshold/100 if enable_alerts else 0.05)
-                df = detector.detect_pattern_anomalies(df, window=20)
-                df = detector.detect_multi_feature_anomalies(df, contamination=0.15)
-                df = detector.get_anomaly_severity(df)
-                
-                # Calculate technical indicators
-                df = calculate_advanced_indicators(df)
+                # Compute only the columns the visible panels read, once per candle update
+                panels = ['quick_stats']
+                if show_volume:
+                    panels.append('volume_chart')
+                if show_indicators:
+                    panels += ['indicator_chart', 'trading_signal', 'indicator_summary']
+                if show_anomalies:
+                    panels.append('anomalies')
+                spike_threshold = alert_threshold/100 if enable_alerts else 0.05
+                # Events logged under other detector settings are kept apart from these
+                profile = detection_profile(
+                    window=20,
+                    volatility_threshold=anomaly_sensitivity,
+                    volatility_history=data_points - 20,
+                    volume_contamination=0.1,
+                    multi_contamination=0.15
+                )
+                features = feature_cache.get(
+                    (symbol, timeframe, data_points, anomaly_sensitivity, spike_threshold),
+                    df,
+                    context={
+                        'pipeline': dict(
+                            window=20,
+                            volatility_threshold=anomaly_sensitivity,
+                            spike_threshold=spike_threshold,
+                            volume_contamination=0.1,
+                            multi_contamination=0.15,
+                            model_cache=model_cache,
+                            volatility_detector=online_volatility_detector(20, data_points - 20)
+                        ),
+                        'cache_key': (symbol, timeframe),
+                    }
+                )
+                df = features.frame(column for panel in panels for column in PANEL_COLUMNS[panel])
+                # Anomalous candles among the latest ten
+                active_alerts = int((df['anomaly_count'].tail(10) > 0).sum()) if 'anomaly_count' in df.columns else 0
                 
                 # Generate trading signals
-                signal, signal_desc, signal_list, signal_score = generate_trading_signal(df)
+                if show_indicators:
+                    signal, signal_desc, signal_list, signal_score = generate_trading_signal(df)
                 
                 # Price calculations
                 latest_price = df['close'].iloc[-1]
@@ -1112,38 +1133,39 @@ while True:
                     """, unsafe_allow_html=True)
                 
                 # Trading Signal Panel
-                st.markdown('<div class="section-header">AI Trading Signal</div>', unsafe_allow_html=True)
+                if show_indicators:
+                    st.markdown('<div class="section-header">AI Trading Signal</div>', unsafe_allow_html=True)
                 
-                signal_class = "signal-buy" if signal == "BUY" else "signal-sell" if signal == "SELL" else "signal-hold"
-                signal_icon = "📈" if signal == "BUY" else "📉" if signal == "SELL" else "⏸"
+                    signal_class = "signal-buy" if signal == "BUY" else "signal-sell" if signal == "SELL" else "signal-hold"
+                    signal_icon = "📈" if signal == "BUY" else "📉" if signal == "SELL" else "⏸"
                 
-                col_sig1, col_sig2 = st.columns([1, 2])
+                    col_sig1, col_sig2 = st.columns([1, 2])
                 
-                with col_sig1:
-                    st.markdown(f"""
-                    <div class="glass-card" style="text-align: center; padding: 2rem;">
-                        <h2 style="font-size: 3rem; margin: 0;">{signal_icon}</h2>
-                        <div class="signal-badge {signal_class}" style="font-size: 1.5rem; margin-top: 1rem;">
-                            {signal}
+                    with col_sig1:
+                        st.markdown(f"""
+                        <div class="glass-card" style="text-align: center; padding: 2rem;">
+                            <h2 style="font-size: 3rem; margin: 0;">{signal_icon}</h2>
+                            <div class="signal-badge {signal_class}" style="font-size: 1.5rem; margin-top: 1rem;">
+                                {signal}
+                            </div>
+                            <p style="margin-top: 1rem; color: rgba(255,255,255,0.7); font-size: 0.9rem;">
+                                Confidence Score: <b>{abs(signal_score)}/5</b>
+                            </p>
                         </div>
-                        <p style="margin-top: 1rem; color: rgba(255,255,255,0.7); font-size: 0.9rem;">
-                            Confidence Score: <b>{abs(signal_score)}/5</b>
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                        """, unsafe_allow_html=True)
                 
-                with col_sig2:
-                    st.markdown(f"""
-                    <div class="glass-card">
-                        <h3 style="margin-top: 0; color: white;">Signal Analysis</h3>
-                        <p style="color: rgba(255,255,255,0.8); line-height: 1.6;">{signal_desc}</p>
-                        <hr style="border-color: rgba(255,255,255,0.1); margin: 1rem 0;">
-                        <h4 style="color: rgba(255,255,255,0.7); font-size: 0.9rem; margin-bottom: 0.5rem;">SUPPORTING INDICATORS:</h4>
-                        <ul style="color: rgba(255,255,255,0.7); line-height: 1.8;">
-                            {''.join([f'<li>{s}</li>' for s in signal_list])}
-                        </ul>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    with col_sig2:
+                        st.markdown(f"""
+                        <div class="glass-card">
+                            <h3 style="margin-top: 0; color: white;">Signal Analysis</h3>
+                            <p style="color: rgba(255,255,255,0.8); line-height: 1.6;">{signal_desc}</p>
+                            <hr style="border-color: rgba(255,255,255,0.1); margin: 1rem 0;">
+                            <h4 style="color: rgba(255,255,255,0.7); font-size: 0.9rem; margin-bottom: 0.5rem;">SUPPORTING INDICATORS:</h4>
+                            <ul style="color: rgba(255,255,255,0.7); line-height: 1.8;">
+                                {''.join([f'<li>{s}</li>' for s in signal_list])}
+                            </ul>
+                        </div>
+                        """, unsafe_allow_html=True)
                 
                 # Risk Management Panel
                 if enable_alerts:
@@ -1184,142 +1206,147 @@ while True:
                 col_left, col_middle, col_right = st.columns([2, 2, 1])
                 
                 with col_left:
-                    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-                    st.markdown("### 🔍 Anomaly Detection Report")
+                    if show_anomalies:
+                        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+                        st.markdown("### 🔍 Anomaly Detection Report")
                     
-                    # Get anomaly report
-                    anomaly_report = detector.get_anomaly_report(df)
+                        # Log newly closed anomalous candles, then report from the event log
+                        event_store.record(symbol, timeframe, df, profile=profile)
+                        anomaly_report = event_store.report(symbol, timeframe, since=df['timestamp'].iloc[0],
+                                                            profile=profile)
                     
-                    total_anomalies = anomaly_report['total_anomalies']
+                        total_anomalies = anomaly_report['total_anomalies']
                     
-                    if total_anomalies > 0:
-                        st.markdown(f"""
-                        <div class="alert-critical">
-                            <h4 style="margin: 0;">⚠️ {total_anomalies} Anomalies Detected</h4>
-                            <p style="margin: 0.5rem 0 0 0; color: rgba(255,255,255,0.8);">
-                                Unusual market activity identified. Exercise caution.
-                            </p>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        if total_anomalies > 0:
+                            st.markdown(f"""
+                            <div class="alert-critical">
+                                <h4 style="margin: 0;">⚠️ {total_anomalies} Anomalies Detected</h4>
+                                <p style="margin: 0.5rem 0 0 0; color: rgba(255,255,255,0.8);">
+                                    Unusual market activity identified. Exercise caution.
+                                </p>
+                            </div>
+                            """, unsafe_allow_html=True)
                         
-                        # Anomaly breakdown
-                        for anom_type, count in anomaly_report['anomaly_types'].items():
-                            if count > 0:
-                                st.markdown(f"""
-                                <div style="display: flex; justify-content: space-between; padding: 0.5rem 0; border-bottom: 1px solid rgba(255,255,255,0.1);">
-                                    <span style="color: rgba(255,255,255,0.7);">{anom_type}</span>
-                                    <span style="color: #ff4444; font-weight: 700;">{count}</span>
-                                </div>
-                                """, unsafe_allow_html=True)
+                            # Anomaly breakdown
+                            for anom_type, count in anomaly_report['anomaly_types'].items():
+                                if count > 0:
+                                    st.markdown(f"""
+                                    <div style="display: flex; justify-content: space-between; padding: 0.5rem 0; border-bottom: 1px solid rgba(255,255,255,0.1);">
+                                        <span style="color: rgba(255,255,255,0.7);">{anom_type}</span>
+                                        <span style="color: #ff4444; font-weight: 700;">{count}</span>
+                                    </div>
+                                    """, unsafe_allow_html=True)
+                        else:
+                            st.markdown("""
+                            <div class="alert-success">
+                                <h4 style="margin: 0;">✅ Market Stable</h4>
+                                <p style="margin: 0.5rem 0 0 0; color: rgba(255,255,255,0.8);">
+                                    No anomalies detected. Normal trading conditions.
+                                </p>
+                            </div>
+                            """, unsafe_allow_html=True)
                         
-                        # Recent anomalies table
-                        if anomaly_report['recent_anomalies']:
+                        # Latest logged events, kept across refreshes and after they leave the window
+                        recent_df = event_store.history(symbol, timeframe, limit=5, profile=profile)
+                        if not recent_df.empty:
                             st.markdown("#### Recent Anomaly Events")
-                            recent_df = pd.DataFrame(anomaly_report['recent_anomalies'])
+                            recent_df['detector'] = recent_df['detector'].map(DETECTOR_LABELS)
                             st.dataframe(
-                                recent_df.tail(5),
+                                recent_df[['timestamp', 'detector', 'score', 'severity']],
                                 use_container_width=True,
                                 hide_index=True
                             )
-                    else:
-                        st.markdown("""
-                        <div class="alert-success">
-                            <h4 style="margin: 0;">✅ Market Stable</h4>
-                            <p style="margin: 0.5rem 0 0 0; color: rgba(255,255,255,0.8);">
-                                No anomalies detected. Normal trading conditions.
-                            </p>
-                        </div>
-                        """, unsafe_allow_html=True)
                     
-                    st.markdown('</div>', unsafe_allow_html=True)
+                        st.markdown('</div>', unsafe_allow_html=True)
                 
                 with col_middle:
-                    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-                    st.markdown("###    Technical Indicators Summary")
+                    if show_indicators:
+                        st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+                        st.markdown("###    Technical Indicators Summary")
                     
-                    # Create indicator summary
-                    indicators_data = []
+                        # Create indicator summary
+                        indicators_data = []
                     
-                    if 'RSI' in df.columns:
-                        rsi_val = df['RSI'].iloc[-1]
-                        rsi_status = "Overbought" if rsi_val > 70 else "Oversold" if rsi_val < 30 else "Neutral"
-                        rsi_color = "#ff4444" if rsi_val > 70 else "#00ff88" if rsi_val < 30 else "#ffa500"
-                        indicators_data.append({
-                            'Indicator': 'RSI (14)',
-                            'Value': f'{rsi_val:.2f}',
-                            'Signal': rsi_status,
-                            'Color': rsi_color
-                        })
+                        if 'RSI' in df.columns:
+                            rsi_val = df['RSI'].iloc[-1]
+                            rsi_status = "Overbought" if rsi_val > 70 else "Oversold" if rsi_val < 30 else "Neutral"
+                            rsi_color = "#ff4444" if rsi_val > 70 else "#00ff88" if rsi_val < 30 else "#ffa500"
+                            indicators_data.append({
+                                'Indicator': 'RSI (14)',
+                                'Value': f'{rsi_val:.2f}',
+                                'Signal': rsi_status,
+                                'Color': rsi_color
+                            })
                     
-                    if 'MACD' in df.columns:
-                        macd_val = df['MACD'].iloc[-1]
-                        signal_val = df['Signal'].iloc[-1]
-                        macd_status = "Bullish" if macd_val > signal_val else "Bearish"
-                        macd_color = "#00ff88" if macd_val > signal_val else "#ff4444"
-                        indicators_data.append({
-                            'Indicator': 'MACD',
-                            'Value': f'{macd_val:.4f}',
-                            'Signal': macd_status,
-                            'Color': macd_color
-                        })
+                        if 'MACD' in df.columns:
+                            macd_val = df['MACD'].iloc[-1]
+                            signal_val = df['Signal'].iloc[-1]
+                            macd_status = "Bullish" if macd_val > signal_val else "Bearish"
+                            macd_color = "#00ff88" if macd_val > signal_val else "#ff4444"
+                            indicators_data.append({
+                                'Indicator': 'MACD',
+                                'Value': f'{macd_val:.4f}',
+                                'Signal': macd_status,
+                                'Color': macd_color
+                            })
                     
-                    if 'BB_width' in df.columns:
-                        bb_width = df['BB_width'].iloc[-1]
-                        bb_status = "High Volatility" if bb_width > 4 else "Low Volatility" if bb_width < 2 else "Normal"
-                        bb_color = "#ffa500" if bb_width > 4 else "#00bfff"
-                        indicators_data.append({
-                            'Indicator': 'Bollinger Width',
-                            'Value': f'{bb_width:.2f}%',
-                            'Signal': bb_status,
-                            'Color': bb_color
-                        })
+                        if 'BB_width' in df.columns:
+                            bb_width = df['BB_width'].iloc[-1]
+                            bb_status = "High Volatility" if bb_width > 4 else "Low Volatility" if bb_width < 2 else "Normal"
+                            bb_color = "#ffa500" if bb_width > 4 else "#00bfff"
+                            indicators_data.append({
+                                'Indicator': 'Bollinger Width',
+                                'Value': f'{bb_width:.2f}%',
+                                'Signal': bb_status,
+                                'Color': bb_color
+                            })
                     
-                    if 'Stochastic' in df.columns:
-                        stoch_val = df['Stochastic'].iloc[-1]
-                        stoch_status = "Overbought" if stoch_val > 80 else "Oversold" if stoch_val < 20 else "Neutral"
-                        stoch_color = "#ff4444" if stoch_val > 80 else "#00ff88" if stoch_val < 20 else "#ffa500"
-                        indicators_data.append({
-                            'Indicator': 'Stochastic',
-                            'Value': f'{stoch_val:.2f}',
-                            'Signal': stoch_status,
-                            'Color': stoch_color
-                        })
+                        if 'Stochastic' in df.columns:
+                            stoch_val = df['Stochastic'].iloc[-1]
+                            stoch_status = "Overbought" if stoch_val > 80 else "Oversold" if stoch_val < 20 else "Neutral"
+                            stoch_color = "#ff4444" if stoch_val > 80 else "#00ff88" if stoch_val < 20 else "#ffa500"
+                            indicators_data.append({
+                                'Indicator': 'Stochastic',
+                                'Value': f'{stoch_val:.2f}',
+                                'Signal': stoch_status,
+                                'Color': stoch_color
+                            })
                     
-                    if 'ATR' in df.columns:
-                        atr_val = df['ATR'].iloc[-1]
-                        atr_pct = (atr_val / latest_price) * 100
-                        indicators_data.append({
-                            'Indicator': 'ATR (14)',
-                            'Value': f'${atr_val:.4f}',
-                            'Signal': f'{atr_pct:.2f}%',
-                            'Color': "#667eea"
-                        })
+                        if 'ATR' in df.columns:
+                            atr_val = df['ATR'].iloc[-1]
+                            atr_pct = (atr_val / latest_price) * 100
+                            indicators_data.append({
+                                'Indicator': 'ATR (14)',
+                                'Value': f'${atr_val:.4f}',
+                                'Signal': f'{atr_pct:.2f}%',
+                                'Color': "#667eea"
+                            })
                     
-                    if 'MFI' in df.columns:
-                        mfi_val = df['MFI'].iloc[-1]
-                        mfi_status = "Strong" if mfi_val > 60 else "Weak" if mfi_val < 40 else "Neutral"
-                        mfi_color = "#00ff88" if mfi_val > 60 else "#ff4444" if mfi_val < 40 else "#ffa500"
-                        indicators_data.append({
-                            'Indicator': 'Money Flow',
-                            'Value': f'{mfi_val:.2f}',
-                            'Signal': mfi_status,
-                            'Color': mfi_color
-                        })
+                        if 'MFI' in df.columns:
+                            mfi_val = df['MFI'].iloc[-1]
+                            mfi_status = "Strong" if mfi_val > 60 else "Weak" if mfi_val < 40 else "Neutral"
+                            mfi_color = "#00ff88" if mfi_val > 60 else "#ff4444" if mfi_val < 40 else "#ffa500"
+                            indicators_data.append({
+                                'Indicator': 'Money Flow',
+                                'Value': f'{mfi_val:.2f}',
+                                'Signal': mfi_status,
+                                'Color': mfi_color
+                            })
                     
-                    for ind in indicators_data:
-                        st.markdown(f"""
-                        <div style="display: flex; justify-content: space-between; align-items: center; padding: 0.75rem 0; border-bottom: 1px solid rgba(255,255,255,0.1);">
-                            <div>
-                                <div style="color: white; font-weight: 600;">{ind['Indicator']}</div>
-                                <div style="color: rgba(255,255,255,0.6); font-size: 0.85rem;">{ind['Value']}</div>
-                            </div>
-                            <div class="signal-badge" style="background: rgba(255,255,255,0.1); color: {ind['Color']}; border: 1px solid {ind['Color']};">
-                                {ind['Signal']}
+                        for ind in indicators_data:
+                            st.markdown(f"""
+                            <div style="display: flex; justify-content: space-between; align-items: center; padding: 0.75rem 0; border-bottom: 1px solid rgba(255,255,255,0.1);">
+                                <div>
+                                    <div style="color: white; font-weight: 600;">{ind['Indicator']}</div>
+                                    <div style="color: rgba(255,255,255,0.6); font-size: 0.85rem;">{ind['Value']}</div>
+                                </div>
+                                <div class="signal-badge" style="background: rgba(255,255,255,0.1); color: {ind['Color']}; border: 1px solid {ind['Color']};">
+                                    {ind['Signal']}
+                                </div>
                             </div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                            """, unsafe_allow_html=True)
                     
-                    st.markdown('</div>', unsafe_allow_html=True)
+                        st.markdown('</div>', unsafe_allow_html=True)
                 
                 with col_right:
                     st.markdown('<div class="glass-card">', unsafe_allow_html=True)
@@ -1359,7 +1386,7 @@ while True:
                 # Market Depth Chart
                 if show_predictions:
                     st.markdown('<div class="section-header">🌟 Market Depth Analysis</div>', unsafe_allow_html=True)
-                    st.plotly_chart(create_market_depth_chart(df), use_container_width=True)
+                    st.plotly_chart(create_market_depth_chart(candle_store.get_order_book_depth(symbol)), use_container_width=True)
             
             elif "Indian" in market_type:
                 # Indian Market Analysis
@@ -1428,22 +1455,14 @@ while True:
                 # Global Market Overview
                 st.markdown('<div class="section-header">🌏 Global Market Overview</div>', unsafe_allow_html=True)
                 
-                # Fetch multiple crypto pairs
-                crypto_overview = {}
-                for sym in SYMBOLS[:8]:
-                    try:
-                        df_temp = fetcher.get_klines(sym, "1h", limit=24)
-                        price = df_temp['close'].iloc[-1]
-                        change = ((df_temp['close'].iloc[-1] - df_temp['close'].iloc[0]) / df_temp['close'].iloc[0]) * 100
-                        volume = df_temp['volume'].sum()
-                        crypto_overview[sym] = {
-                            'price': price,
-                            'change': change,
-                            'volume': volume
-                        }
-                    except:
-                        pass
-                
+                # One 24h ticker snapshot covers every USDT pair
+                try:
+                    crypto_overview = fetcher.get_ticker_24h()
+                except Exception as e:
+                    st.warning(f"⚠️ Could not load the 24h ticker ({type(e).__name__})")
+                    # Float columns like a real snapshot, so ranking and formatting below still work
+                    crypto_overview = BinanceDataFetcher.empty_ticker()
+
                 # Performance Heatmap
                 col_heat, col_table = st.columns([2, 1])
                 
@@ -1454,9 +1473,9 @@ while True:
                     st.markdown('<div class="glass-card">', unsafe_allow_html=True)
                     st.markdown("### 🏆 Top Performers")
                     
-                    sorted_crypto = sorted(crypto_overview.items(), key=lambda x: x[1]['change'], reverse=True)
+                    top_crypto = crypto_overview.nlargest(5, 'change')
                     
-                    for i, (sym, data) in enumerate(sorted_crypto[:5]):
+                    for i, (sym, data) in enumerate(top_crypto.set_index('symbol').iterrows()):
                         change_color = "#00ff88" if data['change'] >= 0 else "#ff4444"
                         medal = "🥇" if i == 0 else "🥈" if i == 1 else "🥉" if i == 2 else "🌟"
                         
@@ -1482,19 +1501,72 @@ while True:
                 # Detailed Table
                 st.markdown('<div class="section-header">📋 Detailed Market Data</div>', unsafe_allow_html=True)
                 
-                crypto_table = []
-                for sym, data in crypto_overview.items():
-                    crypto_table.append({
-                        'Symbol': sym,
-                        'Price': f"${data['price']:,.4f}",
-                        '24h Change': f"{data['change']:+.2f}%",
-                        '24h Volume': f"{data['volume']:,.0f}",
-                        'Signal': 'Buy' if data['change'] > 3 else 'Sell' if data['change'] < -3 else 'Hold'
-                    })
+                by_volume = crypto_overview.sort_values('quote_volume', ascending=False)
+                crypto_table = pd.DataFrame({
+                    'Symbol': by_volume['symbol'],
+                    'Price': by_volume['price'].map('${:,.4f}'.format),
+                    '24h Change': by_volume['change'].map('{:+.2f}%'.format),
+                    '24h Volume': by_volume['volume'].map('{:,.0f}'.format),
+                    'Signal': np.where(by_volume['change'] > 3, 'Buy', np.where(by_volume['change'] < -3, 'Sell', 'Hold'))
+                })
                 
                 st.markdown('<div class="glass-card">', unsafe_allow_html=True)
                 st.dataframe(
-                    pd.DataFrame(crypto_table),
+                    crypto_table,
+                    use_container_width=True,
+                    hide_index=True,
+                    height=400
+                )
+                st.markdown('</div>', unsafe_allow_html=True)
+                
+                # Market-wide anomaly screener: every symbol in one vectorized pass
+                st.markdown(f'<div class="section-header">🛰️ Anomaly Screener ({timeframe})</div>', unsafe_allow_html=True)
+                
+                screener_frames, screener_errors = candle_store.get_klines_many(SYMBOLS, timeframe, limit=100)
+                if screener_errors:
+                    st.warning("⚠️ Could not load: " + ", ".join(
+                        f"{sym} ({type(err).__name__})" for sym, err in screener_errors.items()
+                    ))
+                screener = BatchAnomalyDetector.screen(
+                    screener_frames,
+                    window=20,
+                    threshold=anomaly_sensitivity,
+                    spike_threshold=alert_threshold/100 if enable_alerts else 0.05
+                )
+                # Isolation Forest flags per symbol from the process pool; workers keep each symbol's fitted models
+                ml_results, ml_errors = parallel_detector.detect_many(
+                    screener_frames,
+                    interval=timeframe,
+                    detectors=('volume', 'multi_feature'),
+                    volume_contamination=0.1,
+                    multi_contamination=0.15
+                )
+                screener['ml_flags'] = screener['symbol'].map({
+                    sym: int(result['anomaly_count'].tail(10).gt(0).sum()) for sym, result in ml_results.items()
+                })
+                if ml_errors:
+                    st.caption("ML flags unavailable for: " + ", ".join(ml_errors))
+                # Last closed candle's volume against the symbol's own candles of this timeframe: the last
+                # 24 hours from merged hourly sketches, or 30 days of daily ones for hourly and longer candles
+                if TIMEFRAME_OPTIONS.get(timeframe, {}).get('seconds', 0) < 3600:
+                    volume_period, volume_last, volume_label = 'hourly', 24, '24h'
+                else:
+                    volume_period, volume_last, volume_label = 'daily', 30, '30d'
+                for sym, frame in screener_frames.items():
+                    volume_summaries.add(sym, timeframe, frame)
+                screener['volume_pct'] = screener['symbol'].map({
+                    sym: volume_summaries.percentile(sym, timeframe, frame['volume'].iloc[-2],
+                                                     period=volume_period, last=volume_last)
+                    for sym, frame in screener_frames.items() if len(frame) > 1
+                })
+                st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+                st.dataframe(
+                    screener.rename(columns={
+                        'symbol': 'Symbol', 'price': 'Price', 'return': 'Last Return %', 'z_score': 'Volatility Z',
+                        'volatility_anomalies': 'Volatility Flags', 'spikes': 'Spikes', 'breakouts': 'Band Breakouts',
+                        'total': 'Flags (last 10)', 'ml_flags': 'ML Flags (last 10)',
+                        'volume_pct': f'Volume %ile ({volume_label})'
+                    }),
                     use_container_width=True,
                     hide_index=True,
                     height=400
@@ -1540,13 +1612,17 @@ while True:
             
             iteration += 1
             
-            # Update timestamp
+            # Update timestamp and API budget
+            budget = fetcher.rate_limit_usage()
+            budget_color = "#ff4444" if budget['percent'] > 80 else "#ffa500" if budget['percent'] > 50 else "#00ff88"
             st.sidebar.markdown("---")
             st.sidebar.markdown(f"""
             <div style='text-align: center; padding: 1rem 0;'>
                 <p style='color: rgba(255,255,255,0.5); font-size: 0.85rem; margin: 0;'>Last Updated</p>
                 <p style='color: #667eea; font-weight: 600; font-size: 1rem; margin: 0.25rem 0 0 0;'>{datetime.now().strftime("%H:%M:%S")}</p>
                 <p style='color: rgba(255,255,255,0.5); font-size: 0.85rem; margin: 0.5rem 0 0 0;'>Iteration #{iteration}</p>
+                <p style='color: rgba(255,255,255,0.5); font-size: 0.85rem; margin: 0.5rem 0 0 0;'>API Weight Budget</p>
+                <p style='color: {budget_color}; font-weight: 600; font-size: 1rem; margin: 0.25rem 0 0 0;'>{budget['used_weight']}/{budget['capacity']} ({budget['percent']:.0f}%)</p>
             </div>
             """, unsafe_allow_html=True)
             
@@ -1568,6 +1644,9 @@ while True:
             
             st.code(f"Error Details: {str(e)}", language="python")
     
+    with status_placeholder.container():
+        render_system_status(fetcher.request_stats(), active_alerts)
+    
     if auto_refresh:
         time.sleep(refresh_interval)
     else:
@@ -0,0 +1,181 @@
+# src/candle_archive.py
+import os
+import threading
+import numpy as np
+import pandas as pd
+from binance.helpers import interval_to_milliseconds
+from config.settings import ARCHIVE, DATA_RETENTION
+
+# One fixed-width record per candle; timestamps are open times in ms
+CANDLE_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+
+DAY_MS = 86_400_000
+
+
+class CandleArchive:
+    """On-disk candle archive for one symbol/interval
+
+    Candles are stored as fixed-width records sorted by open time and read back
+    through a memory map, so a time-range lookup is a binary search and only the
+    requested window is ever copied into RAM. Newer candles are appended; older
+    ones that fill a gap are merged in by rewriting the file. Readers copy their
+    window out and drop the map under the lock, so a rewrite never replaces a
+    file that is still mapped (which Windows refuses).
+    """
+
+    def __init__(self, symbol: str, interval: str, root: str = None):
+        self.symbol = symbol
+        self.interval = interval
+        self.path = os.path.join(root or ARCHIVE['path'], f"{symbol}_{interval}.candles")
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        if not os.path.exists(self.path):
+            return 0
+        return os.path.getsize(self.path) // CANDLE_DTYPE.itemsize
+
+    @property
+    def retention_days(self):
+        """Days kept for this interval: DATA_RETENTION['daily'] for 1d and up, 'intraday' below"""
+        if interval_to_milliseconds(self.interval) >= DAY_MS:
+            return DATA_RETENTION['daily']
+        return DATA_RETENTION['intraday']
+
+    def last_timestamp(self):
+        """Open time (ms) of the newest stored candle, or None when empty"""
+        with self._lock:
+            records = self._records()
+            last = int(records['timestamp'][-1]) if len(records) else None
+            del records
+        return last
+
+    def append(self, df: pd.DataFrame):
+        """Store candles not already archived; returns how many were written
+
+        Candles newer than the last stored one are appended. Older ones whose
+        open time is missing are merged in, and stored candles always win.
+        """
+        with self._lock:
+            records = self._to_records(df)
+            # Sorted, one record per open time
+            _, first = np.unique(records['timestamp'], return_index=True)
+            records = records[first]
+            stored = self._records()
+            if len(stored):
+                last = int(stored['timestamp'][-1])
+                older = records[records['timestamp'] <= last]
+                records = records[records['timestamp'] > last]
+                pos = np.searchsorted(stored['timestamp'], older['timestamp'])
+                missing = older[stored['timestamp'][pos] != older['timestamp']]
+                if len(missing):
+                    merged = np.concatenate((np.array(stored), missing, records))
+                    merged = merged[np.argsort(merged['timestamp'], kind='stable')]
+                    del stored
+                    self._rewrite(merged)
+                    return len(missing) + len(records)
+            if not len(records):
+                return 0
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(self.path, 'ab') as f:
+                f.write(records.tobytes())
+            return len(records)
+
+    def gaps(self, start, end):
+        """Open-time ranges [lo, hi) within [start, end) that hold no stored candle, in ms"""
+        step = interval_to_milliseconds(self.interval)
+        start_ms, end_ms = self._to_ms(start), self._to_ms(end)
+        with self._lock:
+            timestamps = self._records()['timestamp']
+            lo = int(np.searchsorted(timestamps, start_ms, side='left'))
+            hi = int(np.searchsorted(timestamps, end_ms, side='left'))
+            stored = np.array(timestamps[lo:hi])
+            del timestamps
+        if not len(stored):
+            return [(start_ms, end_ms)] if start_ms < end_ms else []
+        gaps = []
+        if stored[0] - start_ms >= step:
+            gaps.append((start_ms, int(stored[0])))
+        jumps = np.flatnonzero(np.diff(stored) > step)
+        gaps.extend((int(stored[i]) + step, int(stored[i + 1])) for i in jumps)
+        if stored[-1] + step < end_ms:
+            gaps.append((int(stored[-1]) + step, end_ms))
+        return gaps
+
+    def read(self, start=None, end=None):
+        """Candles with start <= open time < end as a DataFrame, copying only that window"""
+        with self._lock:
+            records = self._records()
+            timestamps = records['timestamp']
+            lo = 0 if start is None else int(np.searchsorted(timestamps, self._to_ms(start), side='left'))
+            hi = len(records) if end is None else int(np.searchsorted(timestamps, self._to_ms(end), side='left'))
+            window = np.array(records[lo:hi])
+            del records, timestamps
+        return self._to_frame(window)
+
+    def tail(self, n: int):
+        """The newest ``n`` candles"""
+        with self._lock:
+            records = self._records()
+            window = np.array(records[max(0, len(records) - n):])
+            del records
+        return self._to_frame(window)
+
+    def trim(self, retention_days: float = None):
+        """Drop candles older than the retention window and compact the file"""
+        with self._lock:
+            records = self._records()
+            if not len(records):
+                return 0
+            days = self.retention_days if retention_days is None else retention_days
+            cutoff = int(records['timestamp'][-1]) - int(days * DAY_MS)
+            keep_from = int(np.searchsorted(records['timestamp'], cutoff, side='left'))
+            if keep_from == 0:
+                return 0
+            kept = np.array(records[keep_from:])
+            del records
+            self._rewrite(kept)
+            return keep_from
+
+    def _rewrite(self, records: np.ndarray):
+        """Replace the file with ``records`` atomically; callers hold the lock and no memory map"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(records.tobytes())
+        os.replace(tmp_path, self.path)
+
+    def _records(self):
+        if len(self) == 0:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        return np.memmap(self.path, dtype=CANDLE_DTYPE, mode='r', shape=(len(self),))
+
+    @staticmethod
+    def _to_ms(value):
+        if isinstance(value, (int, np.integer)):
+            return int(value)
+        return int(pd.Timestamp(value).value // 10**6)
+
+    @staticmethod
+    def _to_records(df: pd.DataFrame):
+        records = np.empty(len(df), dtype=CANDLE_DTYPE)
+        records['timestamp'] = df['timestamp'].values.astype('datetime64[ms]').astype(np.int64)
+        for col in ('open', 'high', 'low', 'close', 'volume'):
+            records[col] = df[col].values
+        return records
+
+    @staticmethod
+    def _to_frame(records):
+        return pd.DataFrame({
+            'timestamp': records['timestamp'].astype('datetime64[ms]').astype('datetime64[ns]'),
+            'open': records['open'],
+            'high': records['high'],
+            'low': records['low'],
+            'close': records['close'],
+            'volume': records['volume'],
+        })
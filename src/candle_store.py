@@ -0,0 +1,155 @@
+# src/candle_store.py
+import threading
+import time
+from config.settings import CANDLE_STORE
+from rate_limiter import PRIORITY_HIGH, PRIORITY_LOW
+
+
+class _StoreEntry:
+    """Latest candles for one (symbol, interval) plus the thread keeping them fresh"""
+
+    def __init__(self, symbol: str, interval: str, limit: int, priority: int):
+        self.symbol = symbol
+        self.interval = interval
+        self.limit = limit
+        self.priority = priority
+        self.frame = None
+        self.error = None
+        self.updated_at = None
+        self.last_read = time.monotonic()
+        self.ready = threading.Event()
+        self.wake = threading.Event()
+        self.thread = None
+
+
+class SharedCandleStore:
+    """Process-wide, thread-safe candle store shared by every dashboard session
+
+    Each (symbol, interval) gets exactly one refresher thread no matter how many
+    sessions read it. Keys nobody has read for ``idle_timeout`` seconds are dropped.
+    In streaming mode order book reads hold the symbol's diff-depth stream the
+    same way, and it is released once nobody has read the book for ``idle_timeout``.
+    """
+
+    def __init__(self, fetcher, refresh_seconds: float = None, idle_timeout: float = None):
+        self.fetcher = fetcher
+        self.refresh_seconds = refresh_seconds or CANDLE_STORE['refresh_seconds']
+        self.idle_timeout = idle_timeout or CANDLE_STORE['idle_timeout']
+        self._entries = {}
+        # Last read per symbol whose diff-depth stream this store holds
+        self._depth_reads = {}
+        self._lock = threading.Lock()
+
+    def get_klines(self, symbol: str, interval: str, limit: int = 100, priority: int = PRIORITY_HIGH):
+        """Latest OHLCV candles for (symbol, interval), waiting for the first fetch if needed"""
+        entry = self._acquire(symbol, interval, limit, priority)
+        if not entry.ready.wait(timeout=CANDLE_STORE['first_fetch_timeout']):
+            raise TimeoutError(f"No candles for {symbol} {interval} yet")
+        frame = entry.frame
+        if frame is None:
+            raise entry.error
+        return frame.tail(limit).reset_index(drop=True).copy()
+
+    def get_klines_many(self, symbols, interval: str, limit: int = 100, priority: int = PRIORITY_LOW):
+        """Latest candles for several symbols; returns ``(results, errors)`` keyed by symbol"""
+        for sym in symbols:
+            # Register every key first so their first fetches run side by side
+            self._acquire(sym, interval, limit, priority)
+        results, errors = {}, {}
+        for sym in symbols:
+            try:
+                results[sym] = self.get_klines(sym, interval, limit, priority)
+            except Exception as e:
+                errors[sym] = e
+        return results, errors
+
+    def get_order_book_depth(self, symbol: str, levels: int = None):
+        """Cumulative bid/ask depth for ``symbol`` (see BinanceDataFetcher.get_order_book_depth)"""
+        if getattr(self.fetcher, 'stream', None) is not None:
+            with self._lock:
+                held = symbol in self._depth_reads
+                self._depth_reads[symbol] = time.monotonic()
+            if not held:
+                try:
+                    self.fetcher.subscribe_depth(symbol)
+                except Exception:
+                    # Retried on the next read; until then depth is polled over REST
+                    with self._lock:
+                        self._depth_reads.pop(symbol, None)
+                    return self.fetcher.get_order_book_depth(symbol, levels)
+                threading.Thread(
+                    target=self._release_idle_depth,
+                    args=(symbol,),
+                    name=f"candle-store-depth-{symbol}",
+                    daemon=True
+                ).start()
+        return self.fetcher.get_order_book_depth(symbol, levels)
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+    def _acquire(self, symbol: str, interval: str, limit: int, priority: int):
+        key = (symbol, interval)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _StoreEntry(symbol, interval, limit, priority)
+                entry.thread = threading.Thread(
+                    target=self._refresh_loop,
+                    args=(key, entry),
+                    name=f"candle-store-{symbol}-{interval}",
+                    daemon=True
+                )
+                self._entries[key] = entry
+                entry.thread.start()
+            elif limit > entry.limit:
+                # A viewer wants a longer window - widen it and refresh right away
+                entry.limit = limit
+                entry.ready.clear()
+                entry.wake.set()
+            # A key is as urgent as its most urgent reader
+            entry.priority = min(entry.priority, priority)
+            entry.last_read = time.monotonic()
+        return entry
+
+    def _refresh_loop(self, key, entry: _StoreEntry):
+        stream = getattr(self.fetcher, 'stream', None)
+        subscribed = False
+        while True:
+            with self._lock:
+                if time.monotonic() - entry.last_read > self.idle_timeout:
+                    del self._entries[key]
+                    break
+                limit = entry.limit
+                priority = entry.priority
+            try:
+                if stream is not None and not subscribed:
+                    # Retried every refresh until it works; until then the key is polled over REST
+                    try:
+                        self.fetcher.subscribe(entry.symbol, entry.interval)
+                        subscribed = True
+                    except Exception as e:
+                        entry.error = e
+                frame = self.fetcher.get_klines(entry.symbol, entry.interval, limit=limit, priority=priority)
+                entry.frame, entry.error = frame, None
+                entry.updated_at = time.time()
+            except Exception as e:
+                # Keep serving the last good frame; readers only see the error if there is none
+                entry.error = e
+            with self._lock:
+                if limit >= entry.limit:
+                    entry.ready.set()
+            entry.wake.wait(timeout=self.refresh_seconds)
+            entry.wake.clear()
+        if subscribed:
+            self.fetcher.unsubscribe(entry.symbol, entry.interval)
+
+    def _release_idle_depth(self, symbol: str):
+        while True:
+            time.sleep(self.refresh_seconds)
+            with self._lock:
+                if time.monotonic() - self._depth_reads[symbol] > self.idle_timeout:
+                    del self._depth_reads[symbol]
+                    break
+        self.fetcher.unsubscribe_depth(symbol)
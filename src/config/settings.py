@@ -70,6 +70,10 @@ INDIAN_INDICES = {
 # ============= TRADING PARAMETERS =============
 TIMEFRAME = "1m"  # Default timeframe
 DEFAULT_LIMIT = 200  # Default number of candles to fetch
+KLINE_BUFFER_SIZE = 1000  # Candles held in memory per symbol/interval for incremental refreshes
+FETCH_WORKERS = 8  # Concurrent REST requests for multi-symbol fetches
+TICKER_REFRESH_SECONDS = 10  # Reuse the all-symbols 24h ticker (weight 80) for this long
+QUOTE_ASSET = "USDT"  # Quote currency of the pairs shown in the market overview
 
 TIMEFRAME_OPTIONS = {
     "1m": {"name": "1 Minute", "seconds": 60},
@@ -190,13 +194,78 @@ BINANCE_RATE_LIMITS = {
     "requests_per_minute": 1200,
     "orders_per_second": 10,
     "orders_per_day": 200000,
+    "low_priority_reserve": 0.2,   # Share of the weight budget kept free for the active chart
+    "low_priority_timeout": 2.0,   # Seconds a background request may queue before it is shed
+}
+
+# ============= REQUEST TELEMETRY =============
+REQUEST_TELEMETRY = {
+    "window": 500,          # Requests kept per endpoint for the rolling latency percentiles
+    "max_retries": 2,       # Retries for connection errors, timeouts and 5xx responses
+    "retry_backoff": 0.5,   # Seconds before the first retry, doubled for each further one
+}
+
+# ============= STREAMING =============
+STREAMING = {
+    "enabled": os.getenv("BINANCE_STREAMING", "false").lower() == "true",  # Push klines over WebSocket instead of polling
+    "stream_url": os.getenv("BINANCE_STREAM_URL", ""),  # Override the stream endpoint, e.g. a local replay server
+    "record_path": os.getenv("BINANCE_STREAM_RECORD", ""),  # Append every received kline message to this JSONL file
+}
+
+# ============= REST RECORD / REPLAY =============
+REST_REPLAY = {
+    "mode": os.getenv("BINANCE_FETCHER_MODE", "live"),  # live, record (log every REST response) or replay (serve the log offline)
+    "path": os.getenv("BINANCE_FIXTURE_PATH", "data/fixtures/binance_rest.jsonl.gz"),
+    "latency": float(os.getenv("BINANCE_REPLAY_LATENCY", "0")),  # Seconds added to every replayed response
+    "flush_every": 100,  # Recorded calls buffered before the log is flushed to disk (it is also flushed on close)
+}
+
+# ============= ORDER BOOK =============
+ORDER_BOOK = {
+    "levels": 100,           # Levels per side plotted in Market Depth (and REST depth polled without streaming)
+    "snapshot_limit": 1000,  # Depth of the REST snapshot a streamed book is synced from
+    "update_ms": 100,        # Diff-depth stream update speed: 100 (ms), or None for the 1 s stream
+    "snapshot_ttl": 5,       # Seconds a polled REST depth snapshot is shared by every session
+}
+
+# ============= PARALLEL DETECTION =============
+PARALLEL_DETECTION = {
+    "max_workers": None,   # Worker processes; None uses every available core
+    "task_timeout": 30,    # Seconds from submission before a symbol's detection is given up on
+}
+
+# ============= LOCAL RESAMPLING =============
+RESAMPLING = {
+    "enabled": True,             # Derive TIMEFRAME_OPTIONS intervals from 1m candles instead of downloading each
+    "max_base_candles": 10080,   # Longest 1m window to derive from (7 days); longer requests fall back to REST
+}
+
+# ============= SHARED CANDLE STORE =============
+CANDLE_STORE = {
+    "refresh_seconds": 3,       # How often each (symbol, interval) is refreshed, shared by all sessions
+    "idle_timeout": 120,        # Stop refreshing a key nobody has read for this many seconds
+    "first_fetch_timeout": 30,  # Max seconds a reader waits for a brand-new key's first fetch
 }
 
 # ============= DATA RETENTION =============
 DATA_RETENTION = {
     "intraday": 7,      # Keep 7 days of minute data
     "daily": 365,       # Keep 1 year of daily data
-    "cache_ttl": 60,    # Cache timeout in seconds
+    "cache_ttl": 60,    # Cache timeout in seconds (upper bound; shorter intervals refresh after 1/12 of a candle)
+    "cache_max_stale": 300,  # Seconds a stale frame may still be served while it refreshes in the background
+}
+
+# Memory-mapped candle archive (see src/candle_archive.py); trimmed to DATA_RETENTION
+ARCHIVE = {
+    "enabled": os.getenv("CANDLE_ARCHIVE", "true").lower() == "true",  # Persist closed candles as they are fetched
+    "path": "data/archive/",
+    "trim_interval": 3600,  # Seconds between retention trims of a live archive
+}
+
+# ============= ANOMALY EVENT STORE =============
+# Append-only SQLite log of anomaly events (see src/event_store.py)
+EVENT_STORE = {
+    "path": os.getenv("ANOMALY_EVENT_DB", "data/anomaly_events.sqlite3"),
 }
 
 # ============= LOGGING CONFIGURATION =============
@@ -232,6 +301,19 @@ ML_CONFIG = {
             "random_state": 42,
             "max_samples": "auto",
         },
+        "half_space_trees": {
+            "n_trees": 25,
+            "depth": 10,
+            "window": 250,        # Candles per reference window; counts roll over after each
+            "size_limit": 0.1,    # Fraction of the window below which a node is too sparse to score
+            "random_state": 42,
+        },
+        "quantile_sketch": {
+            "k": 200,                 # Compactor size; rank error is roughly 1.7 / k
+            "lower_quantile": None,   # Tail quantiles of log volume; None splits contamination evenly
+            "upper_quantile": None,
+            "random_state": 42,
+        },
         "lstm": {
             "units": 50,
             "epochs": 50,
@@ -239,11 +321,28 @@ ML_CONFIG = {
             "lookback": 60,
         }
     },
+    # Model behind each Isolation Forest detector: "isolation_forest" or "half_space_trees",
+    # or "quantile_sketch" for volume
+    "detector_models": {
+        "volume": "isolation_forest",
+        "multi_feature": "isolation_forest",
+    },
+    # Hourly and daily volume sketches per symbol, for cross-symbol comparisons
+    "volume_summaries": {
+        "k": 200,
+        "hourly_buckets": 72,     # Hours kept back from the newest, per symbol and interval
+        "daily_buckets": 30,      # Days kept back from the newest, per symbol and interval
+    },
     "feature_engineering": {
         "use_technical_indicators": True,
         "use_volume_profile": True,
         "use_price_action": True,
         "normalize_features": True,
+    },
+    "model_cache": {
+        "max_age": 900,           # Seconds before a cached model is refit on the current window
+        "drift_threshold": 1.0,   # Refit when a feature's mean moves this many training stds
+        "max_models": 64,         # Least recently used models beyond this are dropped
     }
 }
 
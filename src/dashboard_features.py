@@ -0,0 +1,160 @@
+# src/dashboard_features.py
+import numpy as np
+import pandas as pd
+from detection_pipeline import DetectionPipeline, OUTPUT_COLUMNS
+from feature_graph import FeatureGraph
+from rolling import RollingWindows, rolling_max, rolling_mean, rolling_min, rolling_sum
+
+# Columns of a candle frame every feature may read
+CANDLE_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+# Flags that count towards anomaly_count and severity (as in get_anomaly_severity)
+ANOMALY_FLAGS = ('is_anomaly', 'is_volume_anomaly', 'is_pattern_anomaly', 'is_multi_anomaly')
+
+GRAPH = FeatureGraph(CANDLE_COLUMNS)
+
+
+def _series(cols, name):
+    return pd.Series(cols[name])
+
+
+# ============= SHARED INPUTS =============
+@GRAPH.register('_close_windows', ('close',))
+def _close_windows(cols, context):
+    # One set of prefix sums for every close-price window
+    return {'_close_windows': RollingWindows(cols['close'])}
+
+
+@GRAPH.register('returns', ('close',))
+def _returns(cols, context):
+    close = cols['close'].astype(np.float64)
+    returns = np.full(len(close), np.nan)
+    returns[1:] = close[1:] / close[:-1] - 1
+    return {'returns': returns}
+
+
+# ============= TECHNICAL INDICATORS =============
+for _window in (20, 50, 200):
+    GRAPH.register(f'SMA_{_window}', ('_close_windows',),
+                   lambda cols, context, window=_window: {f'SMA_{window}': cols['_close_windows'].mean(window)})
+
+for _span in (12, 26):
+    GRAPH.register(f'EMA_{_span}', ('close',),
+                   lambda cols, context, span=_span: {
+                       f'EMA_{span}': _series(cols, 'close').ewm(span=span, adjust=False).mean().values
+                   })
+
+
+@GRAPH.register('MACD', ('EMA_12', 'EMA_26'))
+def _macd(cols, context):
+    return {'MACD': cols['EMA_12'] - cols['EMA_26']}
+
+
+@GRAPH.register('Signal', ('MACD',))
+def _macd_signal(cols, context):
+    return {'Signal': _series(cols, 'MACD').ewm(span=9, adjust=False).mean().values}
+
+
+@GRAPH.register('MACD_Histogram', ('MACD', 'Signal'))
+def _macd_histogram(cols, context):
+    return {'MACD_Histogram': cols['MACD'] - cols['Signal']}
+
+
+@GRAPH.register('RSI', ('close',))
+def _rsi(cols, context):
+    delta = _series(cols, 'close').diff()
+    gain = pd.Series(rolling_mean(delta.where(delta > 0, 0).values, 14))
+    loss = pd.Series(rolling_mean((-delta.where(delta < 0, 0)).values, 14))
+    rs = gain / loss
+    return {'RSI': (100 - (100 / (1 + rs))).values}
+
+
+@GRAPH.register(('BB_middle', 'BB_upper', 'BB_lower', 'BB_width'), ('_close_windows',))
+def _bollinger(cols, context):
+    middle, std = cols['_close_windows'].mean_std(20)
+    upper, lower = middle + 2 * std, middle - 2 * std
+    with np.errstate(invalid='ignore', divide='ignore'):
+        width = (upper - lower) / middle * 100
+    return {'BB_middle': middle, 'BB_upper': upper, 'BB_lower': lower, 'BB_width': width}
+
+
+@GRAPH.register('Stochastic', ('low', 'high', 'close'))
+def _stochastic(cols, context):
+    low_14 = rolling_min(cols['low'], 14)
+    high_14 = rolling_max(cols['high'], 14)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {'Stochastic': (cols['close'] - low_14) / (high_14 - low_14) * 100}
+
+
+@GRAPH.register('ATR', ('high', 'low', 'close'))
+def _atr(cols, context):
+    high, low, close = _series(cols, 'high'), _series(cols, 'low'), _series(cols, 'close')
+    ranges = pd.concat([high - low, np.abs(high - close.shift()), np.abs(low - close.shift())], axis=1)
+    return {'ATR': rolling_mean(np.max(ranges, axis=1).values, 14)}
+
+
+@GRAPH.register('OBV', ('close', 'volume'))
+def _obv(cols, context):
+    close = _series(cols, 'close')
+    return {'OBV': (np.sign(close.diff()) * cols['volume']).fillna(0).cumsum().values}
+
+
+@GRAPH.register('MFI', ('high', 'low', 'close', 'volume'))
+def _mfi(cols, context):
+    typical_price = (_series(cols, 'high') + _series(cols, 'low') + _series(cols, 'close')) / 3
+    money_flow = typical_price * cols['volume']
+    positive_flow = pd.Series(rolling_sum(money_flow.where(typical_price > typical_price.shift(1), 0).values, 14))
+    negative_flow = pd.Series(rolling_sum(money_flow.where(typical_price < typical_price.shift(1), 0).values, 14))
+    return {'MFI': (100 - (100 / (1 + positive_flow / negative_flow))).values}
+
+
+@GRAPH.register('Volume_MA', ('volume',))
+def _volume_ma(cols, context):
+    return {'Volume_MA': rolling_mean(cols['volume'], 20)}
+
+
+# ============= ANOMALY DETECTORS =============
+# Features DetectionPipeline would share between detectors; here they are graph nodes computed once
+SHARED_INPUTS = {
+    'volatility': ('returns',),
+    'volume': (),
+    'spikes': ('returns',),
+    'pattern': ('rolling_mean', 'rolling_std'),
+    'multi_feature': ('returns',),
+}
+
+
+@GRAPH.register(('rolling_mean', 'rolling_std'), ('_close_windows',))
+def _rolling_band(cols, context):
+    window = ((context or {}).get('pipeline') or {}).get('window', 20)
+    rolling_mean, rolling_std = cols['_close_windows'].mean_std(window)
+    return {'rolling_mean': rolling_mean, 'rolling_std': rolling_std}
+
+
+def _detector(name):
+    """Node running one DetectionPipeline detector on the shared features; ``context`` holds its settings and cache key"""
+    shared = SHARED_INPUTS[name]
+    outputs = tuple(col for col in OUTPUT_COLUMNS[name] if col not in shared)
+
+    def compute(cols, context):
+        context = context or {}
+        pipeline = DetectionPipeline(detectors=(name,), **context.get('pipeline', {}))
+        result = pipeline.detect(
+            {col: cols[col] for col in ('timestamp', 'close', 'volume')},
+            cache_key=context.get('cache_key'),
+            shared={col: cols[col] for col in shared}
+        )
+        return {col: result[col] for col in outputs}
+
+    GRAPH.register(outputs, ('timestamp', 'close', 'volume') + shared, compute)
+
+
+for _name in ('volatility', 'volume', 'spikes', 'pattern', 'multi_feature'):
+    _detector(_name)
+
+
+@GRAPH.register(('anomaly_count', 'severity'), ANOMALY_FLAGS)
+def _severity(cols, context):
+    anomaly_count = np.sum([cols[flag] for flag in ANOMALY_FLAGS], axis=0)
+    severity = pd.cut(anomaly_count, bins=[-np.inf, 0, 1, 2, np.inf], labels=['Normal', 'Low', 'Medium', 'High'])
+    return {'anomaly_count': anomaly_count, 'severity': severity}
@@ -1,24 +1,612 @@
 # src/data_fetcher.py
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from binance import Client
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+from requests.exceptions import ConnectionError, Timeout
+from binance.helpers import interval_to_milliseconds
+import numpy as np
 import pandas as pd
-from config.settings import BINANCE_API_KEY, BINANCE_API_SECRET
+from config.settings import (
+    ARCHIVE, BINANCE_API_KEY, BINANCE_API_SECRET, DATA_RETENTION, KLINE_BUFFER_SIZE, FETCH_WORKERS, ORDER_BOOK,
+    QUOTE_ASSET, REQUEST_TELEMETRY, RESAMPLING, REST_REPLAY, STREAMING, TICKER_REFRESH_SECONDS, TIMEFRAME_OPTIONS
+)
+from candle_archive import CandleArchive
+from resampler import BASE_INTERVAL, BASE_MS, CandleResampler
+from kline_stream import KlineStream
+from order_book import LocalOrderBook, OrderBookSync
+from rest_replay import RecordingClient, ReplayClient
+from rate_limiter import PRIORITY_HIGH, PRIORITY_LOW, RateLimitExceeded, WeightRateLimiter, request_weight
+from singleflight import SingleFlight
+from telemetry import RequestTelemetry
+
+KLINE_PAGE_LIMIT = 1000  # Binance caps a single klines request at 1000 candles
+# Numeric 24h ticker fields kept by get_ticker_24h(), as (Binance field, column)
+TICKER_FIELDS = [
+    ('lastPrice', 'price'),
+    ('priceChangePercent', 'change'),
+    ('volume', 'volume'),
+    ('quoteVolume', 'quote_volume'),
+    ('highPrice', 'high'),
+    ('lowPrice', 'low'),
+]
+
+
+class ThreadSafeClient(Client):
+    """``binance.Client`` whose ``response`` (the last HTTP response) is kept per thread
+
+    The fetcher's thread pools share one client. Each request reads its rate-limit
+    headers and payload size from ``response`` right after the call returns, so a
+    shared attribute could hold another thread's response by then.
+    """
+
+    @property
+    def response(self):
+        return getattr(self._thread_local(), 'response', None)
+
+    @response.setter
+    def response(self, value):
+        self._thread_local().response = value
+
+    def _thread_local(self):
+        # Created on first use: the base constructor already assigns ``response``
+        return self.__dict__.setdefault('_local', threading.local())
+
+
+def build_client(mode: str = None, path: str = None, latency: float = None):
+    """REST client for REST_REPLAY['mode']: live, recording to ``path``, or replaying from it"""
+    mode = mode or REST_REPLAY['mode']
+    path = path or REST_REPLAY['path']
+    if mode == 'replay':
+        return ReplayClient(path, latency=REST_REPLAY['latency'] if latency is None else latency)
+    client = ThreadSafeClient(BINANCE_API_KEY, BINANCE_API_SECRET)
+    if mode == 'record':
+        return RecordingClient(client, path, flush_every=REST_REPLAY['flush_every'])
+    return client
+
 
 class BinanceDataFetcher:
-    def __init__(self):
-        self.client = Client(BINANCE_API_KEY, BINANCE_API_SECRET)
-    
-    def get_klines(self, symbol: str, interval: str, limit: int = 100):
-        """Fetch OHLCV data from Binance"""
-        klines = self.client.get_klines(
-            symbol=symbol,
-            interval=interval,
-            limit=limit
-        )
-        df = pd.DataFrame(klines, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_asset_volume', 'trades',
-            'taker_buy_base', 'taker_buy_quote', 'ignore'
-        ])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df[['open', 'high', 'low', 'close', 'volume']] = df[['open', 'high', 'low', 'close', 'volume']].astype(float)
-        return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
\ No newline at end of file
+    def __init__(self, streaming: bool = False, stream_url: str = None, client=None):
+        # Any object with the binance.Client endpoint methods, e.g. a ReplayClient for offline runs
+        self.client = client if client is not None else build_client()
+        # Candles already held per (symbol, interval), oldest first
+        self._candles = {}
+        self._lock = threading.RLock()
+        # Streamed keys that missed a candle and need a REST catch-up
+        self._stream_gaps = set()
+        # Subscribers per underlying stream key; resampled intervals share their symbol's 1m stream
+        self._stream_refs = {}
+        # Subscribers per symbol's diff-depth stream
+        self._depth_refs = {}
+        self._stream_lock = threading.Lock()
+        # On-disk archives per (symbol, interval) and when each was last trimmed
+        self._archives = {}
+        self._archive_trimmed = {}
+        # Higher timeframes derived locally from each symbol's 1m candles
+        self._resamplers = {}
+        # Shared pool for batch requests, bounded so a burst can't open unlimited connections
+        self._executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='kline-fetch')
+        # Separate pool for pages so a paginated fetch inside a batch can't deadlock the batch pool
+        self._page_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='kline-page')
+        self.rate_limiter = WeightRateLimiter()
+        self.telemetry = RequestTelemetry()
+        # Concurrent identical loads and REST calls share one in-flight call
+        self._inflight = SingleFlight()
+        # Last good frame per (symbol, interval) as (frame, limit, fetched_at), and keys being refreshed
+        self._kline_cache = {}
+        self._revalidating = set()
+        # Streamed order books per symbol, and polled depth as (symbol, levels) -> (depth, taken_at)
+        self._order_books = {}
+        self._depth = {}
+        # Last all-symbols 24h ticker snapshot and when it was taken
+        self._ticker = None
+        self._ticker_at = 0.0
+        self._ticker_lock = threading.Lock()
+        self.stream = None
+        if streaming:
+            self.stream = KlineStream(
+                on_kline=self._on_stream_kline,
+                stream_url=stream_url or STREAMING['stream_url'] or None,
+                record_path=STREAMING['record_path'] or None
+            )
+
+    def subscribe(self, symbol: str, interval: str):
+        """Keep (symbol, interval) updated from the kline stream instead of polling REST
+
+        Subscriptions are counted per underlying stream; each one needs a matching
+        ``unsubscribe`` before the stream is closed.
+        """
+        if self.stream is None:
+            raise RuntimeError("BinanceDataFetcher was created without streaming=True")
+        key = self._stream_key(symbol, interval)
+        with self._stream_lock:
+            if key not in self.stream.subscriptions:
+                # Open the socket before seeding so no candle falls between the two
+                self.stream.subscribe(*key)
+                with self._lock:
+                    self._stream_gaps.add(key)
+            self._stream_refs[key] = self._stream_refs.get(key, 0) + 1
+
+    def unsubscribe(self, symbol: str, interval: str):
+        """Drop one subscription; the stream closes when its last subscriber is gone"""
+        if self.stream is None:
+            return
+        key = self._stream_key(symbol, interval)
+        with self._stream_lock:
+            refs = self._stream_refs.get(key, 0) - 1
+            if refs > 0:
+                self._stream_refs[key] = refs
+                return
+            self._stream_refs.pop(key, None)
+            self.stream.unsubscribe(*key)
+
+    def subscribe_depth(self, symbol: str):
+        """Keep ``symbol``'s order book current from the diff-depth stream
+
+        Counted like ``subscribe``; the socket and book are dropped when the last
+        subscriber calls ``unsubscribe_depth``.
+        """
+        if self.stream is None:
+            raise RuntimeError("BinanceDataFetcher was created without streaming=True")
+        with self._stream_lock:
+            refs = self._depth_refs.get(symbol, 0)
+            self._depth_refs[symbol] = refs + 1
+            if refs:
+                return
+            sync = OrderBookSync(
+                symbol,
+                lambda: self._request('get_order_book', PRIORITY_LOW, symbol=symbol, limit=ORDER_BOOK['snapshot_limit'])
+            )
+            with self._lock:
+                self._order_books[symbol] = sync
+            # Open the socket first; events buffer until the snapshot lands
+            self.stream.subscribe_depth(symbol, sync.on_event, interval=ORDER_BOOK['update_ms'])
+
+    def unsubscribe_depth(self, symbol: str):
+        """Drop one depth subscription; the socket closes when its last subscriber is gone"""
+        if self.stream is None:
+            return
+        with self._stream_lock:
+            refs = self._depth_refs.get(symbol, 0) - 1
+            if refs > 0:
+                self._depth_refs[symbol] = refs
+                return
+            self._depth_refs.pop(symbol, None)
+            with self._lock:
+                self._order_books.pop(symbol, None)
+            self.stream.unsubscribe_depth(symbol)
+
+    def get_klines(self, symbol: str, interval: str, limit: int = 100, priority: int = PRIORITY_HIGH):
+        """Fetch OHLCV data from Binance, only downloading candles newer than the last one held
+
+        Frames younger than the interval's cache TTL are served from memory. Stale
+        ones (up to ``cache_max_stale`` seconds) are served at once while a
+        background refresh replaces them. Concurrent calls for the same
+        (symbol, interval, limit) wait for the one already in flight.
+        """
+        key = (symbol, interval)
+        with self._lock:
+            cached = None if self._is_streamed(key) else self._kline_cache.get(key)
+        if cached is not None:
+            frame, cached_limit, fetched_at = cached
+            age = time.monotonic() - fetched_at
+            if cached_limit >= limit and age < DATA_RETENTION['cache_max_stale']:
+                if age >= self._cache_ttl(interval):
+                    self._revalidate(symbol, interval, cached_limit, priority)
+                return frame.tail(limit).reset_index(drop=True).copy()
+        return self._get_fresh_klines(symbol, interval, limit, priority)
+
+    @staticmethod
+    def _cache_ttl(interval: str):
+        """Seconds a cached frame counts as fresh: 1/12 of a candle, capped at DATA_RETENTION['cache_ttl']"""
+        return min(interval_to_milliseconds(interval) / 12_000, DATA_RETENTION['cache_ttl'])
+
+    def _get_fresh_klines(self, symbol: str, interval: str, limit: int, priority: int):
+        candles, _ = self._coalesce(('klines', symbol, interval, limit), priority,
+                                    self._load_klines, symbol, interval, limit, priority)
+        with self._lock:
+            cached = self._kline_cache.get((symbol, interval))
+            # Keep the widest window; a narrower fresh one must not evict it while it can still be served
+            expired = cached is not None and time.monotonic() - cached[2] >= DATA_RETENTION['cache_max_stale']
+            if cached is None or limit >= cached[1] or expired:
+                self._kline_cache[(symbol, interval)] = (candles, limit, time.monotonic())
+        return candles.copy()
+
+    def _revalidate(self, symbol: str, interval: str, limit: int, priority: int):
+        """Refresh a stale cached frame on the batch pool unless a refresh is already queued"""
+        key = (symbol, interval)
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def refresh():
+            try:
+                self._get_fresh_klines(symbol, interval, limit, priority)
+            except Exception:
+                # Readers keep the last good frame; the failure is already in request telemetry
+                pass
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+        self._executor.submit(refresh)
+
+    def _load_klines(self, symbol: str, interval: str, limit: int, priority: int):
+        base_limit = self._resample_base_limit(interval, limit)
+        if base_limit is not None:
+            return self._get_resampled_klines(symbol, interval, limit, base_limit, priority)
+
+        key = (symbol, interval)
+        with self._lock:
+            held = self._candles.get(key)
+            streamed = self._is_streamed(key) and held is not None and len(held) >= limit
+        if streamed:
+            # The socket keeps the buffer current - no request needed
+            self._archive_closed(symbol, interval, held)
+            return held.tail(limit).reset_index(drop=True).copy()
+
+        if held is None or len(held) < limit:
+            candles = self._fetch_latest(symbol, interval, limit, priority)
+        else:
+            # The last held candle may still be open, so refetch from its open time onward
+            last_open = int(held['timestamp'].iloc[-1].value // 10**6)
+            new = self._fetch_klines(symbol, interval, priority, limit=KLINE_PAGE_LIMIT, startTime=last_open)
+            if len(new) >= KLINE_PAGE_LIMIT:
+                # Gap is larger than one page - cheaper to start over than to stitch
+                candles = self._fetch_latest(symbol, interval, limit, priority)
+            else:
+                candles = self._merge_candles(held, new)
+
+        with self._lock:
+            # Stream updates that landed while we were fetching win over the REST copy
+            current = self._candles.get(key)
+            if current is not None and current is not held and not candles.empty:
+                candles = self._merge_candles(candles, current[current['timestamp'] >= candles['timestamp'].iloc[-1]])
+            # Never shrink the buffer: other readers (e.g. resampled timeframes) may want a longer window
+            keep = max(limit, KLINE_BUFFER_SIZE, len(held) if held is not None else 0)
+            self._candles[key] = candles.tail(keep).reset_index(drop=True)
+            self._stream_gaps.discard(key)
+        self._archive_closed(symbol, interval, candles)
+        return candles.tail(limit).reset_index(drop=True).copy()
+
+    def get_klines_many(self, symbols, interval: str, limit: int = 100, priority: int = PRIORITY_LOW):
+        """Fetch OHLCV data for several symbols concurrently
+
+        Returns ``(results, errors)``: frames keyed by symbol for the requests that
+        succeeded and the raised exception keyed by symbol for those that did not.
+        """
+        futures = {
+            sym: self._executor.submit(self.get_klines, sym, interval, limit, priority)
+            for sym in symbols
+        }
+        results, errors = {}, {}
+        for sym, future in futures.items():
+            try:
+                results[sym] = future.result()
+            except Exception as e:
+                errors[sym] = e
+        return results, errors
+
+    def get_ticker_24h(self, quote: str = QUOTE_ASSET, priority: int = PRIORITY_LOW):
+        """24h price, change and volume for every pair quoted in ``quote`` from one request
+
+        The all-symbols ticker costs 80 weight, so one snapshot is shared by every
+        caller for TICKER_REFRESH_SECONDS. Pairs that did not trade in the last
+        24h (delisted or halted) are left out.
+        """
+        with self._ticker_lock:
+            if self._ticker is None or time.monotonic() - self._ticker_at >= TICKER_REFRESH_SECONDS:
+                self._ticker = self._parse_ticker(self._request('get_ticker', priority))
+                self._ticker_at = time.monotonic()
+            ticker = self._ticker
+        if quote:
+            ticker = ticker[ticker['symbol'].str.endswith(quote)]
+        return ticker[ticker['quote_volume'] > 0].reset_index(drop=True)
+
+    @staticmethod
+    def empty_ticker():
+        """A get_ticker_24h frame with no pairs and the same column types, for when the ticker can't be loaded"""
+        return BinanceDataFetcher._parse_ticker([])
+
+    def get_order_book_depth(self, symbol: str, levels: int = None, priority: int = PRIORITY_HIGH):
+        """Cumulative bid/ask depth nearest the touch: columns side, price, quantity
+
+        While ``subscribe_depth`` holds the symbol, its book is kept locally from a
+        REST snapshot plus the diff-depth stream, and reads cost no request.
+        Otherwise (or until the streamed book has synced) a REST snapshot of
+        ``levels`` levels is used, shared by every caller for
+        ORDER_BOOK['snapshot_ttl'] seconds.
+        """
+        levels = levels or ORDER_BOOK['levels']
+        with self._lock:
+            sync = self._order_books.get(symbol)
+        if sync is not None:
+            depth = sync.snapshot(levels)
+            if depth is not None:
+                return depth
+        key = (symbol, levels)
+        with self._lock:
+            cached = self._depth.get(key)
+        if cached is not None and time.monotonic() - cached[1] < ORDER_BOOK['snapshot_ttl']:
+            return cached[0].copy()
+        book = LocalOrderBook(symbol)
+        book.load_snapshot(self._request('get_order_book', priority, symbol=symbol, limit=levels))
+        depth = book.depth(levels)
+        with self._lock:
+            self._depth[key] = (depth, time.monotonic())
+        return depth.copy()
+
+    def backfill(self, symbol: str, interval: str, start, end=None):
+        """Download every closed candle in [start, end) that the candle archive is missing
+
+        Only the gaps in the archive are fetched, starting from the first one at or
+        after ``start``, as 1000-candle pages fetched concurrently at low priority.
+        Candles the dashboard archived live count as stored, and older ranges are
+        merged in around them. Returns the archive path and the number of candles written.
+        """
+        step = interval_to_milliseconds(interval)
+        archive = self.archive(symbol, interval)
+        now_ms = int(time.time() * 1000)
+        # Stop before the candle that is still open
+        end_ms = now_ms - now_ms % step
+        if end is not None:
+            end_ms = min(end_ms, self._to_milliseconds(end))
+        start_ms = self._to_milliseconds(start)
+
+        written = 0
+        for gap_start, gap_end in archive.gaps(start_ms, end_ms):
+            pages = (page[page['timestamp'] < pd.Timestamp(gap_end, unit='ms')]
+                     for page in self._iter_pages(symbol, interval, gap_start, gap_end, PRIORITY_LOW))
+            last_stored = archive.last_timestamp()
+            if last_stored is None or gap_start > last_stored:
+                # Past the newest stored candle: plain appends, page by page
+                for page in pages:
+                    written += archive.append(page)
+            else:
+                # Inside the stored range: one merge (and file rewrite) per gap
+                gap = pd.concat(list(pages), ignore_index=True)
+                written += archive.append(gap)
+        return archive.path, written
+
+    def archive(self, symbol: str, interval: str):
+        """The on-disk CandleArchive for (symbol, interval)"""
+        key = (symbol, interval)
+        with self._lock:
+            if key not in self._archives:
+                self._archives[key] = CandleArchive(symbol, interval)
+            return self._archives[key]
+
+    def read_archive(self, symbol: str, interval: str, start=None, end=None):
+        """Archived candles with start <= open time < end, read without loading the whole file"""
+        return self.archive(symbol, interval).read(start, end)
+
+    def rate_limit_usage(self):
+        """How much of the per-minute request weight budget is currently spent"""
+        return self.rate_limiter.usage()
+
+    def request_stats(self):
+        """Rolling latency percentiles, payload sizes, retries and errors per REST endpoint"""
+        return self.telemetry.summary()
+
+    def clear_cache(self, symbol: str = None, interval: str = None):
+        """Drop held candles for one (symbol, interval) or for everything"""
+        with self._lock:
+            if symbol is None:
+                self._candles.clear()
+                self._kline_cache.clear()
+            else:
+                self._candles.pop((symbol, interval), None)
+                self._kline_cache.pop((symbol, interval), None)
+
+    def _stream_key(self, symbol: str, interval: str):
+        # Every derived timeframe is served from the symbol's single 1m stream
+        return (symbol, BASE_INTERVAL if self._is_resampled(interval) else interval)
+
+    def _is_resampled(self, interval: str):
+        return RESAMPLING['enabled'] and interval != BASE_INTERVAL and interval in TIMEFRAME_OPTIONS
+
+    def _resample_base_limit(self, interval: str, limit: int):
+        """1m candles needed to derive ``limit`` candles of ``interval`` locally, or None to use REST"""
+        if not self._is_resampled(interval):
+            return None
+        # One extra bucket because the oldest one in the window is usually partial
+        needed = (limit + 1) * (interval_to_milliseconds(interval) // BASE_MS)
+        return needed if needed <= RESAMPLING['max_base_candles'] else None
+
+    def _get_resampled_klines(self, symbol: str, interval: str, limit: int, base_limit: int, priority: int):
+        """Build ``interval`` candles from the symbol's 1m candles instead of downloading them"""
+        base = self.get_klines(symbol, BASE_INTERVAL, base_limit, priority)
+        with self._lock:
+            resampler = self._resamplers.get(symbol)
+            if resampler is None:
+                resampler = self._resamplers[symbol] = CandleResampler(RESAMPLING['max_base_candles'])
+            resampler.update(base)
+            # Same columns as a REST frame: only the last candle can still be open, so drop is_partial
+            return resampler.get(interval, limit).drop(columns='is_partial')
+
+    def _is_streamed(self, key):
+        return self.stream is not None and key in self.stream.subscriptions and key not in self._stream_gaps
+
+    def _on_stream_kline(self, symbol: str, interval: str, candle: pd.DataFrame, is_closed: bool):
+        """Merge one pushed candle into the held buffer"""
+        key = (symbol, interval)
+        with self._lock:
+            held = self._candles.get(key)
+            if held is None or held.empty:
+                return
+            open_time = candle['timestamp'].iloc[0]
+            last_open = held['timestamp'].iloc[-1]
+            if open_time < last_open:
+                return
+            if open_time > last_open:
+                step = pd.Timedelta(seconds=TIMEFRAME_OPTIONS.get(interval, {}).get('seconds', 0))
+                if step and open_time - last_open > step:
+                    # A candle went missing (e.g. reconnect) - let the next read catch up over REST
+                    self._stream_gaps.add(key)
+                    return
+            merged = self._merge_candles(held, candle)
+            self._candles[key] = merged.tail(max(len(held), KLINE_BUFFER_SIZE)).reset_index(drop=True)
+
+    @staticmethod
+    def _merge_candles(held: pd.DataFrame, new: pd.DataFrame):
+        """Replace held candles from the first new open time onward with the new ones"""
+        if new.empty:
+            return held
+        kept = held[held['timestamp'] < new['timestamp'].iloc[0]]
+        return pd.concat([kept, new], ignore_index=True)
+
+    def _fetch_latest(self, symbol: str, interval: str, limit: int, priority: int = PRIORITY_HIGH):
+        """The newest ``limit`` candles, paginating past the 1000-candle request cap"""
+        if limit <= KLINE_PAGE_LIMIT:
+            return self._fetch_klines(symbol, interval, priority, limit=limit)
+        step = interval_to_milliseconds(interval)
+        now_ms = int(time.time() * 1000)
+        start_ms = now_ms - now_ms % step - (limit - 1) * step
+        pages = []
+        if ARCHIVE['enabled']:
+            # Serve the older part of the window from disk when the archive covers it without gaps
+            archived = self.read_archive(symbol, interval, start=start_ms)
+            if not archived.empty:
+                first_ms = self._to_milliseconds(archived['timestamp'].iloc[0])
+                last_ms = self._to_milliseconds(archived['timestamp'].iloc[-1])
+                if first_ms == start_ms and (last_ms - first_ms) // step + 1 == len(archived):
+                    pages.append(archived)
+                    start_ms = last_ms + step
+        pages.extend(self._iter_pages(symbol, interval, start_ms, now_ms + 1, priority))
+        candles = pd.concat(pages, ignore_index=True).drop_duplicates('timestamp', keep='last')
+        return candles.tail(limit).reset_index(drop=True)
+
+    def _archive_closed(self, symbol: str, interval: str, candles: pd.DataFrame):
+        """Persist every candle but the last (possibly still open) one and trim on schedule"""
+        if not ARCHIVE['enabled'] or len(candles) < 2:
+            return
+        archive = self.archive(symbol, interval)
+        archive.append(candles.iloc[:-1])
+        now = time.monotonic()
+        if now - self._archive_trimmed.get((symbol, interval), 0) > ARCHIVE['trim_interval']:
+            self._archive_trimmed[(symbol, interval)] = now
+            archive.trim()
+
+    def _iter_pages(self, symbol: str, interval: str, start_ms: int, end_ms: int, priority: int):
+        """Yield 1000-candle pages covering [start_ms, end_ms) in order, fetched concurrently"""
+        span = interval_to_milliseconds(interval) * KLINE_PAGE_LIMIT
+        page_starts = iter(range(start_ms, end_ms, span))
+        # Keep a bounded number of pages in flight so a long range never piles up in memory
+        def submit(page_start):
+            page_end = min(page_start + span, end_ms)
+            return self._page_executor.submit(self._fetch_page, symbol, interval, page_start, page_end, priority)
+
+        pending = deque(submit(page_start) for page_start in itertools.islice(page_starts, FETCH_WORKERS))
+        while pending:
+            page = pending.popleft().result()
+            next_start = next(page_starts, None)
+            if next_start is not None:
+                pending.append(submit(next_start))
+            yield page
+
+    def _fetch_page(self, symbol: str, interval: str, start_ms: int, end_ms: int, priority: int):
+        while True:
+            try:
+                return self._fetch_klines(
+                    symbol, interval, priority,
+                    limit=KLINE_PAGE_LIMIT, startTime=start_ms, endTime=end_ms - 1
+                )
+            except RateLimitExceeded:
+                # Background pages wait for budget instead of failing the whole range
+                time.sleep(1)
+
+    @staticmethod
+    def _to_milliseconds(value):
+        if isinstance(value, (int, np.integer)):
+            return int(value)
+        return int(pd.Timestamp(value).value // 10**6)
+
+    def _fetch_klines(self, symbol: str, interval: str, priority: int = PRIORITY_HIGH, **params):
+        klines = self._request('get_klines', priority, symbol=symbol, interval=interval, **params)
+        return self._parse_klines(klines)
+
+    def _coalesce(self, key, priority: int, fn, *args):
+        """Run ``fn`` through single-flight; returns ``(result, shared)``"""
+        try:
+            return self._inflight.do(key, fn, *args)
+        except RateLimitExceeded:
+            if priority != PRIORITY_HIGH:
+                raise
+            # The shared call was a shed background request - an urgent caller makes its own
+            return fn(*args), False
+
+    def _request(self, endpoint: str, priority: int = PRIORITY_HIGH, **params):
+        """Call a Binance client endpoint within the request weight budget
+
+        Identical calls already in flight are joined rather than sent again.
+        """
+        key = ('rest', endpoint, tuple(sorted(params.items())))
+        result, _ = self._coalesce(key, priority, self._send_request, endpoint, priority, params)
+        return result
+
+    def _send_request(self, endpoint: str, priority: int, params: dict):
+        """Send one call to the endpoint, retrying transient failures
+
+        Connection errors, timeouts and 5xx responses are retried with backoff.
+        Every attempt's latency, payload size and outcome goes to ``self.telemetry``.
+        """
+        weight = request_weight(endpoint, **params)
+        for attempt in range(REQUEST_TELEMETRY['max_retries'] + 1):
+            # Each attempt is one sample, so only a retry counts towards the summed retries
+            retried = int(attempt > 0)
+            self.rate_limiter.acquire(weight, priority)
+            started = time.perf_counter()
+            try:
+                result = getattr(self.client, endpoint)(**params)
+            except (BinanceAPIException, BinanceRequestException, ConnectionError, Timeout) as e:
+                self.telemetry.record(endpoint, (time.perf_counter() - started) * 1000, retries=retried, ok=False)
+                status = getattr(e, 'status_code', None)
+                if status in (418, 429):
+                    # Too many requests / IP ban - back off for as long as Binance asks
+                    self.rate_limiter.penalize(float(e.response.headers.get('Retry-After', 60)))
+                transient = status is None or status >= 500
+                if not transient or attempt == REQUEST_TELEMETRY['max_retries']:
+                    raise
+                time.sleep(REQUEST_TELEMETRY['retry_backoff'] * 2 ** attempt)
+                continue
+            latency_ms = (time.perf_counter() - started) * 1000
+            response = getattr(self.client, 'response', None)
+            payload_bytes = len(response.content) if response is not None else 0
+            self.telemetry.record(endpoint, latency_ms, payload_bytes, retries=retried)
+            if response is not None:
+                self.rate_limiter.update_from_headers(response.headers)
+            return result
+
+    @staticmethod
+    def _parse_ticker(tickers):
+        """Convert the all-symbols 24h ticker into one columnar frame"""
+        n = len(tickers)
+        columns = {'symbol': np.array([t['symbol'] for t in tickers], dtype=object)}
+        for field, column in TICKER_FIELDS:
+            columns[column] = np.fromiter((t[field] for t in tickers), dtype=np.float64, count=n)
+        return pd.DataFrame(columns)
+
+    @staticmethod
+    def _parse_klines(klines):
+        """Convert raw kline lists straight into typed columns and build the frame once"""
+        n = len(klines)
+        # Only the first six fields are kept; Binance sends prices/volumes as strings,
+        # which np.fromiter parses while filling one preallocated float64 block
+        values = np.fromiter(
+            itertools.chain.from_iterable(k[:6] for k in klines),
+            dtype=np.float64,
+            count=n * 6
+        ).reshape(n, 6)
+        # Millisecond open times are far below 2**53, so the float64 round trip is exact
+        timestamps = values[:, 0].astype(np.int64).astype('datetime64[ms]').astype('datetime64[ns]')
+        return pd.DataFrame({
+            'timestamp': timestamps,
+            'open': values[:, 1],
+            'high': values[:, 2],
+            'low': values[:, 3],
+            'close': values[:, 4],
+            'volume': values[:, 5],
+        })
@@ -0,0 +1,150 @@
+# src/detection_pipeline.py
+import numpy as np
+import pandas as pd
+from anomaly_detector import AnomalyDetector
+from config.settings import ANOMALY_THRESHOLD
+from rolling import RollingWindows
+
+DETECTORS = ('volatility', 'volume', 'spikes', 'pattern', 'multi_feature')
+
+# Columns each detector adds to the result frame
+OUTPUT_COLUMNS = {
+    'volatility': ('returns', 'volatility', 'z_score', 'is_anomaly'),
+    'volume': ('volume_anomaly', 'is_volume_anomaly', 'volume_anomaly_score'),
+    'spikes': ('price_change', 'is_spike'),
+    'pattern': ('rolling_mean', 'rolling_std', 'upper_bound', 'lower_bound', 'is_pattern_anomaly'),
+    'multi_feature': ('returns', 'log_volume', 'price_momentum', 'volume_momentum',
+                      'multi_anomaly', 'is_multi_anomaly', 'anomaly_score'),
+}
+
+
+def output_columns(detectors):
+    """Numeric columns the pipeline adds for ``detectors``, in result order, ending with anomaly_count"""
+    columns = []
+    for detector in DETECTORS:
+        if detector in detectors:
+            columns.extend(col for col in OUTPUT_COLUMNS[detector] if col not in columns)
+    return columns + ['anomaly_count']
+
+
+class DetectionPipeline:
+    """Runs the selected anomaly detectors over one shared set of features
+
+    Returns, rolling mean/std and the other inputs are computed once as NumPy
+    columns. Each detector writes its outputs into the same column dict, and the
+    result frame is built once at the end. The columns match those of the
+    ``AnomalyDetector.detect_*`` chain followed by ``get_anomaly_severity``.
+    """
+
+    def __init__(self, detectors=DETECTORS, window: int = 20, volatility_threshold: float = ANOMALY_THRESHOLD,
+                 spike_threshold: float = 0.05, volume_contamination: float = 0.1,
+                 multi_contamination: float = 0.15, model_cache=None, volatility_detector=None):
+        unknown = set(detectors) - set(DETECTORS)
+        if unknown:
+            raise ValueError(f"Unknown detectors: {sorted(unknown)}")
+        self.detectors = tuple(d for d in DETECTORS if d in detectors)
+        self.window = window
+        self.volatility_threshold = volatility_threshold
+        self.spike_threshold = spike_threshold
+        self.volume_contamination = volume_contamination
+        self.multi_contamination = multi_contamination
+        self.model_cache = model_cache
+        # Optional OnlineVolatilityDetector used instead of the batch Z-score
+        self.volatility_detector = volatility_detector
+
+    def run(self, df: pd.DataFrame, cache_key=None):
+        """One result frame: the input columns plus every selected detector's outputs and severity"""
+        cols = {name: df[name].values for name in df.columns}
+        self.detect(cols, cache_key)
+
+        # Severity, as get_anomaly_severity: is_*anomaly* flags per row
+        flags = [cols[name] for name in cols if 'is_' in name and 'anomaly' in name]
+        result = pd.DataFrame(cols, index=df.index)
+        if flags:
+            result['anomaly_count'] = np.sum(flags, axis=0)
+            result['severity'] = pd.cut(
+                result['anomaly_count'],
+                bins=[-np.inf, 0, 1, 2, np.inf],
+                labels=['Normal', 'Low', 'Medium', 'High']
+            )
+        else:
+            result['severity'] = 'Normal'
+        # Lets indicator code reuse the rolling mean/std instead of recomputing them
+        result.attrs['rolling_window'] = self.window if 'pattern' in self.detectors else None
+        return result
+
+    def detect(self, cols: dict, cache_key=None, shared=None):
+        """Add every selected detector's outputs to the column dict ``cols`` (timestamp, close, volume, ...)
+
+        ``shared`` may hold features computed elsewhere, e.g. by the dashboard's
+        feature graph: ``returns`` and, for this window, ``rolling_mean`` and
+        ``rolling_std``. Anything missing is computed here, once for all detectors.
+        """
+        shared = shared or {}
+        close = np.asarray(cols['close'], dtype=np.float64)
+        volume = np.asarray(cols['volume'], dtype=np.float64)
+        timestamps = cols['timestamp']
+
+        # Shared features
+        returns = shared.get('returns')
+        if returns is None:
+            returns = np.full(len(close), np.nan)
+            returns[1:] = close[1:] / close[:-1] - 1
+        if 'pattern' in self.detectors:
+            if 'rolling_mean' in shared and 'rolling_std' in shared:
+                rolling_mean, rolling_std = shared['rolling_mean'], shared['rolling_std']
+            else:
+                rolling_mean, rolling_std = RollingWindows(close).mean_std(self.window)
+
+        if 'volatility' in self.detectors:
+            if self.volatility_detector is not None and cache_key is not None:
+                candles = pd.DataFrame({'timestamp': timestamps, 'close': close})
+                online = self.volatility_detector.detect(candles, cache_key, threshold=self.volatility_threshold)
+                volatility, z_score = online['volatility'].values, online['z_score'].values
+            else:
+                volatility = RollingWindows(returns).std(self.window)
+                z_score = (volatility - np.nanmean(volatility)) / np.nanstd(volatility, ddof=1)
+            cols['returns'] = returns
+            cols['volatility'] = volatility
+            cols['z_score'] = z_score
+            cols['is_anomaly'] = np.abs(z_score) > self.volatility_threshold
+
+        if 'volume' in self.detectors:
+            labels, scores = AnomalyDetector.isolation_forest_scores(
+                volume.reshape(-1, 1), lambda: AnomalyDetector.volume_model(self.volume_contamination),
+                self.model_cache, cache_key and (*cache_key, 'volume', self.volume_contamination), timestamps
+            )
+            cols['volume_anomaly'] = labels
+            cols['is_volume_anomaly'] = labels == -1
+            cols['volume_anomaly_score'] = scores
+
+        if 'spikes' in self.detectors:
+            cols['price_change'] = returns
+            cols['is_spike'] = np.abs(returns) > self.spike_threshold
+
+        if 'pattern' in self.detectors:
+            cols['rolling_mean'] = rolling_mean
+            cols['rolling_std'] = rolling_std
+            cols['upper_bound'] = rolling_mean + 2 * rolling_std
+            cols['lower_bound'] = rolling_mean - 2 * rolling_std
+            cols['is_pattern_anomaly'] = (close > cols['upper_bound']) | (close < cols['lower_bound'])
+
+        if 'multi_feature' in self.detectors:
+            price_momentum = np.full(len(close), np.nan)
+            price_momentum[1:] = np.diff(close)
+            volume_momentum = np.full(len(volume), np.nan)
+            volume_momentum[1:] = np.diff(volume)
+            features = np.column_stack([returns, np.log1p(volume), price_momentum, volume_momentum])
+            labels, scores = AnomalyDetector.isolation_forest_scores(
+                np.nan_to_num(features, nan=0.0), lambda: AnomalyDetector.multi_feature_model(self.multi_contamination),
+                self.model_cache, cache_key and (*cache_key, 'multi_feature', self.multi_contamination), timestamps
+            )
+            cols['returns'] = returns
+            cols['log_volume'] = features[:, 1]
+            cols['price_momentum'] = price_momentum
+            cols['volume_momentum'] = volume_momentum
+            cols['multi_anomaly'] = labels
+            cols['is_multi_anomaly'] = labels == -1
+            cols['anomaly_score'] = scores
+        return cols
+
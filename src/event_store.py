@@ -0,0 +1,234 @@
+# src/event_store.py
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+import pandas as pd
+from config.settings import EVENT_STORE
+
+# Anomaly flag column -> (detector name, label shown in reports)
+EVENT_FLAGS = {
+    'is_anomaly': ('volatility', 'Volatility'),
+    'is_volume_anomaly': ('volume', 'Volume'),
+    'is_pattern_anomaly': ('pattern', 'Pattern Breakout'),
+    'is_multi_anomaly': ('multi_feature', 'Multi-Feature'),
+}
+DETECTOR_LABELS = {detector: label for detector, label in EVENT_FLAGS.values()}
+# Columns each event's score is derived from (see _scores); frames without them log NULL scores
+SCORE_COLUMNS = ('z_score', 'volume_anomaly_score', 'rolling_mean', 'rolling_std', 'anomaly_score')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS anomaly_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    detector TEXT NOT NULL,
+    score REAL,
+    severity TEXT,
+    recorded_at REAL NOT NULL,
+    UNIQUE (symbol, interval, profile, timestamp, detector)
+);
+CREATE INDEX IF NOT EXISTS idx_anomaly_events_time ON anomaly_events (timestamp);
+CREATE TABLE IF NOT EXISTS watermarks (
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    PRIMARY KEY (symbol, interval, profile)
+);
+"""
+
+
+def detection_profile(**settings):
+    """Canonical string for the detector settings events were logged with, e.g. ``volatility_threshold=2.5``"""
+    return ','.join(f"{name}={settings[name]}" for name in sorted(settings))
+
+
+def _scores(df: pd.DataFrame, detector: str):
+    """Per-row score stored with each event of ``detector``, or None when the frame lacks it"""
+    if detector == 'volatility' and 'z_score' in df:
+        return df['z_score'].values
+    if detector == 'volume' and 'volume_anomaly_score' in df:
+        return df['volume_anomaly_score'].values
+    if detector == 'multi_feature' and 'anomaly_score' in df:
+        return df['anomaly_score'].values
+    if detector == 'pattern' and 'rolling_std' in df:
+        # Distance from the band's centre in rolling standard deviations
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return ((df['close'] - df['rolling_mean']) / df['rolling_std']).values
+    return None
+
+
+class AnomalyEventStore:
+    """Persistent, append-only log of anomaly events in SQLite
+
+    One row per (symbol, interval, profile, candle, detector) that flagged it. The
+    profile (see ``detection_profile``) names the detector settings, so sessions
+    with different sensitivities keep separate logs. The unique key doubles as the
+    (symbol, interval, profile, time) index, and a second index covers time alone.
+    Only closed candles are recorded, once each: a watermark per key marks the
+    newest one written, so ``record`` looks only at candles past it. Reports are
+    indexed range queries, memoized until that key gets new events.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or EVENT_STORE['path']
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if self.path != ':memory:':
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        self._watermarks = {}
+        # Events written per key by this process, so cached reports know when they are stale
+        self._versions = {}
+        self._reports = {}
+
+    def record(self, symbol: str, interval: str, df: pd.DataFrame, profile: str = ''):
+        """Append events for candles that closed since the last call; returns how many were written
+
+        ``df`` needs the EVENT_FLAGS, SCORE_COLUMNS and severity columns next to the candles.
+        """
+        if len(df) < 2:
+            return 0
+        timestamps = df['timestamp'].values.astype('datetime64[ms]').astype(np.int64)
+        # The last candle is still open and its flags can change
+        closed = len(timestamps) - 1
+        key = (symbol, interval, profile)
+        watermark = self.watermark(symbol, interval, profile)
+        start = 0 if watermark is None else int(np.searchsorted(timestamps[:closed], watermark, side='right'))
+        if start >= closed:
+            return 0
+
+        severity = df['severity'].astype(str).values if 'severity' in df else None
+        recorded_at = time.time()
+        rows = []
+        for flag, (detector, _) in EVENT_FLAGS.items():
+            if flag not in df:
+                continue
+            hits = np.flatnonzero(df[flag].values[start:closed]) + start
+            scores = _scores(df, detector)
+            for i in hits:
+                score = None if scores is None or np.isnan(scores[i]) else float(scores[i])
+                rows.append((symbol, interval, profile, int(timestamps[i]), detector, score,
+                             None if severity is None else severity[i], recorded_at))
+
+        new_watermark = int(timestamps[closed - 1])
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO anomaly_events "
+                "(symbol, interval, profile, timestamp, detector, score, severity, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            written = self._conn.total_changes - before
+            self._conn.execute(
+                "INSERT INTO watermarks (symbol, interval, profile, timestamp) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (symbol, interval, profile) DO UPDATE SET timestamp = excluded.timestamp",
+                key + (new_watermark,)
+            )
+            self._watermarks[key] = new_watermark
+            if written:
+                self._versions[key] = self._versions.get(key, 0) + 1
+        return written
+
+    def watermark(self, symbol: str, interval: str, profile: str = ''):
+        """Open time (ms) of the newest candle already recorded for (symbol, interval, profile), or None"""
+        key = (symbol, interval, profile)
+        if key not in self._watermarks:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT timestamp FROM watermarks WHERE symbol = ? AND interval = ? AND profile = ?", key
+                ).fetchone()
+            self._watermarks[key] = row[0] if row else None
+        return self._watermarks[key]
+
+    def report(self, symbol: str, interval: str, since=None, recent: int = 10, profile: str = ''):
+        """Counts per detector and severity, plus the latest events, from ``since`` on
+
+        Same shape as ``AnomalyDetector.get_anomaly_report``; recent events carry
+        timestamp, detector, score and severity.
+        """
+        since_ms = self._to_ms(since)
+        key = (symbol, interval, profile)
+        cache_key = key + (since_ms, recent)
+        version = self._versions.get(key, 0)
+        cached = self._reports.get(cache_key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        where = "symbol = ? AND interval = ? AND profile = ? AND timestamp >= ?"
+        params = key + (since_ms,)
+        with self._lock:
+            by_detector = dict(self._conn.execute(
+                f"SELECT detector, COUNT(*) FROM anomaly_events WHERE {where} GROUP BY detector", params
+            ).fetchall())
+            by_severity = self._conn.execute(
+                f"SELECT severity, COUNT(DISTINCT timestamp) FROM anomaly_events WHERE {where} "
+                f"AND severity IS NOT NULL GROUP BY severity", params
+            ).fetchall()
+            latest = self._conn.execute(
+                f"SELECT timestamp, detector, score, severity FROM anomaly_events WHERE {where} "
+                f"ORDER BY timestamp DESC, detector LIMIT ?", params + (recent,)
+            ).fetchall()
+
+        report = {
+            'total_anomalies': sum(by_detector.values()),
+            'anomaly_types': {label: by_detector.get(detector, 0) for detector, label in DETECTOR_LABELS.items()},
+            'recent_anomalies': [
+                {'timestamp': pd.Timestamp(ts, unit='ms'), 'detector': DETECTOR_LABELS.get(detector, detector),
+                 'score': score, 'severity': sev}
+                for ts, detector, score, sev in reversed(latest)
+            ],
+            'severity_distribution': {str(sev): int(count) for sev, count in by_severity},
+        }
+        # Keep only the newest report per key; ``since`` moves forward with the window
+        self._reports = {k: v for k, v in self._reports.items() if k[:3] != key}
+        self._reports[cache_key] = (version, report)
+        return report
+
+    def history(self, symbol: str = None, interval: str = None, start=None, end=None, limit: int = None,
+                profile: str = None):
+        """Stored events as a DataFrame, oldest first, filtered by any of symbol, interval, profile and time range"""
+        clauses, params = [], []
+        for column, value in (('symbol', symbol), ('interval', interval), ('profile', profile)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(self._to_ms(start))
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(self._to_ms(end))
+        query = "SELECT symbol, interval, profile, timestamp, detector, score, severity FROM anomaly_events"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY timestamp, symbol, detector"
+        if limit is not None:
+            # The newest ``limit`` events, still returned oldest first
+            query = f"SELECT * FROM ({query.replace('ORDER BY timestamp,', 'ORDER BY timestamp DESC,')} LIMIT ?) " \
+                    f"ORDER BY timestamp, symbol, detector"
+            params.append(limit)
+        with self._lock:
+            df = pd.read_sql_query(query, self._conn, params=params)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_ms(value):
+        if value is None:
+            return 0
+        if isinstance(value, (int, np.integer)):
+            return int(value)
+        return int(pd.Timestamp(value).value // 1_000_000)
@@ -0,0 +1,126 @@
+# src/feature_graph.py
+from collections import OrderedDict
+import pandas as pd
+
+
+class _Node:
+    def __init__(self, outputs, inputs, compute):
+        self.outputs = tuple(outputs)
+        self.inputs = tuple(inputs)
+        self.compute = compute
+
+
+class FeatureGraph:
+    """Named columns and how to compute each one from the columns it reads
+
+    ``register`` declares a node: the columns it produces, the columns it reads,
+    and ``compute(cols, context)``, which returns a dict of its outputs. Names
+    starting with ``_`` are intermediates, such as shared prefix sums, and
+    never appear in frames.
+    """
+
+    def __init__(self, base_columns):
+        self.base_columns = tuple(base_columns)
+        self._nodes = {}
+        self.order = []
+
+    def register(self, outputs, inputs=(), compute=None):
+        """Declare a node; without ``compute`` this returns a decorator"""
+        if compute is None:
+            def decorator(fn):
+                self.register(outputs, inputs, fn)
+                return fn
+            return decorator
+        outputs = (outputs,) if isinstance(outputs, str) else tuple(outputs)
+        node = _Node(outputs, inputs, compute)
+        for column in outputs:
+            if column in self._nodes or column in self.base_columns:
+                raise ValueError(f"Feature {column} is already defined")
+            self._nodes[column] = node
+            self.order.append(column)
+        return node
+
+    def plan(self, columns):
+        """Nodes needed for ``columns``, each after the nodes it reads from"""
+        ordered, done, visiting = [], set(), set()
+
+        def visit(column, path):
+            if column in self.base_columns:
+                return
+            node = self._nodes.get(column)
+            if node is None:
+                raise KeyError(f"Unknown feature: {column}")
+            if id(node) in done:
+                return
+            if id(node) in visiting:
+                raise ValueError(f"Feature dependency cycle: {' -> '.join(path + [column])}")
+            visiting.add(id(node))
+            for dependency in node.inputs:
+                visit(dependency, path + [column])
+            visiting.discard(id(node))
+            done.add(id(node))
+            ordered.append(node)
+
+        for column in columns:
+            visit(column, [])
+        return ordered
+
+
+class LazyFeatures:
+    """The columns of one data version, each computed at most once and only when asked for"""
+
+    def __init__(self, graph: FeatureGraph, df: pd.DataFrame, context=None):
+        self.graph = graph
+        self.context = context
+        self.index = df.index
+        self.source_columns = list(df.columns)
+        self._cols = {name: df[name].values for name in df.columns}
+        # Nodes evaluated so far
+        self.evaluated = 0
+
+    def require(self, columns):
+        missing = [column for column in columns if column not in self._cols]
+        for node in self.graph.plan(missing):
+            if all(column in self._cols for column in node.outputs):
+                continue
+            self._cols.update(node.compute(self._cols, self.context))
+            self.evaluated += 1
+
+    def frame(self, columns):
+        """The source candles plus ``columns`` (computed as needed), in registration order"""
+        wanted = set(columns)
+        self.require(wanted)
+        names = self.source_columns + [c for c in self.graph.order if c in wanted and c not in self.source_columns]
+        return pd.DataFrame({name: self._cols[name] for name in names}, index=self.index)
+
+
+class FeatureCache:
+    """LazyFeatures per key, reused until the candles behind them change
+
+    A key should hold everything the computed columns depend on besides the
+    candles, e.g. (symbol, interval, thresholds). The data version is the length
+    plus the first and last candles. Closed candles never change, and the open
+    candle is the last one.
+    """
+
+    def __init__(self, graph: FeatureGraph, max_entries: int = 32):
+        self.graph = graph
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key, df: pd.DataFrame, context=None):
+        version = self.data_version(df)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != version:
+            entry = self._entries[key] = (version, LazyFeatures(self.graph, df, context))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry[1]
+
+    @staticmethod
+    def data_version(df: pd.DataFrame):
+        if df.empty:
+            return (0,)
+        first, last = df.iloc[0], df.iloc[-1]
+        return (len(df),) + tuple(first.values) + tuple(last.values)
@@ -0,0 +1,154 @@
+# src/kline_stream.py
+import asyncio
+import json
+import threading
+import time
+import pandas as pd
+from binance import AsyncClient, ThreadedWebsocketManager
+
+
+class KlineSocketManager(ThreadedWebsocketManager):
+    """ThreadedWebsocketManager that can be pointed at any stream endpoint"""
+
+    def __init__(self, stream_url: str = None, **kwargs):
+        super().__init__(**kwargs)
+        # The base class reuses the creating thread's event loop, which a previous
+        # manager started from the same thread may still be running
+        self._loop = asyncio.new_event_loop()
+        self._stream_url = stream_url
+
+    async def socket_listener(self):
+        # Build the client directly instead of AsyncClient.create(), which pings the
+        # REST API - a local replay endpoint has no REST side to answer it
+        self._client = AsyncClient(loop=self._loop, **self._client_params)
+        await self._before_socket_listener_start()
+        while self._running:
+            await asyncio.sleep(0.2)
+        while self._socket_running:
+            await asyncio.sleep(0.2)
+
+    async def _before_socket_listener_start(self):
+        await super()._before_socket_listener_start()
+        if self._stream_url:
+            self._bsm.STREAM_URL = self._stream_url.rstrip('/') + '/'
+
+    def _start_async_socket(self, callback, socket_name: str, params: dict, path: str = None) -> str:
+        while not self._bsm:
+            time.sleep(0.1)
+        # Build the socket on the manager's own loop: sockets capture the current loop
+        # when created, and callers may be any thread (e.g. candle store refreshers)
+        socket = asyncio.run_coroutine_threadsafe(self._create_socket(socket_name, params), self._loop).result()
+        socket_path = path or socket._path
+        self._socket_running[socket_path] = True
+        self._loop.call_soon_threadsafe(asyncio.create_task, self.start_listener(socket, socket_path, callback))
+        return socket_path
+
+    async def _create_socket(self, socket_name: str, params: dict):
+        return getattr(self._bsm, socket_name)(**params)
+
+
+class KlineStream:
+    """Push-style kline subscriptions that hand every candle update to a callback"""
+
+    def __init__(self, on_kline, stream_url: str = None, record_path: str = None):
+        self._on_kline = on_kline
+        self._stream_url = stream_url
+        self._record_path = record_path
+        self._record_lock = threading.Lock()
+        self._manager = None
+        self._sockets = {}
+        # Diff-depth sockets and the callback for each symbol's events
+        self._depth_sockets = {}
+        self._depth_callbacks = {}
+        self._lock = threading.RLock()
+
+    def start(self):
+        with self._lock:
+            if self._manager is not None:
+                return
+            self._manager = KlineSocketManager(stream_url=self._stream_url)
+            self._manager.daemon = True
+            self._manager.start()
+
+    def stop(self):
+        with self._lock:
+            if self._manager is not None:
+                self._manager.stop()
+                self._manager = None
+                self._sockets.clear()
+                self._depth_sockets.clear()
+
+    def subscribe(self, symbol: str, interval: str):
+        """Open a kline socket for (symbol, interval) unless one is already running"""
+        key = (symbol, interval)
+        with self._lock:
+            if key not in self._sockets:
+                self.start()
+                self._sockets[key] = self._manager.start_kline_socket(
+                    callback=self._handle_message,
+                    symbol=symbol,
+                    interval=interval
+                )
+            return self._sockets[key]
+
+    def unsubscribe(self, symbol: str, interval: str):
+        with self._lock:
+            socket_name = self._sockets.pop((symbol, interval), None)
+            if socket_name and self._manager is not None:
+                self._manager.stop_socket(socket_name)
+
+    def subscribe_depth(self, symbol: str, on_event, interval: int = 100):
+        """Open a diff-depth socket for ``symbol`` that hands each depthUpdate event to ``on_event``"""
+        with self._lock:
+            self._depth_callbacks[symbol.upper()] = on_event
+            if symbol not in self._depth_sockets:
+                self.start()
+                self._depth_sockets[symbol] = self._manager.start_depth_socket(
+                    callback=self._handle_depth_message,
+                    symbol=symbol,
+                    interval=interval
+                )
+            return self._depth_sockets[symbol]
+
+    def unsubscribe_depth(self, symbol: str):
+        with self._lock:
+            self._depth_callbacks.pop(symbol.upper(), None)
+            socket_name = self._depth_sockets.pop(symbol, None)
+            if socket_name and self._manager is not None:
+                self._manager.stop_socket(socket_name)
+
+    @property
+    def subscriptions(self):
+        with self._lock:
+            return set(self._sockets)
+
+    def _handle_message(self, msg: dict):
+        # Combined streams wrap the payload; errors come through as {'e': 'error'}
+        msg = msg.get('data', msg)
+        if msg.get('e') != 'kline':
+            return
+        self._record(msg)
+        k = msg['k']
+        candle = pd.DataFrame({
+            'timestamp': pd.to_datetime([k['t']], unit='ms'),
+            'open': [float(k['o'])],
+            'high': [float(k['h'])],
+            'low': [float(k['l'])],
+            'close': [float(k['c'])],
+            'volume': [float(k['v'])],
+        })
+        self._on_kline(k['s'], k['i'], candle, k['x'])
+
+    def _handle_depth_message(self, msg: dict):
+        msg = msg.get('data', msg)
+        if msg.get('e') != 'depthUpdate':
+            return
+        self._record(msg)
+        callback = self._depth_callbacks.get(msg['s'])
+        if callback is not None:
+            callback(msg)
+
+    def _record(self, msg: dict):
+        if self._record_path:
+            with self._record_lock, open(self._record_path, 'a') as f:
+                f.write(json.dumps(msg) + '\n')
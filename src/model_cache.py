@@ -0,0 +1,95 @@
+# src/model_cache.py
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+from config.settings import ML_CONFIG
+
+
+class _CachedModel:
+    def __init__(self, model, features: np.ndarray):
+        self.model = model
+        self.fitted_at = time.monotonic()
+        self.mean = features.mean(axis=0)
+        self.std = features.std(axis=0)
+        # Scores of closed rows already seen, by open time
+        self.timestamps = np.empty(0, dtype='datetime64[ns]')
+        self.scores = np.empty(0, dtype=np.float64)
+        self.lock = threading.Lock()
+
+    def drift(self, features: np.ndarray):
+        """Largest shift of a feature's mean since fitting, in training standard deviations"""
+        std = np.where(self.std > 0, self.std, 1.0)
+        return float(np.max(np.abs(features.mean(axis=0) - self.mean) / std))
+
+
+class ModelCache:
+    """Fitted anomaly models per (symbol, interval, detector, params), refit on age or drift
+
+    A model is fit once on the current window and then only scores rows it has not
+    seen, with ``score_samples``. Labels come from the fitted ``offset_`` exactly as
+    ``predict`` would derive them. The last row may be a still-open candle, so it is
+    always rescored. Streaming models (those with ``partial_fit``, e.g.
+    HalfSpaceTrees) also learn each newly closed row and are not refit on age.
+    """
+
+    def __init__(self, max_age: float = None, drift_threshold: float = None, max_models: int = None):
+        config = ML_CONFIG['model_cache']
+        self.max_age = config['max_age'] if max_age is None else max_age
+        self.drift_threshold = config['drift_threshold'] if drift_threshold is None else drift_threshold
+        self.max_models = max_models or config['max_models']
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self.fits = 0
+
+    def score(self, key, timestamps, features: np.ndarray, build_model):
+        """Anomaly scores and labels (True = anomaly) for every row
+
+        ``build_model`` returns an unfitted estimator (or pipeline ending in one)
+        with ``score_samples`` and ``offset_``, used whenever a fit is needed.
+        """
+        timestamps = np.asarray(timestamps, dtype='datetime64[ns]')
+        with self._lock:
+            cached = self._models.get(key)
+            if cached is not None:
+                self._models.move_to_end(key)
+
+        if cached is None or self._needs_refit(cached, features):
+            cached = _CachedModel(build_model().fit(features), features)
+            scores = cached.model.score_samples(features)
+            with self._lock:
+                self.fits += 1
+                self._models[key] = cached
+                self._models.move_to_end(key)
+                while len(self._models) > self.max_models:
+                    self._models.popitem(last=False)
+        else:
+            with cached.lock:
+                scores = np.empty(len(features))
+                closed = np.zeros(len(features), dtype=bool)
+                closed[:-1] = True
+                pos = np.searchsorted(cached.timestamps, timestamps)
+                inside = pos < len(cached.timestamps)
+                known = closed & inside
+                known[known] = cached.timestamps[pos[known]] == timestamps[known]
+                scores[known] = cached.scores[pos[known]]
+                if (~known).any():
+                    scores[~known] = cached.model.score_samples(features[~known])
+                if hasattr(cached.model, 'partial_fit') and (closed & ~known).any():
+                    # Score first, then learn, so a new candle is judged against what came before it
+                    cached.model.partial_fit(features[closed & ~known])
+
+        with cached.lock:
+            # Remember closed rows only; the open one changes until it closes
+            cached.timestamps, cached.scores = timestamps[:-1], scores[:-1]
+        return scores, scores < self._offset(cached.model)
+
+    def _needs_refit(self, cached: _CachedModel, features: np.ndarray):
+        if not hasattr(cached.model, 'partial_fit') and time.monotonic() - cached.fitted_at > self.max_age:
+            return True
+        return cached.drift(features) > self.drift_threshold
+
+    @staticmethod
+    def _offset(model):
+        # Pipelines keep offset_ on their final estimator
+        return model[-1].offset_ if hasattr(model, 'steps') else model.offset_
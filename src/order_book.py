@@ -0,0 +1,201 @@
+# src/order_book.py
+import threading
+import time
+from collections import deque
+import numpy as np
+import pandas as pd
+
+
+class OrderBookGap(Exception):
+    """A diff-depth event does not follow the last one applied; the book needs a new snapshot"""
+
+
+class BookSide:
+    """One side of the book: a price -> quantity dict with a lazily sorted view
+
+    Each level update is one dict write or delete, O(1) however deep the book.
+    The sorted price/quantity arrays are rebuilt only when a read follows
+    changes, so a burst of diff events costs nothing until the book is read.
+    """
+
+    def __init__(self, descending: bool):
+        # Bids are best at the highest price, asks at the lowest
+        self.descending = descending
+        self._levels = {}
+        # (prices, quantities) by ascending price, or None after a change
+        self._sorted = None
+
+    def __len__(self):
+        return len(self._levels)
+
+    @property
+    def prices(self):
+        return self._view()[0]
+
+    @property
+    def quantities(self):
+        return self._view()[1]
+
+    def load(self, levels):
+        # Binance sends [price, quantity] as strings
+        self._levels = {float(price): float(quantity) for price, quantity, *_ in levels if float(quantity) > 0}
+        self._sorted = None
+
+    def apply(self, levels):
+        """Set each (price, quantity) level; a quantity of 0 removes the level"""
+        for price, quantity, *_ in levels:
+            price, quantity = float(price), float(quantity)
+            if quantity > 0:
+                self._levels[price] = quantity
+            else:
+                self._levels.pop(price, None)
+        if levels:
+            self._sorted = None
+
+    def best(self):
+        if not self._levels:
+            return None
+        prices = self.prices
+        return float(prices[-1] if self.descending else prices[0])
+
+    def cumulative(self, levels: int = None):
+        """Prices from best outward and the running total quantity up to each"""
+        prices, quantities = self._view()
+        if self.descending:
+            prices, quantities = prices[::-1], quantities[::-1]
+        if levels is not None:
+            prices, quantities = prices[:levels], quantities[:levels]
+        return prices.copy(), np.cumsum(quantities)
+
+    def _view(self):
+        if self._sorted is None:
+            n = len(self._levels)
+            prices = np.fromiter(self._levels.keys(), dtype=np.float64, count=n)
+            quantities = np.fromiter(self._levels.values(), dtype=np.float64, count=n)
+            order = np.argsort(prices)
+            self._sorted = (prices[order], quantities[order])
+        return self._sorted
+
+
+class LocalOrderBook:
+    """Order book for one symbol rebuilt from a REST snapshot plus diff-depth events
+
+    Follows Binance's procedure: events up to the snapshot's ``lastUpdateId`` are
+    dropped. The first event applied must straddle ``lastUpdateId + 1``. Every
+    later event must start right after the previous one ended, otherwise
+    OrderBookGap is raised and the book has to be reloaded.
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.last_update_id = None
+        self.event_time = None
+        self._applied_since_snapshot = False
+
+    @property
+    def synced(self):
+        return self.last_update_id is not None
+
+    def load_snapshot(self, snapshot: dict):
+        """Replace the book with a ``get_order_book`` response"""
+        self.bids.load(snapshot['bids'])
+        self.asks.load(snapshot['asks'])
+        self.last_update_id = snapshot['lastUpdateId']
+        self._applied_since_snapshot = False
+
+    def apply_diff(self, event: dict):
+        """Apply one ``depthUpdate`` event; returns False if it predates the book"""
+        if not self.synced:
+            raise OrderBookGap(f"{self.symbol} book has no snapshot")
+        first, last = event['U'], event['u']
+        if last <= self.last_update_id:
+            return False
+        expected = self.last_update_id + 1
+        in_sequence = first <= expected if not self._applied_since_snapshot else first == expected
+        if not in_sequence:
+            self.last_update_id = None
+            raise OrderBookGap(f"{self.symbol} depth events jumped from {expected - 1} to {first}")
+        self.bids.apply(event['b'])
+        self.asks.apply(event['a'])
+        self.last_update_id = last
+        self.event_time = event.get('E')
+        self._applied_since_snapshot = True
+        return True
+
+    def best_bid(self):
+        return self.bids.best()
+
+    def best_ask(self):
+        return self.asks.best()
+
+    def depth(self, levels: int = None):
+        """Cumulative depth per side for plotting: columns side, price, quantity"""
+        frames = []
+        for side_name, side in (('bid', self.bids), ('ask', self.asks)):
+            prices, cumulative = side.cumulative(levels)
+            frames.append(pd.DataFrame({'side': side_name, 'price': prices, 'quantity': cumulative}))
+        return pd.concat(frames, ignore_index=True)
+
+
+class OrderBookSync:
+    """Keeps a LocalOrderBook current from the diff-depth stream
+
+    Stream events are buffered until a snapshot arrives and again whenever a
+    sequence gap forces a reload. Snapshots are fetched on a separate thread so
+    the socket callback never blocks on REST.
+    """
+
+    def __init__(self, symbol: str, fetch_snapshot, max_buffer: int = 10_000):
+        self.book = LocalOrderBook(symbol)
+        self._fetch_snapshot = fetch_snapshot
+        self._buffer = deque(maxlen=max_buffer)
+        self._lock = threading.Lock()
+        self._resyncing = False
+        self.resyncs = 0
+
+    def on_event(self, event: dict):
+        """Stream callback for one ``depthUpdate`` event"""
+        with self._lock:
+            if not self.book.synced:
+                self._buffer.append(event)
+                self._start_resync()
+                return
+            try:
+                self.book.apply_diff(event)
+            except OrderBookGap:
+                self._buffer.append(event)
+                self._start_resync()
+
+    def snapshot(self, levels: int = None):
+        """Cumulative depth frame, or None until the book is synced"""
+        with self._lock:
+            return self.book.depth(levels) if self.book.synced else None
+
+    def _start_resync(self):
+        if self._resyncing:
+            return
+        self._resyncing = True
+        self.resyncs += 1
+        threading.Thread(target=self._resync, name=f"order-book-{self.book.symbol}", daemon=True).start()
+
+    def _resync(self):
+        try:
+            snapshot = self._fetch_snapshot()
+        except Exception:
+            snapshot = None
+            # Don't retry on every incoming event while REST is failing
+            time.sleep(1)
+        with self._lock:
+            self._resyncing = False
+            if snapshot is None:
+                return
+            self.book.load_snapshot(snapshot)
+            buffered, self._buffer = list(self._buffer), deque(maxlen=self._buffer.maxlen)
+            try:
+                for event in buffered:
+                    self.book.apply_diff(event)
+            except OrderBookGap:
+                # The snapshot is older than the buffered events - the next event retries
+                self.book.last_update_id = None
@@ -0,0 +1,157 @@
+# src/parallel_detection.py
+import multiprocessing
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from config.settings import PARALLEL_DETECTION
+from detection_pipeline import DetectionPipeline, output_columns
+from model_cache import ModelCache
+
+# Candle fields shipped to workers; timestamps travel as epoch milliseconds (exact in float64)
+INPUT_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+# Fitted models of the symbols routed to this worker process, created on first use
+_worker_model_cache = None
+
+
+def _available_cores():
+    # Cores this process may run on, which can be fewer than the machine has
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _detect_slice(input_name: str, output_name: str, n_rows: int, n_outputs: int, start: int, stop: int,
+                  pipeline_kwargs: dict, cache_key=None):
+    """Worker: run the pipeline on rows [start, stop) of the shared candles, writing into the shared output
+
+    With a ``cache_key`` the worker's own ModelCache fits the models once and then
+    only scores new rows, refitting on its age/drift schedule.
+    """
+    global _worker_model_cache
+    if cache_key is not None:
+        if _worker_model_cache is None:
+            _worker_model_cache = ModelCache()
+        pipeline_kwargs = dict(pipeline_kwargs, model_cache=_worker_model_cache)
+    inputs = shared_memory.SharedMemory(name=input_name)
+    outputs = shared_memory.SharedMemory(name=output_name)
+    try:
+        candles = np.ndarray((n_rows, len(INPUT_FIELDS)), dtype=np.float64, buffer=inputs.buf)[start:stop]
+        frame = pd.DataFrame({field: candles[:, i] for i, field in enumerate(INPUT_FIELDS)})
+        frame['timestamp'] = pd.to_datetime(candles[:, 0].astype(np.int64), unit='ms')
+        pipeline = DetectionPipeline(**pipeline_kwargs)
+        result = pipeline.run(frame, cache_key=cache_key)
+        out = np.ndarray((n_rows, n_outputs), dtype=np.float64, buffer=outputs.buf)
+        for i, column in enumerate(output_columns(pipeline.detectors)):
+            out[start:stop, i] = result[column].values if column in result else 0
+        del candles, out
+    finally:
+        inputs.close()
+        outputs.close()
+    return stop - start
+
+
+class ParallelDetector:
+    """Fans per-symbol DetectionPipeline runs out across a process pool
+
+    All symbols' candles are packed into one shared-memory block, and every worker
+    writes its results into a second one. Only offsets and settings are pickled.
+    Results are gathered with a timeout counted from submission. A symbol that
+    times out or fails is reported in ``errors``; a task that has not started yet
+    is cancelled.
+
+    Each worker is a single-process pool and a symbol always goes to the same one,
+    so the models that worker caches for it are reused on every later call.
+    """
+
+    def __init__(self, max_workers: int = None, task_timeout: float = None):
+        self.max_workers = max_workers or PARALLEL_DETECTION['max_workers'] or _available_cores()
+        self.task_timeout = task_timeout or PARALLEL_DETECTION['task_timeout']
+        # spawn: forking a process that runs threads (sockets, refreshers) is unsafe
+        context = multiprocessing.get_context('spawn')
+        self._pools = [ProcessPoolExecutor(max_workers=1, mp_context=context) for _ in range(self.max_workers)]
+
+    def detect_many(self, frames: dict, interval: str = None, **pipeline_kwargs):
+        """Run DetectionPipeline(**pipeline_kwargs) on each frame; returns ``(results, errors)`` keyed by symbol
+
+        ``model_cache`` and ``volatility_detector`` live in this process and are not
+        shipped. With an ``interval``, each worker keeps fitted models per
+        (symbol, interval) in its own model cache; without one, it fits fresh every call.
+        """
+        pipeline_kwargs = {k: v for k, v in pipeline_kwargs.items() if k not in ('model_cache', 'volatility_detector')}
+        symbols = [sym for sym, frame in frames.items() if len(frame)]
+        if not symbols:
+            return {}, {}
+        lengths = np.array([len(frames[sym]) for sym in symbols])
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        n_rows = int(offsets[-1])
+        columns = output_columns(DetectionPipeline(**pipeline_kwargs).detectors)
+
+        inputs = shared_memory.SharedMemory(create=True, size=n_rows * len(INPUT_FIELDS) * 8)
+        outputs = shared_memory.SharedMemory(create=True, size=n_rows * len(columns) * 8)
+        try:
+            candles = np.ndarray((n_rows, len(INPUT_FIELDS)), dtype=np.float64, buffer=inputs.buf)
+            for sym, start, stop in zip(symbols, offsets[:-1], offsets[1:]):
+                frame = frames[sym]
+                candles[start:stop, 0] = frame['timestamp'].values.astype('datetime64[ms]').astype(np.int64)
+                for i, field in enumerate(INPUT_FIELDS[1:], start=1):
+                    candles[start:stop, i] = frame[field].values
+            del candles
+
+            deadline = time.monotonic() + self.task_timeout
+            futures = {
+                sym: self._pool_for(sym).submit(_detect_slice, inputs.name, outputs.name, n_rows, len(columns),
+                                                int(start), int(stop), pipeline_kwargs,
+                                                (sym, interval) if interval else None)
+                for sym, start, stop in zip(symbols, offsets[:-1], offsets[1:])
+            }
+            done, errors = [], {}
+            for sym, future in futures.items():
+                try:
+                    future.result(timeout=max(0.0, deadline - time.monotonic()))
+                    done.append(sym)
+                except FutureTimeout:
+                    future.cancel()
+                    errors[sym] = TimeoutError(f"Detection for {sym} took longer than {self.task_timeout}s")
+                except Exception as e:
+                    errors[sym] = e
+
+            out = np.ndarray((n_rows, len(columns)), dtype=np.float64, buffer=outputs.buf)
+            results = {}
+            for sym, start, stop in zip(symbols, offsets[:-1], offsets[1:]):
+                if sym in done:
+                    results[sym] = self._assemble(frames[sym], columns, out[start:stop])
+            del out
+        finally:
+            inputs.close()
+            inputs.unlink()
+            outputs.close()
+            outputs.unlink()
+        return results, errors
+
+    def shutdown(self):
+        for pool in self._pools:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _pool_for(self, symbol: str):
+        # Stable across calls and processes, unlike hash() of a str
+        return self._pools[zlib.crc32(symbol.encode()) % len(self._pools)]
+
+    @staticmethod
+    def _assemble(frame: pd.DataFrame, columns, values: np.ndarray):
+        """Candle frame plus the worker's output columns, flags back as bool, with severity"""
+        cols = {name: frame[name].values for name in frame.columns}
+        for i, column in enumerate(columns):
+            cols[column] = values[:, i] > 0.5 if column.startswith('is_') else values[:, i].copy()
+        result = pd.DataFrame(cols, index=frame.index)
+        result['severity'] = pd.cut(
+            result['anomaly_count'],
+            bins=[-np.inf, 0, 1, 2, np.inf],
+            labels=['Normal', 'Low', 'Medium', 'High']
+        )
+        return result
@@ -0,0 +1,260 @@
+# src/quantile_sketch.py
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Bucket length (ms) of each summary period
+PERIODS = {'hourly': 3_600_000, 'daily': 86_400_000}
+
+
+class KLLSketch:
+    """Mergeable streaming quantile sketch (Karnin, Lang & Liberty, 2016)
+
+    Values are kept in a stack of compactors. An item at level ``h`` stands for
+    ``2**h`` values. A level over its capacity is sorted and every other item,
+    starting at a random offset, moves up one level with double the weight.
+    Capacities shrink by ``c`` per level below the top, so the sketch holds
+    about ``k / (1 - c)`` items whatever the stream length. The rank error is
+    O(1/k) with high probability. Merging two sketches concatenates their levels
+    and compacts again, so per-symbol or per-hour sketches combine into one
+    sketch of their union.
+    """
+
+    def __init__(self, k: int = 200, c: float = 2 / 3, random_state: int = None):
+        self.k = k
+        self.c = c
+        self._rng = np.random.default_rng(random_state)
+        self._levels = [np.empty(0)]
+        self._sorted = None
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        """Add values (NaNs are skipped); returns the sketch"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.count += len(values)
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+            self._levels[0] = np.concatenate((self._levels[0], values))
+            self._compress()
+        return self
+
+    def merge(self, other: 'KLLSketch'):
+        """Fold ``other`` into this sketch; returns the sketch"""
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate((self._levels[level], items))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def copy(self):
+        sketch = KLLSketch(self.k, self.c)
+        sketch._rng = np.random.default_rng(self._rng.integers(2 ** 63))
+        sketch._levels = [items.copy() for items in self._levels]
+        sketch.count, sketch.min, sketch.max = self.count, self.min, self.max
+        return sketch
+
+    def quantile(self, q):
+        """Value at quantile(s) ``q`` in [0, 1]; NaN when the sketch is empty"""
+        q = np.asarray(q, dtype=np.float64)
+        if not self.count:
+            return np.full(q.shape, np.nan)[()]
+        values, cumulative = self._weighted()
+        index = np.searchsorted(cumulative, q * self.count, side='left')
+        out = values[np.minimum(index, len(values) - 1)]
+        # The extremes are tracked exactly
+        out = np.where(q <= 0, self.min, np.where(q >= 1, self.max, out))
+        return out[()]
+
+    def cdf(self, x):
+        """Estimated fraction of values <= ``x``"""
+        x = np.asarray(x, dtype=np.float64)
+        if not self.count:
+            return np.full(x.shape, np.nan)[()]
+        values, cumulative = self._weighted()
+        index = np.searchsorted(values, x, side='right')
+        return (np.where(index > 0, cumulative[np.maximum(index - 1, 0)], 0.0) / self.count)[()]
+
+    @property
+    def size(self):
+        """Items retained"""
+        return sum(len(items) for items in self._levels)
+
+    def _capacity(self, level: int):
+        return max(2, int(np.ceil(self.k * self.c ** (len(self._levels) - 1 - level))))
+
+    def _compress(self):
+        self._sorted = None
+        while True:
+            # Lowest level over capacity; capacities shrink whenever a level is added
+            level = next((h for h, items in enumerate(self._levels) if len(items) > self._capacity(h)), None)
+            if level is None:
+                return
+            if level + 1 == len(self._levels):
+                self._levels.append(np.empty(0))
+            items = np.sort(self._levels[level])
+            # An odd item out stays behind, so the promoted items exactly double in weight
+            keep = len(items) % 2
+            promoted = items[keep + self._rng.integers(2)::2]
+            self._levels[level] = items[:keep]
+            self._levels[level + 1] = np.concatenate((self._levels[level + 1], promoted))
+
+    def _weighted(self):
+        """Retained items in order, with their cumulative weights"""
+        if self._sorted is None:
+            values = np.concatenate(self._levels)
+            weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self._levels)])
+            order = np.argsort(values, kind='stable')
+            self._sorted = values[order], np.cumsum(weights[order])
+        return self._sorted
+
+
+class QuantileSketchDetector:
+    """Volume anomaly detector on a KLL sketch of log volume, with an IsolationForest-style interface
+
+    Rows below the ``lower_quantile`` or above the ``upper_quantile`` of every
+    volume seen so far are anomalies. Without explicit quantiles, the
+    contamination is split evenly between the two tails. ``score_samples`` is
+    the distance to the nearer threshold in units of the band's width, negative
+    outside it. As in sklearn, lower is more anomalous and ``offset_`` is 0.
+    ``partial_fit`` adds rows to the sketch, so memory stays bounded by ``k``.
+    """
+
+    def __init__(self, k: int = 200, lower_quantile: float = None, upper_quantile: float = None,
+                 contamination: float = 0.1, random_state: int = None):
+        self.k = k
+        self.lower_quantile = lower_quantile
+        self.upper_quantile = upper_quantile
+        self.contamination = contamination
+        self.random_state = random_state
+
+    def fit(self, X):
+        self.sketch_ = KLLSketch(self.k, random_state=self.random_state)
+        return self.partial_fit(X)
+
+    def partial_fit(self, X):
+        if not hasattr(self, 'sketch_'):
+            return self.fit(X)
+        self.sketch_.update(self._log_volume(X))
+        self._set_thresholds()
+        return self
+
+    def merge(self, other: 'QuantileSketchDetector'):
+        """Pool another detector's volumes into this one, e.g. across symbols"""
+        self.sketch_.merge(other.sketch_)
+        self._set_thresholds()
+        return self
+
+    def score_samples(self, X):
+        """Distance inside the [lower, upper] band of log volume, relative to its width"""
+        x = self._log_volume(X)
+        low, high = self.thresholds_
+        width = high - low if high > low else 1.0
+        return np.minimum(x - low, high - x) / width
+
+    def predict(self, X):
+        """-1 for anomalies, 1 for normal rows"""
+        return np.where(self.score_samples(X) < self.offset_, -1, 1)
+
+    def fit_predict(self, X):
+        return self.fit(X).predict(X)
+
+    def _set_thresholds(self):
+        lower = self.contamination / 2 if self.lower_quantile is None else self.lower_quantile
+        upper = 1 - self.contamination / 2 if self.upper_quantile is None else self.upper_quantile
+        self.thresholds_ = tuple(float(v) for v in self.sketch_.quantile([lower, upper]))
+        self.offset_ = 0.0
+
+    @staticmethod
+    def _log_volume(X):
+        X = np.asarray(X, dtype=np.float64)
+        return np.log1p(np.maximum(X.reshape(len(X), -1)[:, 0], 0))
+
+
+class VolumeSummaries:
+    """Hourly and daily KLL sketches of log volume per (symbol, interval)
+
+    Candles of different intervals carry different volumes, so each interval
+    has its own buckets. ``add`` takes each closed candle once: a watermark per
+    (symbol, interval) skips candles already seen, and the last (open) candle
+    waits until it closes. Buckets older than ``hourly_buckets`` hours or
+    ``daily_buckets`` days before the newest one are dropped. Any span of
+    buckets merges into one sketch. That makes the volume distribution over the
+    last day, or a week, of any symbol a handful of merges, and comparing
+    symbols needs no candle history at all.
+    """
+
+    def __init__(self, k: int = 200, hourly_buckets: int = 72, daily_buckets: int = 30):
+        self.k = k
+        self.retention = {'hourly': hourly_buckets, 'daily': daily_buckets}
+        self._buckets = {}
+        self._watermarks = {}
+        self._lock = threading.Lock()
+
+    def add(self, symbol: str, interval: str, df: pd.DataFrame):
+        """Sketch candles that closed since the last call; returns how many were added"""
+        if len(df) < 2:
+            return 0
+        # The last candle is still open and its volume keeps growing
+        closed = len(df) - 1
+        timestamps = df['timestamp'].values.astype('datetime64[ms]').astype(np.int64)[:closed]
+        with self._lock:
+            watermark = self._watermarks.get((symbol, interval))
+            start = 0 if watermark is None else int(np.searchsorted(timestamps, watermark, side='right'))
+            if start >= closed:
+                return 0
+            timestamps = timestamps[start:]
+            volume = np.log1p(np.maximum(df['volume'].values[start:closed].astype(np.float64), 0))
+            for period, length in PERIODS.items():
+                buckets = self._buckets.setdefault((symbol, interval, period), OrderedDict())
+                bucket_starts = timestamps // length * length
+                # Candles are in time order, so each bucket is one contiguous run
+                starts, first = np.unique(bucket_starts, return_index=True)
+                for bucket, lo, hi in zip(starts, first, np.append(first[1:], len(timestamps))):
+                    sketch = buckets.get(int(bucket))
+                    if sketch is None:
+                        sketch = buckets[int(bucket)] = KLLSketch(self.k)
+                    sketch.update(volume[lo:hi])
+                oldest = next(reversed(buckets)) - self.retention[period] * length
+                while next(iter(buckets)) <= oldest:
+                    buckets.popitem(last=False)
+            self._watermarks[(symbol, interval)] = int(timestamps[-1])
+        return len(timestamps)
+
+    def sketch(self, symbol: str, interval: str, period: str = 'hourly', last: int = None):
+        """One sketch of the buckets within ``last`` periods of the newest one (all kept ones by default)"""
+        with self._lock:
+            buckets = self._buckets.get((symbol, interval, period), {})
+            if last is not None and buckets:
+                # By time, not bucket count: hours or days without candles still count
+                oldest = next(reversed(buckets)) - last * PERIODS[period]
+                buckets = {start: sketch for start, sketch in buckets.items() if start > oldest}
+            merged = KLLSketch(self.k)
+            for sketch in buckets.values():
+                merged.merge(sketch)
+        return merged
+
+    def percentile(self, symbol: str, interval: str, volume: float, period: str = 'hourly', last: int = 24):
+        """Where one ``interval`` candle's ``volume`` falls, 0-100, among the symbol's candles of the last ``last`` periods"""
+        return float(self.sketch(symbol, interval, period, last).cdf(np.log1p(max(volume, 0))) * 100)
+
+    def compare(self, interval: str, symbols=None, period: str = 'daily', last: int = 1,
+                quantiles=(0.5, 0.9, 0.99)):
+        """Volume quantiles of ``interval`` candles per symbol over the last ``last`` periods, one row per symbol"""
+        if symbols is None:
+            with self._lock:
+                symbols = sorted({symbol for symbol, key_interval, _ in self._buckets if key_interval == interval})
+        rows = []
+        for symbol in symbols:
+            sketch = self.sketch(symbol, interval, period, last)
+            values = np.expm1(np.atleast_1d(sketch.quantile(quantiles)))
+            rows.append([symbol, sketch.count, *values])
+        return pd.DataFrame(rows, columns=['symbol', 'candles'] + [f'q{q * 100:g}' for q in quantiles])
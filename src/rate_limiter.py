@@ -0,0 +1,121 @@
+# src/rate_limiter.py
+import threading
+import time
+from config.settings import BINANCE_RATE_LIMITS
+
+PRIORITY_HIGH = 0  # Whatever the user is looking at right now (active chart)
+PRIORITY_LOW = 1   # Background work that can wait or be dropped (overview, backfill)
+
+# Request weight per REST endpoint (Binance spot API)
+ENDPOINT_WEIGHTS = {
+    'get_klines': 2,
+    'get_ticker': 2,           # 80 when called without a symbol, see request_weight()
+    'get_order_book': 5,       # Scales with limit, see request_weight()
+    'ping': 1,
+    'get_server_time': 1,
+}
+
+
+def request_weight(endpoint: str, **params):
+    """Weight Binance charges for one call to ``endpoint`` with ``params``"""
+    if endpoint == 'get_ticker' and 'symbol' not in params:
+        return 80
+    if endpoint == 'get_order_book':
+        limit = params.get('limit', 100)
+        return 5 if limit <= 100 else 25 if limit <= 500 else 50 if limit <= 1000 else 250
+    return ENDPOINT_WEIGHTS.get(endpoint, 1)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a low-priority request is shed instead of queued"""
+
+
+class WeightRateLimiter:
+    """Token bucket over Binance request weight per minute
+
+    High-priority requests queue until weight is available; low-priority requests
+    may not dip into the reserved share of the budget and are shed if they cannot
+    be served within ``low_priority_timeout`` seconds. The bucket re-syncs to the
+    server's own count from the ``X-MBX-USED-WEIGHT-1M`` response header.
+    """
+
+    def __init__(self, weight_per_minute: int = None, low_priority_reserve: float = None,
+                 low_priority_timeout: float = None):
+        self.capacity = weight_per_minute or BINANCE_RATE_LIMITS['requests_per_minute']
+        self.reserve = self.capacity * (
+            BINANCE_RATE_LIMITS['low_priority_reserve'] if low_priority_reserve is None else low_priority_reserve
+        )
+        self.low_priority_timeout = (
+            BINANCE_RATE_LIMITS['low_priority_timeout'] if low_priority_timeout is None else low_priority_timeout
+        )
+        self._rate = self.capacity / 60.0
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._banned_until = 0.0
+        self._high_waiting = 0
+        self._server_used = None
+        self._shed = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, weight: int, priority: int = PRIORITY_HIGH):
+        """Block until ``weight`` can be spent, or raise RateLimitExceeded for shed requests"""
+        deadline = None if priority == PRIORITY_HIGH else time.monotonic() + self.low_priority_timeout
+        with self._cond:
+            if priority == PRIORITY_HIGH:
+                self._high_waiting += 1
+            try:
+                while True:
+                    self._refill()
+                    now = time.monotonic()
+                    floor = 0 if priority == PRIORITY_HIGH else self.reserve
+                    blocked = now < self._banned_until or (priority != PRIORITY_HIGH and self._high_waiting)
+                    if not blocked and self._tokens - weight >= floor:
+                        self._tokens -= weight
+                        return
+                    wait = max(self._banned_until - now, (weight + floor - self._tokens) / self._rate, 0.05)
+                    if deadline is not None:
+                        if now + wait > deadline:
+                            self._shed += 1
+                            raise RateLimitExceeded(f"Shed low-priority request (weight {weight})")
+                    self._cond.wait(timeout=wait)
+            finally:
+                if priority == PRIORITY_HIGH:
+                    self._high_waiting -= 1
+                    self._cond.notify_all()
+
+    def update_from_headers(self, headers):
+        """Re-sync the bucket with the weight Binance says we have used this minute"""
+        used = headers.get('X-MBX-USED-WEIGHT-1M') if headers else None
+        if used is None:
+            return
+        with self._cond:
+            self._refill()
+            self._server_used = int(used)
+            self._tokens = min(self._tokens, float(self.capacity - self._server_used))
+            self._cond.notify_all()
+
+    def penalize(self, retry_after: float):
+        """Stop all requests for ``retry_after`` seconds after a 429/418 response"""
+        with self._cond:
+            self._banned_until = max(self._banned_until, time.monotonic() + retry_after)
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+
+    def usage(self):
+        """Snapshot of the current budget for display"""
+        with self._cond:
+            self._refill()
+            used = self.capacity - self._tokens
+            return {
+                'used_weight': round(used),
+                'capacity': self.capacity,
+                'percent': 100.0 * used / self.capacity,
+                'server_used_weight': self._server_used,
+                'banned_for': max(0.0, self._banned_until - time.monotonic()),
+                'shed_requests': self._shed,
+            }
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(float(self.capacity), self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
@@ -0,0 +1,92 @@
+# src/resampler.py
+import numpy as np
+import pandas as pd
+from binance.helpers import interval_to_milliseconds
+
+BASE_INTERVAL = '1m'
+BASE_MS = 60_000
+
+
+def resample_candles(candles: pd.DataFrame, interval: str, last_open: bool = True):
+    """Aggregate 1m candles into ``interval`` candles aligned like Binance's own
+
+    Buckets start on multiples of the interval since the epoch (UTC). ``is_partial``
+    marks buckets missing some of their 1m candles (e.g. the first one in the
+    window) and, when ``last_open`` says the newest 1m candle is still forming,
+    the bucket that holds it.
+    """
+    step = interval_to_milliseconds(interval)
+    if candles.empty:
+        return pd.DataFrame({
+            'timestamp': pd.Series(dtype='datetime64[ns]'),
+            **{col: pd.Series(dtype=float) for col in ('open', 'high', 'low', 'close', 'volume')},
+            'is_partial': pd.Series(dtype=bool),
+        })
+    ts = candles['timestamp'].values.astype('datetime64[ms]').astype(np.int64)
+    buckets = ts - ts % step
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(ts)]
+    is_partial = (ends - starts) < step // BASE_MS
+    if last_open:
+        is_partial[-1] = True
+    return pd.DataFrame({
+        'timestamp': buckets[starts].astype('datetime64[ms]').astype('datetime64[ns]'),
+        'open': candles['open'].values[starts],
+        'high': np.maximum.reduceat(candles['high'].values, starts),
+        'low': np.minimum.reduceat(candles['low'].values, starts),
+        'close': candles['close'].values[ends - 1],
+        'volume': np.add.reduceat(candles['volume'].values, starts),
+        'is_partial': is_partial,
+    })
+
+
+class CandleResampler:
+    """Keeps every requested higher timeframe of one symbol current from its 1m candles
+
+    Each update only re-aggregates buckets touched by new 1m candles, so keeping
+    all timeframes current costs O(new candles + one bucket) per refresh.
+    """
+
+    def __init__(self, max_base_candles: int = None):
+        self.max_base_candles = max_base_candles
+        self._base = None
+        self._frames = {}
+
+    def update(self, candles_1m: pd.DataFrame):
+        """Merge the latest 1m candles (may overlap what is already held)"""
+        if candles_1m.empty:
+            return
+        if self._base is None or candles_1m['timestamp'].iloc[0] < self._base['timestamp'].iloc[0]:
+            # First update, or the window grew backwards - rebuild from scratch
+            self._base = candles_1m.reset_index(drop=True)
+            self._frames = {interval: resample_candles(self._base, interval) for interval in self._frames}
+            return
+        first_new = self._base['timestamp'].iloc[-1]
+        new = candles_1m[candles_1m['timestamp'] >= first_new]
+        kept = self._base[self._base['timestamp'] < first_new]
+        self._base = pd.concat([kept, new], ignore_index=True)
+        if self.max_base_candles and len(self._base) > self.max_base_candles:
+            self._base = self._base.tail(self.max_base_candles).reset_index(drop=True)
+
+        first_new_ms = int(first_new.value // 10**6)
+        for interval, frame in self._frames.items():
+            step = interval_to_milliseconds(interval)
+            cut = pd.Timestamp(first_new_ms - first_new_ms % step, unit='ms')
+            # Buckets before the one holding the first new candle are final
+            head = frame[(frame['timestamp'] < cut) & (frame['timestamp'] >= self._bucket_floor(interval))]
+            tail = resample_candles(self._base[self._base['timestamp'] >= cut], interval)
+            self._frames[interval] = pd.concat([head, tail], ignore_index=True)
+
+    def get(self, interval: str, limit: int = None):
+        """Resampled candles for ``interval``, newest ``limit`` of them"""
+        if interval not in self._frames:
+            base = self._base if self._base is not None else pd.DataFrame()
+            self._frames[interval] = resample_candles(base, interval)
+        frame = self._frames[interval]
+        return (frame if limit is None else frame.tail(limit)).reset_index(drop=True).copy()
+
+    def _bucket_floor(self, interval: str):
+        # Drop buckets that have fallen entirely out of the held 1m window
+        first_ms = int(self._base['timestamp'].iloc[0].value // 10**6)
+        step = interval_to_milliseconds(interval)
+        return pd.Timestamp(first_ms - first_ms % step, unit='ms')
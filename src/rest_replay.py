@@ -0,0 +1,167 @@
+# src/rest_replay.py
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from binance.exceptions import BinanceAPIException
+
+# Headers worth keeping with each recorded response (the rate limiter reads these)
+RECORDED_HEADERS = ('X-MBX-USED-WEIGHT-1M', 'Retry-After')
+
+# Params that depend on the wall clock, ignored when no recording matches exactly
+TIME_PARAMS = ('startTime', 'endTime')
+
+
+def request_key(endpoint: str, params: dict):
+    """Canonical lookup key for one call"""
+    return endpoint + json.dumps(params, sort_keys=True, separators=(',', ':'))
+
+
+def load_records(path: str):
+    """Load recorded REST calls, one JSON object per line of a gzip file"""
+    with gzip.open(path, 'rt') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class RecordedResponse:
+    """The parts of a ``requests.Response`` the fetcher reads, rebuilt from a recording"""
+
+    def __init__(self, headers: dict = None, size: int = 0, text: str = ''):
+        self.headers = headers or {}
+        self.text = text
+        self._size = size
+
+    @property
+    def content(self):
+        return bytes(self._size)
+
+
+class RecordingClient:
+    """Wraps a live ``binance.Client`` and appends every REST call and its raw result to a log
+
+    The log is gzip-compressed JSON lines. Each line holds the endpoint, params, the
+    result or API error, the headers the rate limiter reads, and the payload size.
+    Lines are flushed every ``flush_every`` records and on close (also at interpreter
+    exit). Replay it with ``ReplayClient``.
+    """
+
+    def __init__(self, client, path: str, flush_every: int = 100):
+        self._client = client
+        self.path = path
+        self.flush_every = flush_every
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = gzip.open(path, 'at')
+        self._pending = 0
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    @property
+    def response(self):
+        return getattr(self._client, 'response', None)
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+        if not callable(method):
+            return method
+
+        def call(**params):
+            try:
+                result = method(**params)
+            except BinanceAPIException as e:
+                self._write(name, params, error={'status': e.status_code, 'text': e.response.text},
+                            response=e.response)
+                raise
+            self._write(name, params, result=result, response=self.response)
+            return result
+        return call
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+        atexit.unregister(self.close)
+
+    def _write(self, endpoint: str, params: dict, response, result=None, error=None):
+        record = {'endpoint': endpoint, 'params': params}
+        if error is not None:
+            record['error'] = error
+        else:
+            record['result'] = result
+        if response is not None:
+            record['headers'] = {h: response.headers[h] for h in RECORDED_HEADERS if h in response.headers}
+            record['size'] = len(response.content)
+        line = json.dumps(record, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self._pending += 1
+            # Each gzip flush ends a deflate block, so flushing every line bloats the log
+            if self._pending >= self.flush_every:
+                self._file.flush()
+                self._pending = 0
+
+
+class ReplayClient:
+    """Offline stand-in for ``binance.Client`` that serves responses from a RecordingClient log
+
+    Calls are matched on endpoint and params. Repeated identical calls get their
+    recordings in the order they were made, and the last one repeats once they run
+    out. Calls whose time params were derived from the clock fall back to the
+    recordings of the same call without them. ``latency`` seconds are slept
+    before each response to simulate the network.
+    """
+
+    def __init__(self, path: str, latency: float = 0.0):
+        self.path = path
+        self.latency = latency
+        # Last response per thread, like ThreadSafeClient, so concurrent callers read their own
+        self._local = threading.local()
+        self._exact = defaultdict(deque)
+        self._loose = defaultdict(deque)
+        self._served = set()
+        for record in load_records(path):
+            self._exact[request_key(record['endpoint'], record['params'])].append(record)
+            self._loose[self._loose_key(record['endpoint'], record['params'])].append(record)
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def call(**params):
+            record = self._next(name, params)
+            if self.latency:
+                time.sleep(self.latency)
+            response = RecordedResponse(record.get('headers'), record.get('size', 0), record.get('error', {}).get('text', ''))
+            self.response = response
+            if 'error' in record:
+                raise BinanceAPIException(response, record['error']['status'], record['error']['text'])
+            return record['result']
+        return call
+
+    def _next(self, endpoint: str, params: dict):
+        with self._lock:
+            for queue in (self._exact.get(request_key(endpoint, params)), self._loose.get(self._loose_key(endpoint, params))):
+                if not queue:
+                    continue
+                # A recording lives in both indexes; skip ones already served through the other
+                while len(queue) > 1 and id(queue[0]) in self._served:
+                    queue.popleft()
+                # Keep the last recording around so the call still answers after the log runs out
+                record = queue.popleft() if len(queue) > 1 else queue[0]
+                self._served.add(id(record))
+                return record
+            raise KeyError(f"No recorded response for {endpoint}({params}) in {self.path}")
+
+    @property
+    def response(self):
+        return getattr(self._local, 'response', None)
+
+    @response.setter
+    def response(self, value):
+        self._local.response = value
+
+    @staticmethod
+    def _loose_key(endpoint: str, params: dict):
+        return request_key(endpoint, {k: v for k, v in params.items() if k not in TIME_PARAMS})
@@ -0,0 +1,209 @@
+# src/rolling.py
+import numpy as np
+
+# Prefix sums restart every BLOCK values so their magnitude, and the rounding error of
+# window differences, stays bounded however long the series is
+BLOCK = 1024
+
+
+class RollingWindows:
+    """Rolling statistics of one float array, for any number of window lengths
+
+    Works along the last axis of a 1-D or 2-D (e.g. symbols x time) array. Any
+    window holding a NaN is NaN, like pandas ``rolling(window)`` with its
+    default ``min_periods``.
+
+    Sums, means and variances come from prefix sums computed once and shared by
+    every window length. Each block of ``BLOCK`` values is centred on its own mean
+    and gets its own prefix sums. A window spanning two blocks merges the two
+    parts by shifting one part's moments to the other block's centre. Min and
+    max use the van Herk/Gil-Werman block scan, the vectorized form of the
+    monotonic-deque algorithm, at three comparisons per value for any window.
+    """
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self._one_d = values.ndim == 1
+        self.values = values.reshape(1, -1) if self._one_d else values
+        self._nan = np.isnan(self.values)
+        self._has_nan = bool(self._nan.any())
+        self._nan_prefix = None
+        self._prefix = {}
+
+    def sum(self, window: int):
+        center, n, s, _ = self._moments(window, squares=False)
+        s += n * center
+        return self._shape(s, n, window)
+
+    def mean(self, window: int):
+        center, n, s, _ = self._moments(window, squares=False)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            s /= n
+        s += center
+        return self._shape(s, n, window)
+
+    def var(self, window: int, ddof: int = 1):
+        _, n, s, q = self._moments(window, squares=True)
+        return self._shape(self._variance(n, s, q, window, ddof), n, window)
+
+    def std(self, window: int, ddof: int = 1):
+        return np.sqrt(self.var(window, ddof))
+
+    def mean_std(self, window: int, ddof: int = 1):
+        """Mean and standard deviation from one pass over the shared prefix sums"""
+        center, n, s, q = self._moments(window, squares=True)
+        std = np.sqrt(self._variance(n, s, q, window, ddof))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            s /= n
+        s += center
+        return self._shape(s, n, window), self._shape(std, n, window)
+
+    def min(self, window: int):
+        return self._extreme(window, np.minimum, np.inf)
+
+    def max(self, window: int):
+        return self._extreme(window, np.maximum, -np.inf)
+
+    def _moments(self, window: int, squares: bool):
+        """Per window end: block centre, count, and sum (and sum of squares) about that centre
+
+        Results are (rows, blocks, block size) arrays; ``_shape`` flattens them. The
+        count is the scalar ``window`` when there are no missing values.
+        """
+        self._check_window(window)
+        block = max(BLOCK, 1 << (window - 1).bit_length())
+        center, count, first, second = self._block_prefix(block, squares)
+        cross = window - 1
+
+        def within_block(prefix):
+            # Window sums from prefix sums; the first ``cross`` slots only get their in-block part
+            out = np.empty(prefix.shape[:2] + (block,))
+            np.subtract(prefix[..., window:], prefix[..., :block + 1 - window], out=out[..., cross:])
+            out[..., :cross] = prefix[..., 1:window]
+            return out
+
+        def head(prefix):
+            # The part of each crossing window that lies at the end of the previous block
+            return prefix[:, :-1, block, None] - prefix[:, :-1, block - cross:block]
+
+        s = within_block(first)
+        q = within_block(second) if squares else None
+        n = within_block(count) if count is not None else float(window)
+        if cross and s.shape[1] > 1:
+            s_head = head(first)
+            n_head = head(count) if count is not None else np.arange(cross, 0, -1, dtype=np.float64)
+            shift = (center[:, :-1] - center[:, 1:])[..., None]
+            if squares:
+                q[:, 1:, :cross] += head(second) + 2 * shift * s_head + n_head * shift * shift
+            s[:, 1:, :cross] += s_head + n_head * shift
+            if count is not None:
+                n[:, 1:, :cross] += n_head
+        return center[..., None], n, s, q
+
+    @staticmethod
+    def _variance(n, s, q, window: int, ddof: int):
+        """(q - s^2 / n) / (n - ddof), clipped at 0, reusing the ``q`` buffer"""
+        if window <= ddof:
+            q[...] = np.nan
+            return q
+        with np.errstate(invalid='ignore', divide='ignore'):
+            q -= s * s / n
+            np.maximum(q, 0, out=q)
+            q /= n - ddof
+        return q
+
+    def _block_prefix(self, block: int, squares: bool):
+        cached = self._prefix.get(block)
+        if cached is not None and (cached[3] is not None or not squares):
+            return cached
+        rows, length = self.values.shape
+        n_blocks = max(-(-length // block), 1)
+        padded = np.full((rows, n_blocks * block), np.nan)
+        padded[:, :length] = self.values
+        blocks = padded.reshape(rows, n_blocks, block)
+        valid = ~np.isnan(blocks)
+        valid_count = valid.sum(axis=-1)
+        centered = np.where(valid, blocks, 0.0)
+        center = np.divide(centered.sum(axis=-1), valid_count, out=np.zeros((rows, n_blocks)), where=valid_count > 0)
+        centered -= center[..., None]
+        centered[~valid] = 0.0
+
+        def prefix(values):
+            out = np.zeros((rows, n_blocks, block + 1), dtype=values.dtype)
+            np.cumsum(values, axis=-1, out=out[..., 1:])
+            return out
+
+        # Without missing values a window's count is known from its position (padding only trails the data)
+        count = prefix(valid.astype(np.int32)) if self._has_nan else None
+        cached = (center, count, prefix(centered), prefix(centered * centered) if squares else None)
+        self._prefix[block] = cached
+        return cached
+
+    def _extreme(self, window: int, fn, fill: float):
+        """Rolling min or max: prefix and suffix scans within blocks of ``window`` values"""
+        self._check_window(window)
+        rows, length = self.values.shape
+        out = np.full((rows, length), np.nan)
+        if length < window:
+            return self._squeeze(out)
+        n_blocks = -(-length // window)
+        padded = np.empty((rows, n_blocks * window))
+        padded[:, length:] = fill
+        padded[:, :length] = np.where(self._nan, fill, self.values) if self._has_nan else self.values
+        blocks = padded.reshape(rows, n_blocks, window)
+        prefix = fn.accumulate(blocks, axis=-1).reshape(rows, -1)
+        # Scan the reversed blocks straight into a reversed view so the result stays contiguous
+        suffix = np.empty_like(blocks)
+        fn.accumulate(blocks[..., ::-1], axis=-1, out=suffix[..., ::-1])
+        suffix = suffix.reshape(rows, -1)
+        fn(suffix[:, :length - window + 1], prefix[:, window - 1:length], out=out[:, window - 1:])
+        if self._has_nan:
+            out[:, window - 1:][self._window_nans(window) > 0] = np.nan
+        return self._squeeze(out)
+
+    def _window_nans(self, window: int):
+        if self._nan_prefix is None:
+            self._nan_prefix = np.zeros((self.values.shape[0], self.values.shape[1] + 1), dtype=np.int64)
+            np.cumsum(self._nan, axis=1, out=self._nan_prefix[:, 1:])
+        return self._nan_prefix[:, window:] - self._nan_prefix[:, :-window]
+
+    def _shape(self, values: np.ndarray, n, window: int):
+        """Flatten block results back to the input's length; windows missing values are NaN"""
+        rows, length = self.values.shape
+        if np.ndim(n):
+            values[n < window] = np.nan
+        values = values.reshape(rows, -1)[:, :length]
+        values[:, :window - 1] = np.nan
+        return self._squeeze(values)
+
+    def _squeeze(self, values: np.ndarray):
+        return values[0] if self._one_d else values
+
+    @staticmethod
+    def _check_window(window: int):
+        if window < 1:
+            raise ValueError(f"Window must be a positive integer, got {window}")
+
+
+def rolling_sum(values, window: int):
+    return RollingWindows(values).sum(window)
+
+
+def rolling_mean(values, window: int):
+    return RollingWindows(values).mean(window)
+
+
+def rolling_std(values, window: int, ddof: int = 1):
+    return RollingWindows(values).std(window, ddof)
+
+
+def rolling_mean_std(values, window: int, ddof: int = 1):
+    return RollingWindows(values).mean_std(window, ddof)
+
+
+def rolling_min(values, window: int):
+    return RollingWindows(values).min(window)
+
+
+def rolling_max(values, window: int):
+    return RollingWindows(values).max(window)
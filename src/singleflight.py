@@ -0,0 +1,48 @@
+# src/singleflight.py
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into one
+
+    The first caller for a key runs the function. Callers that arrive with the same
+    key while it is still running wait for it and get the same result or exception.
+    Once it returns, the next call for that key runs again.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` unless an identical call is in flight; returns ``(result, shared)``"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
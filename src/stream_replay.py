@@ -0,0 +1,89 @@
+# src/stream_replay.py
+import asyncio
+import json
+import re
+import threading
+import websockets
+
+
+def load_messages(path: str):
+    """Load recorded stream messages, one JSON object per line"""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class StreamReplayServer:
+    """Local WebSocket stand-in for the Binance stream endpoint that replays recorded messages
+
+    Each connection to ``/ws/<stream>`` receives the recorded messages belonging to that
+    stream, in order, ``delay`` seconds apart. Point a fetcher at ``server.url`` to run
+    the streaming path without touching the network.
+    """
+
+    def __init__(self, messages, host: str = '127.0.0.1', port: int = 0, delay: float = 0.0):
+        self.messages = list(messages)
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self):
+        return f'ws://{self.host}:{self.port}/'
+
+    @staticmethod
+    def stream_name(msg: dict):
+        """Stream a message belongs to, e.g. 'btcusdt@kline_1m' or 'btcusdt@depth'"""
+        if 'stream' in msg:
+            return msg['stream']
+        if msg.get('e') == 'kline':
+            return f"{msg['s'].lower()}@kline_{msg['k']['i']}"
+        if msg.get('e') == 'depthUpdate':
+            return f"{msg['s'].lower()}@depth"
+        return None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5)
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._thread.join(timeout=5)
+            self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self._serve())
+
+    async def _serve(self):
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        await self._server.wait_closed()
+
+    async def _handler(self, websocket, path: str = None):
+        if path is None:
+            path = websocket.request.path
+        # The update speed suffix (e.g. 'btcusdt@depth@100ms') doesn't change which messages belong
+        stream = re.sub(r'@\d+ms$', '', path.rsplit('/', 1)[-1])
+        for msg in self.messages:
+            if self.stream_name(msg) != stream:
+                continue
+            await websocket.send(json.dumps(msg.get('data', msg)))
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        # Hold the connection open like the real endpoint would
+        await websocket.wait_closed()
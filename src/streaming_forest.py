@@ -0,0 +1,150 @@
+# src/streaming_forest.py
+import numpy as np
+
+
+class HalfSpaceTrees:
+    """Streaming anomaly detector with an IsolationForest-style interface (Tan, Ting & Liu, 2011)
+
+    Each tree is a full binary tree of fixed ``depth`` that splits a randomly
+    widened copy of the fitted feature ranges in half at every node. Nodes count
+    how many points land in them. The reference counts come from the last
+    complete window of ``window`` points, while the next window is being
+    counted. A point scores ``mass * 2**depth`` at the deepest node on its path
+    whose reference mass is still above ``size_limit``. As in sklearn, lower
+    scores are more anomalous and rows below ``offset_`` are anomalies. Memory
+    is fixed by ``n_trees``, ``depth`` and ``window``, whatever the stream length.
+    """
+
+    def __init__(self, n_trees: int = 25, depth: int = 10, window: int = 250, size_limit: float = 0.1,
+                 contamination: float = 0.1, random_state: int = None):
+        self.n_trees = n_trees
+        self.depth = depth
+        self.window = window
+        self.size_limit = size_limit
+        self.contamination = contamination
+        self.random_state = random_state
+
+    def fit(self, X):
+        """Build the trees over the ranges of ``X``; all of ``X`` becomes the reference window"""
+        X = self._check(X)
+        self._build(X)
+        self._reference = self._mass(X)
+        self._reference_size = len(X)
+        self._latest = np.zeros_like(self._reference)
+        self._pending = np.empty((self.window, X.shape[1]))
+        self._count = 0
+        self.offset_ = self._threshold(X)
+        return self
+
+    def partial_fit(self, X):
+        """Count new points; every ``window`` points the counts replace the reference"""
+        X = self._check(X)
+        pos = 0
+        while pos < len(X):
+            take = min(self.window - self._count, len(X) - pos)
+            chunk = X[pos:pos + take]
+            if take == 1:
+                # A single point visits each node at most once, so no bincount is needed
+                self._latest.ravel()[self._paths(chunk).ravel()] += 1
+            else:
+                self._latest += self._mass(chunk)
+            self._pending[self._count:self._count + take] = chunk
+            self._count += take
+            pos += take
+            if self._count == self.window:
+                self._reference, self._latest = self._latest, np.zeros_like(self._latest)
+                self._reference_size = self.window
+                self._count = 0
+                self.offset_ = self._threshold(self._pending)
+        return self
+
+    def score_samples(self, X):
+        """Reference-mass score per row; lower is more anomalous"""
+        X = self._check(X)
+        mass = self._reference.ravel().take(self._paths(X))
+        # Stop at the first node too sparse to trust, or at the leaf
+        sparse = mass <= self.size_limit * self._reference_size
+        level = np.where(sparse.any(axis=2), sparse.argmax(axis=2), self.depth)
+        stopped = np.take_along_axis(mass, level[:, :, None], axis=2)[:, :, 0]
+        return (stopped * 2.0 ** level).sum(axis=1) / (self.n_trees * self._reference_size)
+
+    def predict(self, X):
+        """-1 for anomalies, 1 for normal rows"""
+        return np.where(self.score_samples(X) < self.offset_, -1, 1)
+
+    def fit_predict(self, X):
+        return self.fit(X).predict(X)
+
+    def score_one(self, x):
+        return float(self.score_samples(np.asarray(x, dtype=np.float64).reshape(1, -1))[0])
+
+    def learn_one(self, x):
+        return self.partial_fit(np.asarray(x, dtype=np.float64).reshape(1, -1))
+
+    def _build(self, X):
+        rng = np.random.default_rng(self.random_state)
+        n_features = X.shape[1]
+        low, high = X.min(axis=0), X.max(axis=0)
+        # Work space per tree: a random point in the range, widened to twice its farthest edge
+        pivot = rng.uniform(low, high, size=(self.n_trees, n_features))
+        half = 2 * np.maximum(pivot - low, high - pivot)
+        half = np.where(half > 0, half, 1.0)
+
+        n_internal = 2 ** self.depth - 1
+        self._split_dim = rng.integers(n_features, size=(self.n_trees, n_internal))
+        self._split_value = np.empty((self.n_trees, n_internal))
+        lower = np.empty((self.n_trees, n_internal, n_features))
+        upper = np.empty((self.n_trees, n_internal, n_features))
+        lower[:, 0], upper[:, 0] = pivot - half, pivot + half
+        trees = np.arange(self.n_trees)[:, None]
+        for level in range(self.depth):
+            nodes = np.arange(2 ** level - 1, 2 ** (level + 1) - 1)
+            dims = self._split_dim[:, nodes]
+            mid = (lower[trees, nodes, dims] + upper[trees, nodes, dims]) / 2
+            self._split_value[:, nodes] = mid
+            if level + 1 < self.depth:
+                for child, bound in ((2 * nodes + 1, upper), (2 * nodes + 2, lower)):
+                    lower[:, child], upper[:, child] = lower[:, nodes], upper[:, nodes]
+                    bound[trees, child, dims] = mid
+
+    def _paths(self, X):
+        """Flat node index at every level of every tree, shape (rows, trees, depth + 1)
+
+        Node ``i`` of tree ``t`` is entry ``t * n_nodes + i`` of the raveled mass
+        arrays. Lookups use ``np.take`` on raveled arrays and updates are in place,
+        which is far cheaper than 2-D fancy indexing for the one-row case.
+        """
+        n_internal = 2 ** self.depth - 1
+        split_dim, split_value = self._split_dim.ravel(), self._split_value.ravel()
+        values = X.ravel()
+        row_start = (np.arange(len(X)) * X.shape[1])[:, None]
+        tree_start = np.arange(self.n_trees) * n_internal
+        # Walk in raveled split-array coordinates: child of ``at`` is 2 * at + 1 - tree_start (+1 if right)
+        child_start = 1 - tree_start
+        at = np.broadcast_to(tree_start, (len(X), self.n_trees)).copy()
+        paths = np.empty((len(X), self.n_trees, self.depth + 1), dtype=np.intp)
+        paths[:, :, 0] = at
+        for level in range(self.depth):
+            right = values.take(row_start + split_dim.take(at)) >= split_value.take(at)
+            at *= 2
+            at += child_start
+            at += right
+            paths[:, :, level + 1] = at
+        # Tree t's split arrays start at t * n_internal, its mass arrays at t * n_nodes
+        paths += (np.arange(self.n_trees) * 2 ** self.depth)[None, :, None]
+        return paths
+
+    def _mass(self, X):
+        """Points per node, shape (trees, nodes)"""
+        n_nodes = 2 ** (self.depth + 1) - 1
+        return np.bincount(self._paths(X).ravel(), minlength=self.n_trees * n_nodes) \
+            .reshape(self.n_trees, n_nodes).astype(np.float64)
+
+    def _threshold(self, X):
+        # Same rule as IsolationForest: the contamination quantile of the reference scores
+        return float(np.percentile(self.score_samples(X), 100 * self.contamination))
+
+    @staticmethod
+    def _check(X):
+        X = np.asarray(X, dtype=np.float64)
+        return X.reshape(-1, 1) if X.ndim == 1 else X
@@ -0,0 +1,60 @@
+# src/telemetry.py
+import threading
+import time
+from collections import defaultdict, deque
+import numpy as np
+from config.settings import REQUEST_TELEMETRY
+
+
+class RequestTelemetry:
+    """Rolling per-endpoint record of REST request latency, payload size, retries and errors
+
+    Each endpoint keeps only its newest ``window`` requests, so memory stays bounded
+    and the percentiles describe how the Binance path behaves right now rather than
+    since start-up.
+    """
+
+    def __init__(self, window: int = None):
+        self.window = window or REQUEST_TELEMETRY['window']
+        # endpoint -> deque of (finished_at, latency_ms, payload_bytes, retries, ok)
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, latency_ms: float, payload_bytes: int = 0, retries: int = 0, ok: bool = True):
+        """Add one finished request (successful or not); ``retries`` is 1 if it retried an earlier attempt"""
+        with self._lock:
+            self._samples[endpoint].append((time.time(), latency_ms, payload_bytes, retries, ok))
+
+    def summary(self):
+        """Per-endpoint stats over the rolling window, plus an ``'all'`` entry across endpoints"""
+        with self._lock:
+            samples = {endpoint: list(rows) for endpoint, rows in self._samples.items()}
+        stats = {endpoint: self._stats(rows) for endpoint, rows in samples.items()}
+        stats['all'] = self._stats([row for rows in samples.values() for row in rows])
+        return stats
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    @staticmethod
+    def _stats(rows):
+        if not rows:
+            return {
+                'requests': 0, 'errors': 0, 'success_rate': None, 'retries': 0,
+                'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'avg_bytes': None, 'last_at': None,
+            }
+        values = np.array([row[:4] for row in rows], dtype=np.float64)
+        ok = np.fromiter((row[4] for row in rows), dtype=bool, count=len(rows))
+        p50, p95, p99 = np.percentile(values[:, 1], [50, 95, 99])
+        return {
+            'requests': len(rows),
+            'errors': int((~ok).sum()),
+            'success_rate': 100.0 * ok.mean(),
+            'retries': int(values[:, 3].sum()),
+            'p50_ms': p50,
+            'p95_ms': p95,
+            'p99_ms': p99,
+            'avg_bytes': values[:, 2].mean(),
+            'last_at': values[:, 0].max(),
+        }
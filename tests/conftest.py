@@ -0,0 +1,68 @@
+# tests/conftest.py
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import pytest
+
+# Modules import each other (and config.settings) from src, as the app does
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+@pytest.fixture
+def make_candles():
+    """Factory for a random-walk OHLCV frame of ``n`` candles ``freq`` apart
+
+    ``regimes`` alternates calm and volatile stretches of 60 candles so volatility
+    checks see both outcomes; ``spikes`` multiplies the volume of one candle in 20 by 10.
+    """
+    def make(n: int, freq: str = 'min', volume: float = 20.0, seed: int = 0, regimes: bool = False, spikes: bool = False):
+        rng = np.random.default_rng(seed)
+        steps = rng.normal(0, 1, n)
+        if regimes:
+            steps *= np.where((np.arange(n) // 60) % 3 == 2, 2.0, 0.3)
+        close = 100 + np.cumsum(steps)
+        volumes = rng.lognormal(np.log(volume), 0.5, n)
+        if spikes:
+            volumes[rng.choice(n, size=n // 20, replace=False)] *= 10
+        return pd.DataFrame({
+            'timestamp': pd.date_range('2024-01-01', periods=n, freq=freq),
+            'open': close,
+            'high': close + 0.5,
+            'low': close - 0.5,
+            'close': close,
+            'volume': volumes,
+        })
+    return make
+
+
+@pytest.fixture
+def replay():
+    """Factory for a streaming fetcher on a StreamReplayServer of ``messages``; both stop after the test"""
+    from data_fetcher import BinanceDataFetcher
+    from stream_replay import StreamReplayServer
+    started = []
+
+    def start(messages, client, delay: float = 0.0):
+        server = StreamReplayServer(messages, delay=delay).start()
+        fetcher = BinanceDataFetcher(streaming=True, stream_url=server.url, client=client)
+        started.append((server, fetcher))
+        return fetcher
+
+    yield start
+    for server, fetcher in started:
+        fetcher.stream.stop()
+        server.stop()
+
+
+@pytest.fixture
+def wait_for():
+    """Poll ``condition`` until it holds, failing the test after ``timeout`` seconds"""
+    def wait(condition, timeout: float = 5.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                pytest.fail("condition not met in time")
+            time.sleep(0.02)
+    return wait
@@ -0,0 +1,43 @@
+# tests/test_event_store.py
+from dashboard_features import ANOMALY_FLAGS, GRAPH
+from event_store import SCORE_COLUMNS, AnomalyEventStore, detection_profile
+from feature_graph import LazyFeatures
+
+# The dashboard's anomalies panel
+PANEL = ANOMALY_FLAGS + ('anomaly_count', 'severity') + SCORE_COLUMNS
+
+
+def dashboard_frame(candles, volatility_threshold: float = 2.0):
+    context = {'pipeline': dict(window=20, volatility_threshold=volatility_threshold)}
+    return LazyFeatures(GRAPH, candles, context).frame(PANEL)
+
+
+def test_dashboard_frame_records_scores(tmp_path, make_candles):
+    store = AnomalyEventStore(str(tmp_path / 'events.db'))
+    df = dashboard_frame(make_candles(200, spikes=True))
+    written = store.record('BTCUSDT', '1m', df)
+    events = store.history('BTCUSDT', '1m')
+    assert written == len(events) > 0
+    assert set(events['detector']) >= {'volume', 'multi_feature'}
+    assert events['score'].notna().all()
+    # Already recorded candles are not written again
+    assert store.record('BTCUSDT', '1m', df) == 0
+
+
+def test_profiles_keep_separate_logs(tmp_path, make_candles):
+    store = AnomalyEventStore(str(tmp_path / 'events.db'))
+    candles = make_candles(200, spikes=True)
+    loose, strict = detection_profile(volatility_threshold=1.0), detection_profile(volatility_threshold=3.0)
+    store.record('BTCUSDT', '1m', dashboard_frame(candles.iloc[:100], 1.0), profile=loose)
+    # The strict profile has its own watermark, so it logs the candles the loose one already covered
+    assert store.watermark('BTCUSDT', '1m', profile=strict) is None
+    store.record('BTCUSDT', '1m', dashboard_frame(candles, 3.0), profile=strict)
+    assert store.watermark('BTCUSDT', '1m', profile=loose) < store.watermark('BTCUSDT', '1m', profile=strict)
+
+    loose_events = store.history('BTCUSDT', '1m', profile=loose)
+    strict_events = store.history('BTCUSDT', '1m', profile=strict)
+    early = strict_events['timestamp'] <= loose_events['timestamp'].max()
+    assert early.any()
+    volatility = lambda events: (events['detector'] == 'volatility').sum()
+    assert volatility(loose_events) > volatility(strict_events[early])
+    assert store.report('BTCUSDT', '1m', profile=loose)['total_anomalies'] == len(loose_events)
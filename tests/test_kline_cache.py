@@ -0,0 +1,40 @@
+# tests/test_kline_cache.py
+import time
+import numpy as np
+import pandas as pd
+from config.settings import DATA_RETENTION
+from data_fetcher import BinanceDataFetcher
+
+
+def make_fetcher():
+    """Fetcher whose kline loads are counted instead of sent"""
+    fetcher = BinanceDataFetcher(client=object())
+    fetcher.loads = []
+
+    def load(symbol, interval, limit, priority):
+        fetcher.loads.append(limit)
+        return pd.DataFrame({
+            'timestamp': pd.date_range('2024-01-01', periods=limit, freq='min'),
+            'close': np.arange(limit, dtype=np.float64),
+        })
+    fetcher._load_klines = load
+    return fetcher
+
+
+def test_narrower_window_is_served_from_wider_cache():
+    fetcher = make_fetcher()
+    fetcher.get_klines('BTCUSDT', '1m', limit=500)
+    frame = fetcher.get_klines('BTCUSDT', '1m', limit=100)
+    assert fetcher.loads == [500]
+    assert len(frame) == 100 and frame['close'].iloc[-1] == 499
+
+
+def test_expired_wide_entry_is_replaced_by_narrower_one():
+    fetcher = make_fetcher()
+    fetcher.get_klines('BTCUSDT', '1m', limit=500)
+    frame, limit, fetched_at = fetcher._kline_cache[('BTCUSDT', '1m')]
+    # Past cache_max_stale the wide frame can no longer be served
+    fetcher._kline_cache[('BTCUSDT', '1m')] = (frame, limit, time.monotonic() - DATA_RETENTION['cache_max_stale'] - 1)
+    fetcher.get_klines('BTCUSDT', '1m', limit=100)
+    fetcher.get_klines('BTCUSDT', '1m', limit=100)
+    assert fetcher.loads == [500, 100]
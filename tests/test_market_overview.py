@@ -0,0 +1,54 @@
+# tests/test_market_overview.py
+import numpy as np
+import pytest
+from data_fetcher import BinanceDataFetcher
+
+TICKER = [
+    {'symbol': 'BTCUSDT', 'lastPrice': '64000.5', 'priceChangePercent': '2.5', 'volume': '1200.0',
+     'quoteVolume': '76800000.0', 'highPrice': '65000.0', 'lowPrice': '62000.0'},
+    {'symbol': 'ETHUSDT', 'lastPrice': '3100.25', 'priceChangePercent': '-4.1', 'volume': '9000.0',
+     'quoteVolume': '27900000.0', 'highPrice': '3300.0', 'lowPrice': '3050.0'},
+]
+
+
+class TickerClient:
+    def __init__(self, error=None):
+        self.error = error
+
+    def get_ticker(self):
+        if self.error is not None:
+            raise self.error
+        return TICKER
+
+
+def overview_panels(overview):
+    """What the Global Overview page derives from the ticker: ranking, top performers and the table"""
+    ranked = overview.sort_values('change', ascending=False)
+    labels = [f"{c:+.2f}%" for c in ranked['change']]
+    top = overview.nlargest(5, 'change')
+    by_volume = overview.sort_values('quote_volume', ascending=False)
+    table = {
+        'Price': by_volume['price'].map('${:,.4f}'.format),
+        '24h Change': by_volume['change'].map('{:+.2f}%'.format),
+        'Signal': np.where(by_volume['change'] > 3, 'Buy', np.where(by_volume['change'] < -3, 'Sell', 'Hold')),
+    }
+    return labels, top, table
+
+
+def test_overview_renders_from_ticker():
+    overview = BinanceDataFetcher(client=TickerClient()).get_ticker_24h()
+    labels, top, table = overview_panels(overview)
+    assert labels == ['+2.50%', '-4.10%']
+    assert list(top['symbol']) == ['BTCUSDT', 'ETHUSDT']
+    assert list(table['Signal']) == ['Hold', 'Sell']
+
+
+def test_overview_degrades_when_ticker_fails():
+    fetcher = BinanceDataFetcher(client=TickerClient(error=RuntimeError("ticker down")))
+    with pytest.raises(RuntimeError):
+        fetcher.get_ticker_24h()
+    # The page falls back to an empty snapshot typed like a real one
+    overview = BinanceDataFetcher.empty_ticker()
+    assert overview.dtypes.equals(BinanceDataFetcher(client=TickerClient()).get_ticker_24h().dtypes)
+    labels, top, table = overview_panels(overview)
+    assert labels == [] and top.empty and len(table['Signal']) == 0
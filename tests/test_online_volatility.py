@@ -0,0 +1,29 @@
+# tests/test_online_volatility.py
+import pytest
+from anomaly_detector import AnomalyDetector, OnlineVolatilityDetector
+
+WINDOW = 20
+HISTORY = 80
+THRESHOLD = 2.0
+
+
+def test_newest_candle_matches_batch_detector(make_candles):
+    """Sliding frames, each ending in an open candle, score it exactly as the batch method"""
+    candles = make_candles(400, regimes=True)
+    online = OnlineVolatilityDetector(window=WINDOW, history=HISTORY)
+    length = HISTORY + WINDOW
+    flagged = 0
+    for end in range(length, len(candles) + 1):
+        frame = candles.iloc[end - length:end].reset_index(drop=True)
+        # The open candle is seen mid-way first, then with its final close
+        forming = frame.copy()
+        forming.loc[len(forming) - 1, 'close'] = (frame['close'].iloc[-1] + frame['close'].iloc[-2]) / 2
+        for view in (forming, frame):
+            got = online.detect(view, 'BTCUSDT', threshold=THRESHOLD).iloc[-1]
+            expected = AnomalyDetector.detect_volatility_anomalies(view, window=WINDOW, threshold=THRESHOLD).iloc[-1]
+            assert got['z_score'] == pytest.approx(expected['z_score'], rel=1e-9, abs=1e-9)
+            assert got['volatility'] == pytest.approx(expected['volatility'], rel=1e-9)
+            assert got['is_anomaly'] == expected['is_anomaly']
+            flagged += bool(got['is_anomaly'])
+    # The check is only meaningful if both outcomes occur
+    assert 0 < flagged < 2 * (len(candles) - length + 1)
@@ -0,0 +1,72 @@
+# tests/test_order_book.py
+from candle_store import SharedCandleStore
+
+SNAPSHOT = {'lastUpdateId': 100, 'bids': [['99.0', '1'], ['98.0', '2']], 'asks': [['101.0', '1'], ['102.0', '2']]}
+
+
+class DepthClient:
+    """REST stand-in serving order book snapshots in turn, repeating the last one"""
+
+    def __init__(self, *snapshots):
+        self.snapshots = list(snapshots) or [SNAPSHOT]
+        self.calls = 0
+
+    def get_order_book(self, symbol: str, limit: int):
+        self.calls += 1
+        return self.snapshots[min(self.calls, len(self.snapshots)) - 1]
+
+
+def depth_event(first: int, last: int, bids=(), asks=()):
+    return {'e': 'depthUpdate', 'E': last, 's': 'BTCUSDT', 'U': first, 'u': last, 'b': list(bids), 'a': list(asks)}
+
+
+def test_idle_depth_stream_is_released(replay, wait_for):
+    fetcher = replay([depth_event(101, 102, bids=[['99.0', '3']])], DepthClient())
+    store = SharedCandleStore(fetcher, refresh_seconds=0.05, idle_timeout=0.3)
+    store.get_order_book_depth('BTCUSDT', 10)
+    store.get_order_book_depth('BTCUSDT', 10)
+    assert fetcher._depth_refs == {'BTCUSDT': 1}
+    assert 'BTCUSDT' in fetcher.stream._depth_sockets
+
+    # Nobody reads the book any more: the store lets go and the socket closes
+    wait_for(lambda: not fetcher._depth_refs)
+    assert fetcher.stream._depth_sockets == {}
+    assert 'BTCUSDT' not in fetcher._order_books
+
+
+def test_depth_stream_stays_open_for_other_subscribers(replay):
+    fetcher = replay([], DepthClient())
+    fetcher.subscribe_depth('BTCUSDT')
+    fetcher.subscribe_depth('BTCUSDT')
+    fetcher.unsubscribe_depth('BTCUSDT')
+    assert 'BTCUSDT' in fetcher.stream._depth_sockets
+    fetcher.unsubscribe_depth('BTCUSDT')
+    assert fetcher.stream._depth_sockets == {}
+
+
+def test_replayed_diff_stream_resyncs_after_gap(replay, wait_for):
+    """The book follows the replayed events, reloads on a sequence gap and matches the final state"""
+    resnapshot = {'lastUpdateId': 111, 'bids': [['99.0', '5'], ['97.0', '1']], 'asks': [['101.0', '2']]}
+    client = DepthClient(SNAPSHOT, resnapshot)
+    messages = [
+        depth_event(101, 102, bids=[['99.0', '3']]),
+        depth_event(103, 104, asks=[['102.0', '0'], ['103.0', '4']]),
+        # 105-109 never arrive
+        depth_event(110, 111, bids=[['96.0', '1']]),
+        depth_event(112, 113, bids=[['98.0', '2'], ['97.0', '0']]),
+        depth_event(114, 115, asks=[['101.5', '1']]),
+    ]
+    fetcher = replay(messages, client, delay=0.2)
+    fetcher.subscribe_depth('BTCUSDT')
+    sync = fetcher._order_books['BTCUSDT']
+    wait_for(lambda: sync.book.last_update_id == 104)
+    assert sync.book.best_bid() == 99.0
+    assert sync.snapshot()['quantity'].tolist() == [3.0, 5.0, 1.0, 5.0]
+
+    wait_for(lambda: sync.book.last_update_id == 115)
+    assert sync.resyncs == 2 and client.calls == 2
+    # The reload's snapshot covers the event at the gap; later ones apply on top
+    depth = sync.snapshot()
+    assert depth[depth['side'] == 'bid'][['price', 'quantity']].values.tolist() == [[99.0, 5.0], [98.0, 7.0]]
+    assert depth[depth['side'] == 'ask'][['price', 'quantity']].values.tolist() == [[101.0, 2.0], [101.5, 3.0]]
+    fetcher.unsubscribe_depth('BTCUSDT')
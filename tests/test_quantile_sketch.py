@@ -0,0 +1,29 @@
+# tests/test_quantile_sketch.py
+import pandas as pd
+from quantile_sketch import VolumeSummaries
+
+
+def test_intervals_keep_separate_summaries(make_candles):
+    """1m candles of a symbol neither block nor skew the summaries of its 1h candles"""
+    minutes, hours = make_candles(100, 'min', volume=10), make_candles(100, 'h', volume=600, seed=1)
+    summaries = VolumeSummaries()
+    assert summaries.add('BTCUSDT', '1m', minutes) == 99
+    assert summaries.add('BTCUSDT', '1h', hours) == 99
+
+    fresh = VolumeSummaries()
+    fresh.add('BTCUSDT', '1h', hours)
+    volume = hours['volume'].iloc[-2]
+    for period, last in (('hourly', 24), ('daily', 30)):
+        assert summaries.percentile('BTCUSDT', '1h', volume, period, last) == \
+            fresh.percentile('BTCUSDT', '1h', volume, period, last)
+
+
+def test_window_is_time_based(make_candles):
+    """Hours without candles still count towards the window"""
+    candles = make_candles(20, 'h', volume=600)
+    candles.loc[10:, 'timestamp'] += pd.Timedelta(days=2)
+    summaries = VolumeSummaries()
+    summaries.add('BTCUSDT', '1h', candles)
+    # 19 closed candles in 19 hourly buckets, all kept; only the 9 after the gap are within 24 hours
+    assert summaries.sketch('BTCUSDT', '1h', 'hourly').count == 19
+    assert summaries.sketch('BTCUSDT', '1h', 'hourly', last=24).count == 9
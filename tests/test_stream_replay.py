@@ -0,0 +1,53 @@
+# tests/test_stream_replay.py
+import pandas as pd
+from config.settings import ARCHIVE
+
+MINUTE = 60_000
+START = 28_333_333 * MINUTE  # A minute boundary
+
+
+class KlineClient:
+    """REST stand-in returning the same five 1m candles, the last one still open"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_klines(self, symbol: str, interval: str, limit: int, **params):
+        self.calls += 1
+        klines = [[START + i * MINUTE, '100', '101', '99', str(100 + i), '10'] for i in range(5)]
+        return klines[-limit:]
+
+
+def kline_message(i: int, close: float, volume: float, closed: bool):
+    open_time = START + i * MINUTE
+    return {'e': 'kline', 'E': open_time + 30_000, 's': 'BTCUSDT', 'k': {
+        't': open_time, 'T': open_time + MINUTE - 1, 's': 'BTCUSDT', 'i': '1m',
+        'o': '100', 'h': str(max(101, close)), 'l': '99', 'c': str(close), 'v': str(volume), 'x': closed,
+    }}
+
+
+def test_streamed_klines_update_the_frame(replay, wait_for, monkeypatch):
+    monkeypatch.setitem(ARCHIVE, 'enabled', False)
+    client = KlineClient()
+    messages = [
+        # Same as the REST copy, in case it lands before the seed
+        kline_message(4, 104, 10, closed=False),
+        kline_message(4, 105.5, 14, closed=False),
+        kline_message(4, 106, 15, closed=True),
+        kline_message(5, 106.25, 1, closed=False),
+    ]
+    fetcher = replay(messages, client, delay=0.2)
+    fetcher.subscribe('BTCUSDT', '1m')
+    fetcher.get_klines('BTCUSDT', '1m', limit=5)
+    assert client.calls == 1
+
+    wait_for(lambda: fetcher.get_klines('BTCUSDT', '1m', limit=5)['timestamp'].iloc[-1]
+             == pd.Timestamp(START + 5 * MINUTE, unit='ms'))
+    frame = fetcher.get_klines('BTCUSDT', '1m', limit=5)
+    # Candles 1-3 from REST, candle 4 closed by the stream, candle 5 opened by it
+    assert frame['timestamp'].tolist() == list(pd.to_datetime([START + i * MINUTE for i in range(1, 6)], unit='ms'))
+    assert frame['close'].tolist() == [101.0, 102.0, 103.0, 106.0, 106.25]
+    assert frame['volume'].tolist() == [10.0, 10.0, 10.0, 15.0, 1.0]
+    # Reads while streaming come from the socket, not REST
+    assert client.calls == 1
+    fetcher.unsubscribe('BTCUSDT', '1m')
@@ -0,0 +1,28 @@
+# tests/test_telemetry.py
+from requests.exceptions import ConnectionError
+from config.settings import REQUEST_TELEMETRY
+from data_fetcher import BinanceDataFetcher
+
+
+class FlakyClient:
+    """Fails with a connection error ``failures`` times, then answers"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+
+    def get_ticker(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("connection reset")
+        return []
+
+
+def test_retries_are_counted_once_each(monkeypatch):
+    monkeypatch.setitem(REQUEST_TELEMETRY, 'retry_backoff', 0)
+    monkeypatch.setitem(REQUEST_TELEMETRY, 'max_retries', 3)
+    fetcher = BinanceDataFetcher(client=FlakyClient(failures=2))
+    fetcher.get_ticker_24h()
+    stats = fetcher.telemetry.summary()['get_ticker']
+    # Three attempts: two failures, then the retry that succeeded
+    assert stats['requests'] == 3 and stats['errors'] == 2
+    assert stats['retries'] == 2